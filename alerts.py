@@ -0,0 +1,335 @@
+import argparse
+import json
+import operator
+import re
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from dashboard import last_bars, moved
+from profiling import span
+from providers import (PERIOD_INTERVALS, add_provider_arguments, check_provider_arguments, make_provider,
+                       provider_options)
+from reports import RSI_OVERBOUGHT, RSI_OVERSOLD
+from streaming import SERIES, StreamingIndicators
+from watchlist import fetch_panel, parse_symbols
+
+# Alert rules evaluated continuously over a watchlist. Each symbol keeps its StreamingIndicators,
+# and every new or revised bar evaluates each rule once on the latest values, so a bar costs
+# O(rules) however long the history. A rule fires when its condition starts to hold, at most
+# once per bar and not again within `cooldown` bars; firings go to the GUI, a JSON-lines log
+# and/or a webhook.
+
+COOLDOWN_BARS = 3  # bars after a firing during which the same rule stays quiet for the symbol
+VOLUME_SPIKE = 200  # volume ratio (% of average) that counts as a spike
+
+# name -> expression. The expression is "<series> <comparison> <series or number>".
+DEFAULT_RULES = {
+    'RSI overbought': f'rsi > {RSI_OVERBOUGHT}',
+    'RSI oversold': f'rsi < {RSI_OVERSOLD}',
+    'MACD bullish crossover': 'macd crosses above signal',
+    'MACD bearish crossover': 'macd crosses below signal',
+    'Above upper Bollinger band': 'close > bollinger_upper',
+    'Below lower Bollinger band': 'close < bollinger_lower',
+    'Volume spike': f'volume_ratio > {VOLUME_SPIKE}',
+}
+
+RULE_OPERANDS = SERIES + ['volume_ratio']
+COMPARISONS = {
+    '>': operator.gt, '<': operator.lt, '>=': operator.ge, '<=': operator.le,
+    'crosses above': operator.gt, 'crosses below': operator.lt,
+}
+RULE_PATTERN = re.compile(r'^\s*(\w+)\s+(crosses above|crosses below|>=|<=|>|<)\s+(\S+)\s*$')
+
+
+def latest(live, name):
+    # The last value of a series without building a view of the buffer
+    if name == 'volume_ratio':
+        return live.volume_ratio
+    buffer = live.buffers[name]
+    return buffer.data[buffer.size - 1]
+
+
+class Rule:
+    # Level comparisons fire when they start to hold, including on the first bar a symbol is
+    # seen; crossings only when they did not hold on the bar before.
+
+    def __init__(self, name, expression):
+        match = RULE_PATTERN.match(expression)
+        if match is None:
+            raise ValueError(f"Invalid rule: {expression}")
+        left, comparison, right = match.groups()
+        if left not in RULE_OPERANDS:
+            raise ValueError(f"Unknown series in rule {name!r}: {left}")
+        if right not in RULE_OPERANDS:
+            try:
+                right = float(right)
+            except ValueError:
+                raise ValueError(f"Unknown series in rule {name!r}: {right}") from None
+        self.name = name
+        self.expression = expression.strip()
+        self.left = left
+        self.right = right
+        self.comparison = comparison
+        self.compare = COMPARISONS[comparison]
+        self.crossing = comparison.startswith('crosses')
+
+    def values(self, live):
+        right = self.right if isinstance(self.right, float) else latest(live, self.right)
+        return latest(live, self.left), right
+
+
+def parse_rule(text):
+    # "name: expression", or the expression alone, which then names the rule
+    name, _, expression = text.rpartition(':')
+    return Rule(name.strip() or expression.strip(), expression)
+
+
+def load_rules(path):
+    # One rule per line; blank lines and lines starting with # are skipped
+    with open(path, encoding='utf-8') as f:
+        return [parse_rule(line) for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def default_rules():
+    return [Rule(name, expression) for name, expression in DEFAULT_RULES.items()]
+
+
+def format_alert(alert):
+    return f"{alert['time']}  {alert['symbol']:<10} {alert['rule']}: {alert['message']}"
+
+
+class AlertEngine:
+    # Per symbol: its StreamingIndicators and, per rule, [whether the rule held on the bar
+    # before, whether it holds now, bar number of the last firing]. Not thread-safe; one
+    # thread at a time feeds it, as the monitor's cycles never overlap.
+
+    def __init__(self, rules, cooldown=COOLDOWN_BARS):
+        self.rules = rules
+        self.cooldown = cooldown
+        self.reset()
+
+    def reset(self):
+        self.live = {}
+        self.states = {}
+
+    def feed(self, symbol, data):
+        # New or revised bars of symbol from a fetch (Close and Volume columns); returns alerts.
+        # The first frame of a symbol seeds its indicators and evaluates its last bar only.
+        alerts = []
+        live = self.live.get(symbol)
+        if live is None:
+            self.live[symbol] = live = StreamingIndicators.from_frame(data)
+            self.states[symbol] = [[None, None, -sys.maxsize] for _ in self.rules]
+            self.evaluate(symbol, live, False, alerts)
+        else:
+            live.update_from(data, on_bar=lambda revised: self.evaluate(symbol, live, revised, alerts))
+        return alerts
+
+    def on_bar(self, symbol, timestamp, close, volume):
+        # One bar of a seeded symbol from a stream; the last bar's timestamp again revises it
+        live = self.live[symbol]
+        alerts = []
+        revised = timestamp == live.last_timestamp
+        if revised:
+            live.replace_last(timestamp, close, volume)
+        else:
+            live.push(timestamp, close, volume)
+        self.evaluate(symbol, live, revised, alerts)
+        return alerts
+
+    def evaluate(self, symbol, live, revised, alerts):
+        bar = len(live)
+        for rule, state in zip(self.rules, self.states[symbol]):
+            left, right = rule.values(live)
+            holds = rule.compare(left, right)
+            if revised:
+                # Compared with the bar before, not with this bar's earlier values
+                previous = state[0]
+            else:
+                previous = state[0] = state[1]
+            state[1] = holds
+            if not holds or previous or (previous is None and rule.crossing):
+                continue
+            # Once per bar, then quiet for the cooldown
+            if bar - state[2] < max(self.cooldown, 1):
+                continue
+            state[2] = bar
+            right_text = f"{right:.2f}" if isinstance(rule.right, float) else f"{rule.right} {right:.2f}"
+            alerts.append({
+                'symbol': symbol,
+                'rule': rule.name,
+                'expression': rule.expression,
+                'time': str(live.last_timestamp),
+                'value': float(left),
+                'threshold': float(right),
+                'message': f"{rule.left} {left:.2f} {rule.comparison} {right_text}",
+            })
+
+
+class AlertMonitor:
+    # A watchlist polled as a whole, like the dashboard: one provider call per cycle, and only
+    # the symbols whose last bar changed are fed to the engine
+
+    def __init__(self, symbols, engine, fetch=None, fetch_batch=None, max_workers=8):
+        self.symbols = symbols
+        self.engine = engine
+        self.fetch = fetch
+        self.fetch_batch = fetch_batch
+        self.max_workers = max_workers
+        self.period = None
+        self.seen = None
+
+    def refresh(self, period):
+        # ([alerts], {symbol: error}); runs on a worker thread
+        if period != self.period:
+            self.period = period
+            self.engine.reset()
+            self.seen = None
+        with span('fetch', symbols=len(self.symbols)):
+            panel, errors = fetch_panel(self.symbols, period, self.fetch, self.fetch_batch, self.max_workers)
+
+        alerts = []
+        if panel.empty:
+            for symbol in self.symbols:
+                errors.setdefault(symbol, "No data found")
+            return alerts, errors
+        with span('alert rules') as rules_span:
+            closes = panel['Close'].reindex(columns=self.symbols)
+            volumes = panel['Volume'].reindex(columns=self.symbols)
+            seen = last_bars(closes, volumes)
+            counts = seen[1][2]
+            for j in np.flatnonzero(counts == 0):
+                errors.setdefault(self.symbols[j], "No data found")
+            for j in np.flatnonzero(moved(seen, self.seen) & (counts > 0)):
+                data = pd.DataFrame({'Close': closes.iloc[:, j], 'Volume': volumes.iloc[:, j]})
+                alerts += self.engine.feed(self.symbols[j], data[data['Close'].notna()])
+            self.seen = seen
+            rules_span.set(alerts=len(alerts))
+        return alerts, errors
+
+
+class LogSink:
+    # One JSON line per alert, appended to `path`
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, alerts):
+        if not alerts:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for alert in alerts:
+                f.write(json.dumps(alert, ensure_ascii=False) + '\n')
+
+    def close(self):
+        pass
+
+
+class WebhookSink:
+    # Each batch of alerts POSTed as a JSON list to `url`, in order, from a background thread,
+    # so a slow or unreachable endpoint never holds up the rules. Failures are printed.
+    def __init__(self, url, timeout=5.0):
+        self.url = url
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webhook")
+        self.sent = 0
+        self.failed = 0
+
+    def send(self, alerts):
+        if alerts:
+            self.executor.submit(self._post, list(alerts))
+
+    def _post(self, alerts):
+        request = urllib.request.Request(self.url, data=json.dumps(alerts, ensure_ascii=False).encode('utf-8'),
+                                         headers={'Content-Type': 'application/json'}, method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+            self.sent += len(alerts)
+        except Exception as e:
+            self.failed += len(alerts)
+            print(f"Error posting {len(alerts)} alert(s) to {self.url}: {str(e)}")
+
+    def close(self):
+        # Waits for the alerts already queued
+        self.executor.shutdown(wait=True)
+
+
+def make_sinks(log=None, webhook=None):
+    sinks = []
+    if log:
+        sinks.append(LogSink(log))
+    if webhook:
+        sinks.append(WebhookSink(webhook))
+    return sinks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch symbols and report indicator alerts as bars arrive.")
+    parser.add_argument('symbols', nargs='*', help="Stock symbols, e.g. AAPL TSLA INFY.NS")
+    parser.add_argument('--symbols-file', help="File of symbols separated by commas, spaces or newlines")
+    parser.add_argument('-p', '--period', default='5d', choices=list(PERIOD_INTERVALS),
+                        help="Bars watched; 1d and 5d are hourly (default: 5d)")
+    parser.add_argument('--rule', action='append', default=[],
+                        help="\"name: series comparison value\", e.g. \"Hot: rsi > 75\" or "
+                             "\"macd crosses above signal\"; repeatable (default: the built-in rules)")
+    parser.add_argument('--rules-file', help="File with one rule per line")
+    parser.add_argument('--cooldown', type=int, default=COOLDOWN_BARS,
+                        help=f"Bars before a rule can fire again for a symbol (default: {COOLDOWN_BARS})")
+    parser.add_argument('--interval', type=float, default=60, help="Seconds between polls (default: 60)")
+    parser.add_argument('--cycles', type=int, default=0, help="Stop after this many polls, 0 to run until Ctrl+C")
+    parser.add_argument('--log', help="Append alerts to this file as JSON lines")
+    parser.add_argument('--webhook', help="POST alerts as JSON to this URL")
+    add_provider_arguments(parser)
+    args = parser.parse_args(argv)
+    check_provider_arguments(parser, args)
+    symbols = list(args.symbols)
+    if args.symbols_file:
+        with open(args.symbols_file) as f:
+            symbols += f.read().split()
+    symbols = parse_symbols(' '.join(symbols))
+    if not symbols:
+        parser.error("no symbols given")
+    try:
+        rules = [parse_rule(text) for text in args.rule] + (load_rules(args.rules_file) if args.rules_file else [])
+    except ValueError as e:
+        parser.error(str(e))
+
+    provider = make_provider(*provider_options(args))
+    if provider.supports_batch:
+        fetchers = dict(fetch_batch=provider.get_batch_data)
+    else:
+        fetchers = dict(fetch=provider.get_stock_data)
+    monitor = AlertMonitor(symbols, AlertEngine(rules or default_rules(), args.cooldown), **fetchers)
+    sinks = make_sinks(args.log, args.webhook)
+    reported = set()
+    cycle = 0
+    try:
+        while True:
+            alerts, errors = monitor.refresh(args.period)
+            for alert in alerts:
+                print(format_alert(alert))
+            for sink in sinks:
+                sink.send(alerts)
+            for symbol, error in errors.items():
+                if symbol not in reported:
+                    reported.add(symbol)
+                    print(f"  {symbol}: {error}", file=sys.stderr)
+            cycle += 1
+            if args.cycles and cycle >= args.cycles:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for sink in sinks:
+            sink.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
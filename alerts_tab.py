@@ -0,0 +1,126 @@
+import tkinter as tk
+from tkinter import ttk
+
+from alerts import AlertEngine, AlertMonitor, default_rules
+from background import BackgroundRunner
+from profiling import NULL_RUN
+from watchlist import parse_symbols
+
+ALERT_COLUMNS = ['Time', 'Symbol', 'Rule', 'Condition']
+MAX_ALERT_ROWS = 500  # older alerts are dropped from the table (sinks still get every one)
+
+
+class AlertsTab:
+    def __init__(self, notebook, root, period_var, update_interval, profiler, fetch=None, fetch_batch=None):
+        self.root = root
+        self.period_var = period_var
+        self.update_interval = update_interval
+        self.profiler = profiler
+        self.fetch = fetch
+        self.fetch_batch = fetch_batch
+        # Set by the app from its command line: the rules to watch and where else alerts go
+        self.rules = default_rules()
+        self.sinks = []
+        self.runner = BackgroundRunner(root)
+        self.monitor = None
+        self.cycle_job = None
+
+        self.frame = ttk.Frame(notebook)
+        notebook.add(self.frame, text="Alerts")
+
+        input_frame = ttk.Frame(self.frame, padding="5")
+        input_frame.pack(fill=tk.X)
+        ttk.Label(input_frame, text="Symbols:").pack(side=tk.LEFT)
+        self.symbols_entry = ttk.Entry(input_frame, width=60)
+        self.symbols_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        ttk.Button(input_frame, text="Watch", command=self.start).pack(side=tk.LEFT, padx=5)
+        ttk.Button(input_frame, text="Stop", command=self.stop).pack(side=tk.LEFT, padx=5)
+        ttk.Button(input_frame, text="Clear", command=self.clear).pack(side=tk.LEFT, padx=5)
+        self.status_label = ttk.Label(input_frame, text="")
+        self.status_label.pack(side=tk.LEFT, padx=10)
+
+        self.tree = ttk.Treeview(self.frame, columns=ALERT_COLUMNS, show='headings')
+        for column, width in zip(ALERT_COLUMNS, [180, 90, 200, 400]):
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=width, anchor=tk.W)
+        scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+    def start(self):
+        symbols = parse_symbols(self.symbols_entry.get())
+        if not symbols:
+            self.set_status("Please enter one or more stock symbols", error=True)
+            return
+        self.stop()
+        self.monitor = AlertMonitor(symbols, AlertEngine(self.rules), self.fetch, self.fetch_batch)
+        self.refresh()
+
+    def stop(self):
+        self.monitor = None
+        self.runner.cancel()
+        if self.cycle_job is not None:
+            self.root.after_cancel(self.cycle_job)
+            self.cycle_job = None
+
+    def clear(self):
+        self.tree.delete(*self.tree.get_children())
+
+    def refresh(self):
+        self.cycle_job = None
+        monitor = self.monitor
+        if monitor is None:
+            return
+        period = self.period_var.get()
+        self.set_status(f"Checking {len(monitor.symbols)} symbols against {len(self.rules)} rules ({period})...")
+        run = self.profiler.start_run('alerts', symbols=len(monitor.symbols), period=period)
+        self.runner.submit(
+            lambda task: self.check_cycle(monitor, period, run),
+            on_done=lambda result: self.show_alerts(monitor, result, run),
+            on_error=lambda e: self.cycle_failed(monitor, e, run),
+        )
+
+    def check_cycle(self, monitor, period, run=NULL_RUN):
+        with run.activate():
+            return monitor.refresh(period)
+
+    def show_alerts(self, monitor, result, run=NULL_RUN):
+        if monitor is not self.monitor:
+            return
+        alerts, errors = result
+        run.finish(alerts=len(alerts))
+        for sink in self.sinks:
+            sink.send(alerts)
+        # Newest first
+        for alert in alerts:
+            self.tree.insert('', 0, values=[alert['time'], alert['symbol'], alert['rule'], alert['message']])
+        rows = self.tree.get_children()
+        if len(rows) > MAX_ALERT_ROWS:
+            self.tree.delete(*rows[MAX_ALERT_ROWS:])
+        if alerts:
+            self.root.bell()
+        status = f"{len(alerts)} new alert(s) from {len(monitor.symbols)} symbols"
+        if errors:
+            status += f", {len(errors)} skipped: " + ", ".join(f"{s} ({e})" for s, e in errors.items())
+        self.set_status(status, error=bool(errors))
+        self.schedule_cycle()
+
+    def cycle_failed(self, monitor, error, run=NULL_RUN):
+        run.finish(error=str(error))
+        if monitor is not self.monitor:
+            return
+        self.set_status(f"Alert check failed: {str(error)}", error=True)
+        self.schedule_cycle()
+
+    def schedule_cycle(self):
+        self.cycle_job = self.root.after(self.update_interval, self.refresh)
+
+    def shutdown(self):
+        self.stop()
+        self.runner.shutdown()
+        for sink in self.sinks:
+            sink.close()
+
+    def set_status(self, message, error=False):
+        self.status_label.config(text=message, foreground="red" if error else "")
@@ -0,0 +1,194 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+from indicators import compute_indicators
+from providers import (PERIOD_INTERVALS, add_provider_arguments, check_provider_arguments, make_provider,
+                       provider_options)
+from reports import report_summary, report_texts
+from watchlist import parse_symbols
+
+# The analysis of the Technical Indicators and Insights tabs as a local JSON service:
+#
+#   GET  /analyze?symbol=AAPL&period=1mo      one report
+#   GET  /batch?symbols=AAPL,MSFT&period=1y   reports for several symbols
+#   POST /batch  {"symbols": [...], "period": "1y"}
+#   GET  /health                              cache counters
+#
+# Fetching and computing run on a thread pool; finished reports are kept, already encoded, in an
+# in-process LRU cache with a time to live, and requests for a report being computed wait for
+# that computation, so any number of clients asking for one ticker cost one fetch and one compute.
+
+MAX_BATCH = 100
+JSON_TYPE = 'application/json'
+
+
+class AnalysisCache:
+    # LRU of values with a time to live. Concurrent misses for one key share a single task.
+    # Used from the event loop thread only, so it needs no lock.
+
+    def __init__(self, maxsize=1024, ttl=60.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()  # key -> (expires at, value)
+        self.pending = {}  # key -> task computing it
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get(self, key, compute):
+        # compute() returns an awaitable of the value; failures are raised and not cached
+        entry = self.entries.get(key)
+        if entry is not None:
+            if entry[0] > self.clock():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self.entries[key]
+
+        task = self.pending.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fill(key, compute))
+            self.pending[key] = task
+        else:
+            self.coalesced += 1
+        # A client that goes away must not cancel the computation the others are waiting for
+        return await asyncio.shield(task)
+
+    async def _fill(self, key, compute):
+        try:
+            value = await compute()
+        finally:
+            del self.pending[key]
+        if self.ttl > 0:
+            self.entries[key] = (self.clock() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        return {'entries': len(self.entries), 'pending': len(self.pending), 'hits': self.hits,
+                'misses': self.misses, 'coalesced': self.coalesced}
+
+
+def encode(value):
+    return json.dumps(value, ensure_ascii=False).encode('utf-8')
+
+
+class AnalysisService:
+    def __init__(self, provider, cache=None, workers=8):
+        self.provider = provider
+        self.cache = cache if cache is not None else AnalysisCache()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="service")
+
+    def analyze(self, symbol, period):
+        # Runs on a worker thread: the GUI's fetch, one indicator computation, the tabs' text
+        data = self.provider.get_stock_data(symbol, period)
+        indicators = compute_indicators(data)
+        currency = self.provider.currency(symbol)
+        report = dict(report_summary(symbol, period, data, indicators, currency),
+                      **report_texts(symbol, data, indicators, currency))
+        return encode(report)
+
+    async def report(self, symbol, period):
+        # The encoded report, from the cache or computed once for every caller waiting on it
+        loop = asyncio.get_running_loop()
+        return await self.cache.get((symbol, period),
+                                    lambda: loop.run_in_executor(self.executor, self.analyze, symbol, period))
+
+    async def report_or_error(self, symbol, period):
+        # (HTTP status, body) for one symbol; a batch reports failures per symbol
+        try:
+            return 200, await self.report(symbol, period)
+        except ValueError as e:
+            # The provider's "No data found" and invalid symbols
+            return 404, encode({'symbol': symbol, 'period': period, 'error': str(e)})
+        except Exception as e:
+            return 502, encode({'symbol': symbol, 'period': period, 'error': str(e)})
+
+    async def handle_analyze(self, request):
+        symbol = request.query.get('symbol', '').strip().upper()
+        period = request.query.get('period', '1mo')
+        if not symbol:
+            return error_response(400, "symbol is required")
+        if period not in PERIOD_INTERVALS:
+            return error_response(400, f"Invalid period: {period}")
+        status, body = await self.report_or_error(symbol, period)
+        return web.Response(body=body, status=status, content_type=JSON_TYPE, charset='utf-8')
+
+    async def handle_batch(self, request):
+        if request.method == 'POST':
+            try:
+                params = await request.json()
+            except ValueError:
+                params = None
+            if not isinstance(params, dict):
+                return error_response(400, "Body must be a JSON object")
+            symbols = params.get('symbols', [])
+            symbols = parse_symbols(' '.join(symbols) if isinstance(symbols, list) else str(symbols))
+            period = params.get('period', '1mo')
+        else:
+            symbols = parse_symbols(request.query.get('symbols', ''))
+            period = request.query.get('period', '1mo')
+        if not symbols:
+            return error_response(400, "symbols is required")
+        if len(symbols) > MAX_BATCH:
+            return error_response(400, f"At most {MAX_BATCH} symbols per batch")
+        if period not in PERIOD_INTERVALS:
+            return error_response(400, f"Invalid period: {period}")
+
+        results = await asyncio.gather(*(self.report_or_error(symbol, period) for symbol in symbols))
+        # The cached reports are spliced in as they are, without decoding them again
+        body = b'{"period": ' + encode(period) + b', "results": [' + b', '.join(body for _, body in results) + b']}'
+        return web.Response(body=body, content_type=JSON_TYPE, charset='utf-8')
+
+    async def handle_health(self, request):
+        return web.json_response({'status': 'ok', 'provider': self.provider.name, 'cache': self.cache.stats()})
+
+    async def close(self, app=None):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def error_response(status, message):
+    return web.Response(body=encode({'error': message}), status=status, content_type=JSON_TYPE, charset='utf-8')
+
+
+def make_app(service):
+    app = web.Application()
+    app.add_routes([
+        web.get('/analyze', service.handle_analyze),
+        web.get('/batch', service.handle_batch),
+        web.post('/batch', service.handle_batch),
+        web.get('/health', service.handle_health),
+    ])
+    app.on_cleanup.append(service.close)
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve stock analyses as JSON over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--ttl', type=float, default=60.0,
+                        help="Seconds a report is served from the cache, 0 to turn caching off (default: 60)")
+    parser.add_argument('--cache-size', type=int, default=1024, help="Reports kept in the cache (default: 1024)")
+    parser.add_argument('--workers', type=int, default=8, help="Fetch and compute threads (default: 8)")
+    add_provider_arguments(parser)
+    args = parser.parse_args(argv)
+    check_provider_arguments(parser, args)
+
+    service = AnalysisService(make_provider(*provider_options(args)), AnalysisCache(args.cache_size, args.ttl),
+                              args.workers)
+    web.run_app(make_app(service), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
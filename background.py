@@ -0,0 +1,70 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class BackgroundTask:
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self.messages = queue.Queue()
+
+    def report(self, message):
+        # Safe to call from the worker thread; the runner forwards it on the Tk thread
+        self.messages.put(message)
+
+    def check(self):
+        if self.cancelled.is_set():
+            raise TaskCancelled()
+
+
+class BackgroundRunner:
+    poll_ms = 50
+
+    def __init__(self, root, max_workers=2):
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+        self.task = None
+
+    def submit(self, work, on_done, on_error, on_progress=None):
+        # Only the newest task may touch the widgets, so anything still running is superseded
+        self.cancel()
+        task = BackgroundTask()
+        self.task = task
+        future = self.executor.submit(work, task)
+        self.root.after(self.poll_ms, self._poll, task, future, on_done, on_error, on_progress)
+        return task
+
+    def cancel(self):
+        if self.task is not None:
+            self.task.cancelled.set()
+            self.task = None
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _poll(self, task, future, on_done, on_error, on_progress):
+        # Runs on the Tk thread via root.after, never from the worker
+        if task.cancelled.is_set():
+            return
+        while not task.messages.empty():
+            message = task.messages.get_nowait()
+            if on_progress is not None:
+                on_progress(message)
+        if not future.done():
+            self.root.after(self.poll_ms, self._poll, task, future, on_done, on_error, on_progress)
+            return
+
+        self.task = None
+        try:
+            result = future.result()
+        except TaskCancelled:
+            return
+        except Exception as e:
+            on_error(e)
+            return
+        on_done(result)
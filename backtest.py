@@ -0,0 +1,236 @@
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from tabulate import tabulate
+
+from bar_cache import PERIOD_ORDER
+from indicators import IndicatorSet, RSI_WINDOW, rolling_mean_std
+from providers import add_provider_arguments, check_provider_arguments, make_provider, provider_options
+from rate_limit import max_processes, share_limits
+from watchlist import parse_symbols
+
+# Backtests of the rules the Technical Indicators and Insights tabs state, on historical closes.
+# Every parameter combination of a rule is one column of a (bars, combinations) position matrix,
+# so signals, returns, drawdowns and trades are all whole-array NumPy operations.
+#
+#   rsi        long from RSI < lower ("consider buying") until RSI > upper ("consider selling")
+#   macd       long while MACD > signal ("Bullish Signal")
+#   sma        long while price > SMA ("Bullish")
+#   bollinger  long from price < lower band ("oversold") until price > upper band ("overbought")
+#
+# A position decided on a bar's close earns the next bar's return, so there is no lookahead.
+
+DEFAULT_GRID = {
+    'rsi': {'lower': [20, 25, 30, 35], 'upper': [65, 70, 75, 80]},
+    'macd': {},
+    'sma': {'window': [10, 20, 50, 100, 200]},
+    'bollinger': {'window': [10, 20, 50], 'num_std': [1.5, 2.0, 2.5]},
+}
+
+RESULT_COLUMNS = ['symbol', 'rule', 'params', 'bars', 'total_return', 'buy_hold_return', 'max_drawdown',
+                  'hit_rate', 'trades', 'exposure']
+
+
+def param_combinations(params):
+    names = list(params)
+    return [dict(zip(names, values)) for values in itertools.product(*params.values())]
+
+
+def hold_between(entries, exits):
+    # Long from each entry until the next exit: forward-fill the last event per column
+    n = len(entries)
+    events = entries | exits
+    last_event = np.maximum.accumulate(np.where(events, np.arange(n)[:, None], -1), axis=0)
+    columns = np.arange(entries.shape[1])
+    return np.where(last_event >= 0, entries[np.maximum(last_event, 0), columns], False).astype('float64')
+
+
+def rule_positions(close, rule, combos, indicators=None):
+    # (bars, len(combos)) array of 0/1 positions for one rule
+    close = np.asarray(close, dtype='float64')
+    if indicators is None:
+        indicators = IndicatorSet(close)
+    with np.errstate(invalid='ignore'):
+        if rule == 'rsi':
+            rsi = indicators.rsi[:, None]
+            lower = np.array([c['lower'] for c in combos], dtype='float64')
+            upper = np.array([c['upper'] for c in combos], dtype='float64')
+            return hold_between(rsi < lower, rsi > upper)
+        if rule == 'macd':
+            return (indicators.macd > indicators.signal).astype('float64')[:, None]
+        if rule == 'sma':
+            columns = [close > rolling_mean_std(close, c['window'])[0] for c in combos]
+            return np.column_stack(columns).astype('float64')
+        if rule == 'bollinger':
+            entries, exits = [], []
+            bands = {}
+            for c in combos:
+                if c['window'] not in bands:
+                    bands[c['window']] = rolling_mean_std(close, c['window'])
+                mean, std = bands[c['window']]
+                entries.append(close < mean - c['num_std'] * std)
+                exits.append(close > mean + c['num_std'] * std)
+            return hold_between(np.column_stack(entries), np.column_stack(exits))
+    raise ValueError(f"Unknown rule: {rule}")
+
+
+def evaluate(close, positions, cost=0.0):
+    # Performance of each position column. cost is charged as a fraction of equity per unit of
+    # position change. Trades are runs of consecutive long bars; hit_rate is the share of
+    # trades with a positive return.
+    close = np.asarray(close, dtype='float64')
+    n, k = positions.shape
+    returns = np.zeros(n)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns[1:] = np.nan_to_num(close[1:] / close[:-1] - 1)
+    held = np.zeros((n, k))
+    held[1:] = positions[:-1]
+    changes = np.abs(np.diff(positions, axis=0, prepend=0.0))
+    # Log growth per bar: the held return, then the cost of changing the position on its close
+    growth = np.cumsum(np.log1p(held * returns[:, None]) + np.log1p(-cost * changes), axis=0)
+    equity = np.exp(growth)
+    drawdown = equity / np.maximum.accumulate(np.maximum(equity, 1.0), axis=0) - 1
+
+    steps = np.diff(positions, axis=0, prepend=0.0, append=0.0)
+    entry_columns, entry_rows = np.nonzero(steps.T > 0)
+    exit_rows = np.nonzero(steps.T < 0)[1]
+    # A trade entered on bar i and exited on bar j pays the entry cost on bar i and earns the
+    # returns of bars i+1 .. j; before_bar[t] is the growth up to bar t-1
+    before_bar = np.vstack([np.zeros((1, k)), growth])
+    trade_returns = np.expm1(before_bar[np.minimum(exit_rows, n - 1) + 1, entry_columns]
+                             - before_bar[entry_rows, entry_columns])
+    trades = np.bincount(entry_columns, minlength=k)
+    wins = np.bincount(entry_columns, weights=trade_returns > 0, minlength=k)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        hit_rate = np.where(trades > 0, wins / trades, np.nan)
+
+    return {
+        'total_return': equity[-1] - 1,
+        'buy_hold_return': np.full(k, np.prod(1 + returns) - 1),
+        'max_drawdown': drawdown.min(axis=0),
+        'hit_rate': hit_rate,
+        'trades': trades,
+        'exposure': positions.mean(axis=0),
+    }
+
+
+def backtest_close(close, grid=None, cost=0.0):
+    # Every rule and parameter combination in grid on one close series, one row each
+    close = np.asarray(close, dtype='float64')
+    indicators = IndicatorSet(close)
+    frames = []
+    for rule, params in (grid or DEFAULT_GRID).items():
+        combos = param_combinations(params)
+        metrics = evaluate(close, rule_positions(close, rule, combos, indicators), cost)
+        frame = pd.DataFrame(metrics)
+        frame.insert(0, 'bars', len(close))
+        frame.insert(0, 'params', [', '.join(f"{k}={v}" for k, v in c.items()) for c in combos])
+        frame.insert(0, 'rule', rule)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def backtest_frame(symbol, data, grid=None, cost=0.0):
+    close = data['Close']
+    if close.hasnans:
+        # As in compute_indicators, carry the last price over gaps
+        close = close.ffill()
+    if len(close) <= RSI_WINDOW:
+        raise ValueError("Insufficient data to backtest")
+    results = backtest_close(close.to_numpy(dtype='float64'), grid, cost)
+    results.insert(0, 'symbol', symbol)
+    return results
+
+
+# The data provider of the current process, set up once per worker
+_provider = None
+
+
+def init_worker(provider_factory, factory_args, processes=1):
+    global _provider
+    share_limits(processes)
+    _provider = provider_factory(*factory_args)
+
+
+def run_job(job):
+    symbol, period, grid, cost = job
+    try:
+        return backtest_frame(symbol, _provider.get_stock_data(symbol, period), grid, cost), None
+    except Exception as e:
+        return None, (symbol, str(e))
+
+
+def run_backtests(symbols, period, grid=None, cost=0.0, processes=1, provider_factory=make_provider,
+                  factory_args=()):
+    # Returns (results, errors). processes=1 runs here, 0 uses every core; as in batch_report,
+    # provider_factory must be a module-level function
+    jobs = [(symbol, period, grid, cost) for symbol in symbols]
+    if processes == 1:
+        init_worker(provider_factory, factory_args)
+        outcomes = [run_job(job) for job in jobs]
+    else:
+        workers = processes or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(provider_factory, factory_args, workers)) as pool:
+            outcomes = list(pool.map(run_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+    frames = [frame for frame, error in outcomes if frame is not None]
+    errors = dict(error for frame, error in outcomes if error is not None)
+    results = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=RESULT_COLUMNS)
+    return results, errors
+
+
+def summarize(results):
+    # Average each parameter combination over all symbols
+    return (results.groupby(['rule', 'params'], sort=False)
+            [['total_return', 'buy_hold_return', 'max_drawdown', 'hit_rate', 'trades', 'exposure']]
+            .mean().reset_index().sort_values('total_return', ascending=False))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest the bot's RSI/MACD/SMA/Bollinger rules.")
+    parser.add_argument('symbols', nargs='*', help="Stock symbols, e.g. AAPL TSLA INFY.NS")
+    parser.add_argument('--symbols-file', help="File of symbols separated by commas, spaces or newlines")
+    parser.add_argument('-p', '--period', default='1y', choices=PERIOD_ORDER)
+    parser.add_argument('--cost', type=float, default=0.0, help="Cost per position change, e.g. 0.001 for 10 bp")
+    parser.add_argument('-o', '--output', help="Write every symbol's results to this CSV file")
+    parser.add_argument('-j', '--processes', type=int, default=1,
+                        help="Worker processes, 0 for one per core (default: 1)")
+    add_provider_arguments(parser)
+    args = parser.parse_args(argv)
+    check_provider_arguments(parser, args)
+    symbols = list(args.symbols)
+    if args.symbols_file:
+        with open(args.symbols_file) as f:
+            symbols += f.read().split()
+    symbols = parse_symbols(' '.join(symbols))
+    if not symbols:
+        parser.error("no symbols given")
+    requested = args.processes or os.cpu_count()
+    args.processes = max_processes(args.provider, requested)
+    if args.processes < requested:
+        print(f"Using {args.processes} worker process(es): more would exceed the {args.provider} rate limit")
+
+    start = time.perf_counter()
+    results, errors = run_backtests(symbols, args.period, cost=args.cost, processes=args.processes,
+                                    factory_args=provider_options(args))
+    elapsed = time.perf_counter() - start
+    for symbol, error in errors.items():
+        print(f"  {symbol}: {error}", file=sys.stderr)
+    if results.empty:
+        return 1
+    if args.output:
+        results.to_csv(args.output, index=False)
+    print(tabulate(summarize(results), headers='keys', showindex=False, floatfmt='.3f'))
+    print(f"{results['symbol'].nunique()} symbols, {len(results)} backtests in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from profiling import span
+
+# How long (seconds) a cached series is served as-is before it gets topped up
+INTERVAL_TTL = {
+    '60m': 5 * 60,
+    '60min': 5 * 60,
+    '1d': 60 * 60,
+    '1wk': 6 * 60 * 60,
+}
+
+# Periods ordered from shortest to longest, used to decide if a cached series covers a request
+PERIOD_ORDER = ['1d', '5d', '1mo', '3mo', '6mo', '1y']
+
+
+def trim_to_period(data, period):
+    # 'Nd' periods count trading days, longer periods are calendar offsets from the last bar.
+    # The index is ascending, so the period is a tail of the frame and is returned as a view.
+    if data is None or data.empty or period not in PERIOD_ORDER:
+        return data
+    if period.endswith('d'):
+        days = data.index.normalize()
+        first_day = days.unique()[-int(period[:-1]):][0]
+        return data.iloc[days.searchsorted(first_day, side='left'):]
+    if period.endswith('mo'):
+        start = data.index[-1] - pd.DateOffset(months=int(period[:-2]))
+    else:
+        start = data.index[-1] - pd.DateOffset(years=int(period[:-1]))
+    return data.iloc[data.index.searchsorted(start, side='right'):]
+
+
+class BarCache:
+    def __init__(self, cache_dir=None, ttl=None):
+        self.cache_dir = cache_dir or os.path.join(os.path.expanduser('~'), '.stockbot_cache')
+        self.ttl = dict(INTERVAL_TTL, **(ttl or {}))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.index_path = os.path.join(self.cache_dir, 'index.json')
+        self.index = self._load_index()
+        # Cache-wide lock: every read and update of the index, the index file write and the
+        # per-key lock table go through it
+        self.lock = threading.Lock()
+        self.key_locks = {}
+
+    def _load_index(self):
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        # Called with self.lock held. Other processes may share the directory (batch reports):
+        # keep their newer entries
+        for key, entry in self._load_index().items():
+            if entry.get('fetched_at', 0) > self.index.get(key, {}).get('fetched_at', 0):
+                self.index[key] = entry
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _entry(self, key):
+        # A copy of key's index entry, or None
+        with self.lock:
+            entry = self.index.get(key)
+            return None if entry is None else dict(entry)
+
+    def _record_fetch(self, key, period=None):
+        # Update key's entry and write the index as one step
+        with self.lock:
+            entry = self.index.setdefault(key, {})
+            entry['fetched_at'] = time.time()
+            if period is not None:
+                # A full fetch defines how far back the stored series reaches
+                entry['period'] = period
+            self._save_index()
+
+    def _key_lock(self, key):
+        with self.lock:
+            return self.key_locks.setdefault(key, threading.Lock())
+
+    def _key(self, provider, symbol, interval):
+        return f"{provider}_{symbol}_{interval}".replace('/', '_').replace('^', '_')
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + '.parquet')
+
+    def load(self, provider, symbol, interval):
+        key = self._key(provider, symbol, interval)
+        if self._entry(key) is None or not os.path.exists(self._path(key)):
+            return None
+        try:
+            with span('cache read') as s:
+                data = pd.read_parquet(self._path(key))
+                s.set(rows=len(data))
+                return data
+        except Exception as e:
+            print(f"Error reading cached bars for {symbol}: {str(e)}")
+            return None
+
+    def store(self, provider, symbol, interval, data, period=None):
+        key = self._key(provider, symbol, interval)
+        tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        with span('cache write', rows=len(data)):
+            data.to_parquet(tmp_path)
+            os.replace(tmp_path, self._path(key))
+        self._record_fetch(key, period)
+
+    def _covers(self, cached_period, period):
+        if cached_period not in PERIOD_ORDER or period not in PERIOD_ORDER:
+            return False
+        return PERIOD_ORDER.index(cached_period) >= PERIOD_ORDER.index(period)
+
+    def is_fresh(self, provider, symbol, interval):
+        entry = self._entry(self._key(provider, symbol, interval))
+        if entry is None:
+            return False
+        return time.time() - entry['fetched_at'] < self.ttl.get(interval, 0)
+
+    def _fetch_full(self, provider, symbol, interval, period, fetch_full):
+        data = fetch_full()
+        if data is None or data.empty:
+            return data
+        data = data.sort_index()
+        self.store(provider, symbol, interval, data, period)
+        return data
+
+    def get(self, provider, symbol, interval, period, fetch_full, fetch_since):
+        # Concurrent requests for the same series wait for one fetch instead of racing on the file
+        with self._key_lock(self._key(provider, symbol, interval)):
+            return self._get(provider, symbol, interval, period, fetch_full, fetch_since)
+
+    def _get(self, provider, symbol, interval, period, fetch_full, fetch_since):
+        # fetch_full() downloads the whole window for period, fetch_since(ts) the bars from ts on
+        key = self._key(provider, symbol, interval)
+        cached = self.load(provider, symbol, interval)
+        entry = self._entry(key)
+        if cached is None or cached.empty or entry is None or not self._covers(entry.get('period'), period):
+            return self._fetch_full(provider, symbol, interval, period, fetch_full)
+
+        if self.is_fresh(provider, symbol, interval):
+            return cached
+
+        # The last stored bar may still have been forming, so re-fetch it as part of the delta
+        delta = fetch_since(cached.index[-1])
+        if delta is None or delta.empty:
+            self._record_fetch(key)
+            return cached
+        delta = delta.sort_index()
+        if delta.index[0] > cached.index[-1]:
+            # The delta does not reach back to the cached tail, so there is a gap: refetch
+            return self._fetch_full(provider, symbol, interval, period, fetch_full)
+
+        merged = pd.concat([cached[cached.index < delta.index[0]], delta])
+        self.store(provider, symbol, interval, merged)
+        return merged
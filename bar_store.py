@@ -0,0 +1,177 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from pandas.arrays import DatetimeArray
+
+from bar_cache import trim_to_period
+
+# Append-only bar files read through memory maps, for years of intraday bars per symbol.
+# One file holds one symbol and interval: a 64-byte header, then the timestamps (int64
+# nanoseconds, UTC) and the Open/High/Low/Close/Volume columns (float64), each in its own
+# region of `capacity` slots. Every column is contiguous on disk and in the views handed out,
+# and the unused slots are sparse, so headroom for appends costs no disk space.
+
+STORE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+COLUMN_INDEX = pd.Index(STORE_COLUMNS)  # Built once: constructing it is most of a small query
+MAGIC = b'BARSTOR1'
+HEADER = np.dtype([('magic', 'S8'), ('capacity', '<i8'), ('length', '<i8'), ('tz', 'S40')])
+MIN_CAPACITY = 4096
+
+# Calendar days that always contain a selectable period, so a period is cut from a short tail
+# of the file instead of the whole series
+PERIOD_LOOKBACK = {
+    '1d': pd.Timedelta(days=10),
+    '5d': pd.Timedelta(days=21),
+    '1mo': pd.Timedelta(days=32),
+    '3mo': pd.Timedelta(days=93),
+    '6mo': pd.Timedelta(days=185),
+    '1y': pd.Timedelta(days=367),
+}
+
+
+def _read_header(path):
+    header = np.fromfile(path, dtype=HEADER, count=1)
+    if len(header) == 0 or header[0]['magic'] != MAGIC:
+        raise ValueError(f"Not a bar store file: {path}")
+    return header[0]
+
+
+def _create(path, capacity, tz):
+    # Header only; truncate() extends the file with holes up to the full capacity
+    header = np.zeros(1, dtype=HEADER)
+    header[0] = (MAGIC, capacity, 0, tz.encode())
+    with open(path, 'wb') as f:
+        f.write(header.tobytes())
+        f.truncate(HEADER.itemsize + (len(STORE_COLUMNS) + 1) * capacity * 8)
+
+
+def _regions(path, capacity, mode='r'):
+    # (6, capacity) int64 array: row 0 the timestamps, rows 1-5 the OHLCV bits
+    return np.memmap(path, dtype='<i8', mode=mode, offset=HEADER.itemsize,
+                     shape=(len(STORE_COLUMNS) + 1, capacity))
+
+
+class StoredBars:
+    # A read-only snapshot of one file: the bars present when it was opened. Slices are views
+    # of the memory map, so only the pages a query touches are ever read.
+
+    def __init__(self, path):
+        header = _read_header(path)
+        self.path = path
+        self.tz = header['tz'].decode() or None
+        length = int(header['length'])
+        regions = _regions(path, int(header['capacity']))
+        self.times = regions[0, :length]
+        self.values = regions[1:, :length].view('<f8')
+
+    def __len__(self):
+        return len(self.times)
+
+    def timestamp(self, value):
+        # int64 nanoseconds of a bound; naive bounds are in the store's time zone
+        value = pd.Timestamp(value)
+        if value.tz is None and self.tz is not None:
+            value = value.tz_localize(self.tz)
+        return value.as_unit('ns').value
+
+    def locate(self, start=None, end=None):
+        # Row range of the bars with start <= time <= end: two binary searches on the index
+        i = 0 if start is None else int(np.searchsorted(self.times, self.timestamp(start), side='left'))
+        j = len(self) if end is None else int(np.searchsorted(self.times, self.timestamp(end), side='right'))
+        return i, max(i, j)
+
+    def index(self, i=0, j=None):
+        times = self.times[i:j].view('M8[ns]')
+        if self.tz is None:
+            return pd.DatetimeIndex(times, copy=False)
+        # Wrapped as is: the public constructors copy when they attach a time zone
+        return pd.DatetimeIndex(DatetimeArray._simple_new(times, dtype=pd.DatetimeTZDtype('ns', self.tz)),
+                                copy=False)
+
+    def column(self, name, start=None, end=None):
+        i, j = self.locate(start, end)
+        return self.values[STORE_COLUMNS.index(name), i:j]
+
+    def frame(self, start=None, end=None):
+        # Normalized OHLCV frame whose index and columns are all views of the file
+        i, j = self.locate(start, end)
+        return pd.DataFrame(self.values[:, i:j].T, index=self.index(i, j), columns=COLUMN_INDEX, copy=False)
+
+    def period(self, period):
+        if len(self) == 0:
+            return self.frame()
+        last = pd.Timestamp(int(self.times[-1]), tz='UTC')
+        return trim_to_period(self.frame(start=last - PERIOD_LOOKBACK[period]), period)
+
+
+class BarStore:
+    # A directory of bar files, one per symbol and interval. One process writes a file at a
+    # time; readers in any process see the bars that were there when they opened it.
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(os.path.expanduser('~'), '.stockbot_store')
+        os.makedirs(self.directory, exist_ok=True)
+        self.lock = threading.Lock()
+
+    def path(self, symbol, interval):
+        return os.path.join(self.directory, f"{symbol}_{interval}".replace('/', '_').replace('^', '_') + '.bars')
+
+    def open(self, symbol, interval):
+        path = self.path(symbol, interval)
+        if not os.path.exists(path):
+            raise ValueError(f"No stored bars for {symbol} ({interval}) in {self.directory}")
+        return StoredBars(path)
+
+    def append(self, symbol, interval, data):
+        # Adds the bars of data newer than the last stored one, which is replaced if data has it
+        # again (it may have still been forming). Returns the number of bars added.
+        if data is None or data.empty:
+            return 0
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+        index = data.index
+        tz = '' if index.tz is None else str(index.tz)
+        times = index.as_unit('ns').asi8
+        path = self.path(symbol, interval)
+        with self.lock:
+            if not os.path.exists(path):
+                _create(path, max(MIN_CAPACITY, len(times)), tz)
+            header = _read_header(path)
+            capacity, length = int(header['capacity']), int(header['length'])
+            if header['tz'].decode() != tz:
+                raise ValueError(f"Bars for {symbol} ({interval}) are stored in {header['tz'].decode() or 'naive'} "
+                                 f"time, not {tz or 'naive'} time")
+
+            start = length
+            if length:
+                last = _regions(path, capacity)[0, length - 1]
+                first_new = int(np.searchsorted(times, last, side='left'))
+                if first_new < len(times) and times[first_new] == last:
+                    start = length - 1
+                times, data = times[first_new:], data.iloc[first_new:]
+            if len(times) == 0:
+                return 0
+
+            end = start + len(times)
+            if end > capacity:
+                path_tmp = f"{path}.{os.getpid()}.tmp"
+                new_capacity = max(2 * capacity, end)
+                _create(path_tmp, new_capacity, tz)
+                _regions(path_tmp, new_capacity, 'r+')[:, :start] = _regions(path, capacity)[:, :start]
+                # Readers holding the old file keep their snapshot
+                os.replace(path_tmp, path)
+                capacity = new_capacity
+
+            regions = _regions(path, capacity, 'r+')
+            regions[0, start:end] = times
+            values = regions[1:].view('<f8')
+            for row, name in enumerate(STORE_COLUMNS):
+                values[row, start:end] = data[name].to_numpy(dtype='float64') if name in data else np.nan
+            regions.flush()
+            # The length goes last, so a reader never sees slots that are not written yet
+            header['capacity'], header['length'] = capacity, end
+            with open(path, 'r+b') as f:
+                f.write(np.array([header], dtype=HEADER).tobytes())
+            return end - length
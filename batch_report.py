@@ -0,0 +1,151 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from bar_cache import PERIOD_ORDER
+from indicators import compute_indicators
+from providers import add_provider_arguments, check_provider_arguments, make_provider, provider_options
+from rate_limit import max_processes, share_limits
+from reports import report_summary, report_texts
+from watchlist import parse_symbols
+
+# Headless reports for many symbols and periods. Nothing on this path imports tkinter or the
+# TkAgg backend; charts are drawn on an Agg canvas, and only when PNG output is requested.
+
+FORMATS = ['json', 'csv', 'png']
+SUMMARY_COLUMNS = ['symbol', 'period', 'bars', 'last_bar', 'currency', 'price', 'change_pct', 'sma_20',
+                   'bollinger_upper', 'bollinger_lower', 'rsi', 'macd', 'signal', 'volume',
+                   'average_volume', 'volume_ratio', 'seconds', 'error']
+
+# The data provider and the PNG chart of the current process, set up once per worker
+_provider = None
+_chart = None
+
+
+def init_worker(provider_factory, factory_args, processes=1):
+    # Each process throttles on its own, so it may only use its share of the provider's limit
+    global _provider
+    share_limits(processes)
+    _provider = provider_factory(*factory_args)
+
+
+def write_chart(path, symbol, data, indicators):
+    # Imported here so JSON/CSV-only runs never load the chart code. The figure and its artists
+    # are built on the first PNG and reused for every later one.
+    global _chart
+    from matplotlib.image import imsave
+    if _chart is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        from chart import ChartRenderer
+
+        figure = Figure(figsize=(12, 8))
+        _chart = ChartRenderer(figure, FigureCanvasAgg(figure), animated=False)
+    _chart.render(data.index, indicators, f'{symbol} Stock Price with SMA and Bollinger Bands')
+    # render() has just drawn the canvas; print_png would draw it all over again
+    imsave(path, _chart.canvas.buffer_rgba())
+
+
+def report_name(output_dir, symbol, period):
+    return os.path.join(output_dir, f"{symbol.replace('/', '_').replace('^', '_')}_{period}")
+
+
+def run_job(job):
+    # One symbol and period: fetch, compute once, write the requested files, return the CSV row
+    symbol, period, formats, output_dir = job
+    start = time.perf_counter()
+    try:
+        data = _provider.get_stock_data(symbol, period)
+        indicators = compute_indicators(data)
+        currency = _provider.currency(symbol)
+        summary = report_summary(symbol, period, data, indicators, currency)
+        name = report_name(output_dir, symbol, period)
+        if 'json' in formats:
+            report = dict(summary, **report_texts(symbol, data, indicators, currency))
+            with open(name + '.json', 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        if 'png' in formats:
+            write_chart(name + '.png', symbol, data, indicators)
+        summary['error'] = ''
+    except Exception as e:
+        summary = {'symbol': symbol, 'period': period, 'error': str(e)}
+    summary['seconds'] = round(time.perf_counter() - start, 4)
+    return summary
+
+
+def run_reports(symbols, periods, formats, output_dir, processes=1, provider_factory=make_provider,
+                factory_args=()):
+    # processes=1 runs in this process; 0 uses every core. provider_factory must be a module-level
+    # function so that worker processes can rebuild the provider.
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(symbol, period, formats, output_dir) for symbol in symbols for period in periods]
+    if processes == 1:
+        init_worker(provider_factory, factory_args)
+        rows = [run_job(job) for job in jobs]
+    else:
+        workers = processes or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(provider_factory, factory_args, workers)) as pool:
+            rows = list(pool.map(run_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+    summary = pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+    if 'csv' in formats:
+        summary.to_csv(os.path.join(output_dir, 'summary.csv'), index=False)
+    return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Write stock analysis reports without the GUI.")
+    parser.add_argument('symbols', nargs='*', help="Stock symbols, e.g. AAPL TSLA INFY.NS")
+    parser.add_argument('--symbols-file', help="File of symbols separated by commas, spaces or newlines")
+    parser.add_argument('-p', '--periods', nargs='+', default=['1mo'], choices=PERIOD_ORDER)
+    parser.add_argument('-f', '--formats', nargs='+', default=['json', 'csv'], choices=FORMATS)
+    parser.add_argument('-o', '--output-dir', default='reports')
+    add_provider_arguments(parser)
+    parser.add_argument('-j', '--processes', type=int, default=1,
+                        help="Worker processes, 0 for one per core (default: 1)")
+    args = parser.parse_args(argv)
+
+    symbols = list(args.symbols)
+    if args.symbols_file:
+        with open(args.symbols_file) as f:
+            symbols += f.read().split()
+    args.symbols = parse_symbols(' '.join(symbols))
+    if not args.symbols:
+        parser.error("no symbols given")
+    check_provider_arguments(parser, args)
+    if args.processes < 0:
+        parser.error("--processes must be 0 or more")
+    requested = args.processes or os.cpu_count()
+    args.processes = max_processes(args.provider, requested)
+    if args.processes < requested:
+        print(f"Using {args.processes} worker process(es): more would exceed the {args.provider} rate limit")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    summary = run_reports(args.symbols, args.periods, args.formats, args.output_dir, args.processes,
+                          factory_args=provider_options(args))
+    failed = summary[summary['error'] != '']
+    print(f"{len(summary) - len(failed)} of {len(summary)} reports written to {args.output_dir} "
+          f"in {time.perf_counter() - start:.1f}s")
+    if getattr(_provider, 'scheduler', None) is not None:
+        # Only in-process runs with a remote provider; pool workers keep their own counters
+        metrics = _provider.scheduler.metrics()
+        print(f"Provider calls: {metrics['calls_made']} made, {metrics['calls_saved']} saved, "
+              f"{metrics['retries']} retried, {metrics['queue_wait']:.1f}s waiting for the rate limit")
+    for row in failed.itertuples():
+        print(f"  {row.symbol} ({row.period}): {row.error}", file=sys.stderr)
+    return 1 if len(failed) == len(summary) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
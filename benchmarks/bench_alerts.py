@@ -0,0 +1,190 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alerts import DEFAULT_RULES, AlertEngine, AlertMonitor, LogSink, Rule, WebhookSink, default_rules
+from bench_dashboard import BatchFeed
+from fake_provider import make_bars
+from indicators import compute_indicators
+
+# Throughput of the alert engine in symbol x rule evaluations per second, with each new bar
+# going through the streaming indicators and then every rule, against recomputing the indicators
+# over the whole history for every bar. Also a polling cycle of the watchlist monitor, delivery
+# to a local webhook stand-in and a log file, and a check that the streamed firings match the
+# rules evaluated offline on a full indicator computation.
+
+SEED_BARS = 300
+NEW_BARS = 100
+
+
+def make_series(symbols):
+    index = pd.date_range(end='2025-06-30 16:00', periods=SEED_BARS + NEW_BARS, freq='h')
+    return {symbol: make_bars(index, seed=i)[['Close', 'Volume']] for i, symbol in enumerate(symbols)}
+
+
+def more_rules(copies):
+    # The built-in rules with shifted thresholds, `copies` sets of them
+    rules = []
+    for k in range(copies):
+        for name, expression in DEFAULT_RULES.items():
+            left, right = expression.rsplit(' ', 1)
+            try:
+                right = f"{float(right) + k:g}"
+            except ValueError:
+                pass
+            rules.append(Rule(f"{name} {k}", f"{left} {right}"))
+    return rules
+
+
+def seeded_engine(series, rules):
+    engine = AlertEngine(rules)
+    for symbol, data in series.items():
+        engine.feed(symbol, data.iloc[:SEED_BARS])
+    return engine
+
+
+def stream(engine, series):
+    # Every symbol's new bars, one bar at a time, interleaved as a live feed would deliver them
+    columns = {symbol: (data.index[SEED_BARS:], data['Close'].to_numpy()[SEED_BARS:],
+                        data['Volume'].to_numpy()[SEED_BARS:]) for symbol, data in series.items()}
+    alerts = []
+    start = time.perf_counter()
+    for i in range(NEW_BARS):
+        for symbol, (index, close, volume) in columns.items():
+            alerts += engine.on_bar(symbol, index[i], close[i], volume[i])
+    return time.perf_counter() - start, alerts
+
+
+def offline_firings(data, rules, cooldown):
+    # The engine's semantics over full-history arrays: (rule name, bar time) of every firing
+    indicators = compute_indicators(data)
+    volume = indicators.volume
+    counts = np.cumsum(~np.isnan(volume))
+    series = {name: getattr(indicators, name) for name in ['close', 'sma_20', 'bollinger_upper', 'bollinger_lower',
+                                                           'rsi', 'macd', 'signal']}
+    series['volume_ratio'] = volume / (np.nancumsum(volume) / counts) * 100
+    firings = set()
+    for rule in rules:
+        right = rule.right if isinstance(rule.right, float) else series[rule.right]
+        holds = rule.compare(series[rule.left], right)
+        previous, last_fired = None, -sys.maxsize
+        for i in range(SEED_BARS - 1, len(data)):
+            bar = i + 1
+            if holds[i] and not previous and not (previous is None and rule.crossing) \
+                    and bar - last_fired >= max(cooldown, 1):
+                last_fired = bar
+                firings.add((rule.name, str(data.index[i])))
+            previous = holds[i]
+    return firings
+
+
+def check_parity(series, rules):
+    engine = AlertEngine(rules)
+    streamed = {}
+    for symbol, data in series.items():
+        alerts = engine.feed(symbol, data.iloc[:SEED_BARS])
+        for i in range(SEED_BARS, len(data)):
+            alerts += engine.on_bar(symbol, data.index[i], data['Close'].iloc[i], data['Volume'].iloc[i])
+        streamed[symbol] = {(alert['rule'], alert['time']) for alert in alerts}
+    for symbol, data in series.items():
+        expected = offline_firings(data, rules, engine.cooldown)
+        assert streamed[symbol] == expected, (symbol, streamed[symbol] ^ expected)
+    return sum(len(firings) for firings in streamed.values())
+
+
+class Receiver(BaseHTTPRequestHandler):
+    # Local webhook stand-in: counts the alerts POSTed to it
+    received = 0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        Receiver.received += len(json.loads(body))
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    print(f"{NEW_BARS} new hourly bars per symbol, streamed one bar at a time after {SEED_BARS} seed bars:")
+    for n in [100, 1000]:
+        series = make_series([f"SYM{i}" for i in range(n)])
+        base, _ = stream(seeded_engine(series, []), series)
+        for rules in [default_rules(), more_rules(4)]:
+            seconds, alerts = stream(seeded_engine(series, rules), series)
+            evaluations = n * NEW_BARS * len(rules)
+            print(f"  {n:5d} symbols x {len(rules):2d} rules: {seconds * 1e6 / (n * NEW_BARS):6.1f} us per bar "
+                  f"({base * 1e6 / (n * NEW_BARS):4.1f} us of it indicator update) | "
+                  f"{evaluations / seconds / 1e6:5.2f} M symbol x rule evaluations/s, "
+                  f"{evaluations / (seconds - base) / 1e6:5.2f} M/s for the rules alone | {len(alerts)} alerts")
+
+    # The same bar evaluated by recomputing every indicator over the history
+    series = make_series([f"SYM{i}" for i in range(20)])
+    rules = default_rules()
+    start = time.perf_counter()
+    for data in series.values():
+        for i in range(SEED_BARS, SEED_BARS + 20):
+            indicators = compute_indicators(data.iloc[:i + 1])
+            for rule in rules:
+                rule.compare(getattr(indicators, rule.left)[-1] if rule.left != 'volume_ratio'
+                             else indicators.volume_ratio, rule.right if isinstance(rule.right, float)
+                             else getattr(indicators, rule.right)[-1])
+    recompute = (time.perf_counter() - start) / (20 * 20)
+    print(f"  recomputing indicators over {SEED_BARS} bars for each new bar: {recompute * 1e6:6.1f} us per bar "
+          f"with {len(rules)} rules")
+
+    print("\nwatchlist monitor, one batched fetch per cycle:")
+    for n in [50, 500]:
+        symbols = [f"SYM{i}" for i in range(n)]
+        feed = BatchFeed(symbols)
+        monitor = AlertMonitor(symbols, AlertEngine(default_rules()), fetch_batch=feed)
+        monitor.refresh('1y')
+        rng = np.random.default_rng(0)
+        for label, changes in [("no change", 0), ("10% changed", n // 10), ("all changed", n)]:
+            times = []
+            for _ in range(5):
+                feed.revise(rng.choice(symbols, changes, replace=False), rng)
+                start = time.perf_counter()
+                monitor.refresh('1y')
+                times.append((time.perf_counter() - start) * 1000)
+            print(f"  {n:3d} symbols, {label:<11} {np.median(times):7.2f} ms per cycle")
+
+    print("\ndelivery:")
+    series = make_series([f"SYM{i}" for i in range(200)])
+    _, alerts = stream(seeded_engine(series, default_rules()), series)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Receiver)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with tempfile.TemporaryDirectory() as directory:
+        log = LogSink(os.path.join(directory, 'alerts.jsonl'))
+        webhook = WebhookSink(f"http://127.0.0.1:{server.server_address[1]}/alerts")
+        batches = [alerts[i:i + 50] for i in range(0, len(alerts), 50)]
+        start = time.perf_counter()
+        for batch in batches:
+            log.send(batch)
+            webhook.send(batch)
+        queued = time.perf_counter() - start
+        webhook.close()
+        delivered = time.perf_counter() - start
+        with open(log.path, encoding='utf-8') as f:
+            logged = sum(1 for _ in f)
+    server.shutdown()
+    assert logged == Receiver.received == webhook.sent == len(alerts)
+    print(f"  {len(alerts)} alerts in {len(batches)} batches: {queued * 1000:.1f} ms on the caller's thread, "
+          f"all POSTed to the local webhook after {delivered * 1000:.1f} ms; {logged} logged")
+
+    fired = check_parity(make_series([f"SYM{i}" for i in range(30)]), more_rules(2))
+    print(f"\nstreamed firings ({fired}) match the rules evaluated on a full indicator computation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtest import DEFAULT_GRID, backtest_close, evaluate, param_combinations, rule_positions, run_backtests
+from bench_batch_report import stand_in_provider
+from indicators import IndicatorSet
+
+# Vectorized backtests: parity with a per-bar reference loop, bars x combinations per second on
+# one series, and a parameter sweep over many symbols in and across processes
+
+
+def reference_positions(entries, exits):
+    position, out = 0.0, []
+    for entry, exit_ in zip(entries, exits):
+        if entry:
+            position = 1.0
+        elif exit_:
+            position = 0.0
+        out.append(position)
+    return np.array(out)
+
+
+def reference_evaluate(close, positions, cost):
+    # One bar at a time, the way a hand-written backtest would do it
+    equity, peak, worst = 1.0, 1.0, 0.0
+    trades, wins, trade_start = 0, 0, None
+    previous = 0.0
+    for i in range(len(close)):
+        if i > 0:
+            equity *= 1 + previous * (close[i] / close[i - 1] - 1)
+        if positions[i] != previous:
+            if positions[i] > previous:
+                trades += 1
+                trade_start = equity
+            equity *= 1 - cost * abs(positions[i] - previous)
+            if positions[i] < previous:
+                wins += equity > trade_start
+                trade_start = None
+        peak = max(peak, equity)
+        worst = min(worst, equity / peak - 1)
+        previous = positions[i]
+    if trade_start is not None:
+        wins += equity > trade_start
+    return equity - 1, worst, (wins / trades if trades else np.nan), trades
+
+
+def check_parity(n=3000, cost=0.001):
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    indicators = IndicatorSet(close)
+    for rule, params in DEFAULT_GRID.items():
+        combos = param_combinations(params)
+        positions = rule_positions(close, rule, combos, indicators)
+        metrics = evaluate(close, positions, cost)
+        for column, combo in enumerate(combos):
+            if rule == 'rsi':
+                with np.errstate(invalid='ignore'):
+                    expected = reference_positions(indicators.rsi < combo['lower'], indicators.rsi > combo['upper'])
+                assert np.array_equal(positions[:, column], expected), (rule, combo)
+            total, drawdown, hit_rate, trades = reference_evaluate(close, positions[:, column], cost)
+            assert np.isclose(metrics['total_return'][column], total, rtol=1e-9), (rule, combo)
+            assert np.isclose(metrics['max_drawdown'][column], drawdown, rtol=1e-9), (rule, combo)
+            assert np.isclose(metrics['hit_rate'][column], hit_rate, equal_nan=True), (rule, combo)
+            assert metrics['trades'][column] == trades, (rule, combo)
+    return sum(len(param_combinations(params)) for params in DEFAULT_GRID.values())
+
+
+def main():
+    combos = check_parity()
+    print(f"parity with the per-bar reference loop: {combos} combinations ok\n")
+
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 100_000)))
+    positions = rule_positions(close, 'sma', [{'window': 20}])[:, 0]
+    start = time.perf_counter()
+    reference_evaluate(close, positions, 0.001)
+    elapsed = time.perf_counter() - start
+    print(f"per-bar loop, one combination: {100_000 / elapsed / 1e6:6.2f} M bar-combinations/s")
+    for n in [10_000, 100_000, 1_000_000]:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        start = time.perf_counter()
+        results = backtest_close(close)
+        elapsed = time.perf_counter() - start
+        print(f"{n:>9,} bars x {len(results)} combinations: {elapsed * 1000:8.1f} ms "
+              f"({n * len(results) / elapsed / 1e6:6.1f} M bar-combinations/s)")
+
+    symbols = [f"SYM{i:03d}" for i in range(64)]
+    print(f"\n{os.cpu_count()} cores, {len(symbols)} symbols, period 1y (weekly bars), stand-in provider")
+    for processes in [1, 4]:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            start = time.perf_counter()
+            results, errors = run_backtests(symbols, '1y', processes=processes,
+                                            provider_factory=stand_in_provider, factory_args=(cache_dir, 0.0))
+            elapsed = time.perf_counter() - start
+        assert not errors, errors
+        print(f"{processes} processes: {len(results)} backtests in {elapsed:6.2f} s "
+              f"({len(results) / elapsed:7.1f} backtests/s)")
+
+
+if __name__ == "__main__":
+    main()
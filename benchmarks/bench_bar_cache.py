@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bar_cache import BarCache
+from providers import YFinanceProvider
+from fake_provider import FakeTicker, unthrottled_scheduler
+
+# Repeat-analysis latency of YFinanceProvider.get_stock_data with and without the bar cache
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main(symbol='AAPL', repeats=5):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for period in ['5d', '1mo', '1y']:
+            # Without the cache every Analyze click downloads the full window
+            uncached = [timed(FakeTicker(symbol).history, period,
+                              '60m' if period == '5d' else '1d' if period == '1mo' else '1wk')[0]
+                        for _ in range(repeats)]
+
+            fresh_provider = YFinanceProvider(cache=BarCache(cache_dir), ticker_cls=FakeTicker,
+                                              scheduler=unthrottled_scheduler())
+            cold, _ = timed(fresh_provider.get_stock_data, symbol, period)
+            fresh = [timed(fresh_provider.get_stock_data, symbol, period)[0] for _ in range(repeats)]
+
+            # TTL of zero forces a delta top-up on every repeat
+            stale_provider = YFinanceProvider(cache=BarCache(cache_dir, ttl={'60m': 0, '1d': 0, '1wk': 0}),
+                                              ticker_cls=FakeTicker, scheduler=unthrottled_scheduler())
+            delta = [timed(stale_provider.get_stock_data, symbol, period)[0] for _ in range(repeats)]
+
+            print(f"{period:>4}: no cache {min(uncached):8.1f} ms | cold {cold:8.1f} ms | "
+                  f"cached {min(fresh):8.1f} ms | delta top-up {min(delta):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bar_store import BarStore
+from fake_provider import make_bars
+from indicators import compute_indicators
+from providers import normalize_ohlcv
+
+# Memory-mapped bar store against the DataFrame path (the whole series read from Parquet, as the
+# bar cache and replay provider do): open time, range-query latency, resident memory, and the
+# cost of analyzing a one-year window. Each measurement runs in a fresh process so resident
+# memory is not shared between the two; the files are in the page cache for both.
+
+QUERIES = {'1 day': pd.Timedelta(days=1), '1 month': pd.Timedelta(days=30), '1 year': pd.Timedelta(days=365)}
+
+
+def session_minutes(years):
+    # Regular-session 1-minute bars, 390 a day
+    days = pd.bdate_range(end='2025-12-31', periods=252 * years, tz='America/New_York')
+    opens = days + pd.Timedelta(hours=9, minutes=30)
+    offsets = pd.to_timedelta(np.arange(390), unit='min')
+    return pd.DatetimeIndex((opens.as_unit('ns').asi8[:, None] + offsets.as_unit('ns').asi8).ravel(),
+                            dtype='datetime64[ns, UTC]').tz_convert('America/New_York')
+
+
+def rss_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+
+
+def probe(kind, path):
+    # Runs in its own process: open the series, time random range queries, analyze one year
+    base = rss_mb()
+    start = time.perf_counter()
+    if kind == 'store':
+        directory, symbol = os.path.split(path)
+        bars = BarStore(directory).open(symbol, '1m')
+        first, last = pd.Timestamp(int(bars.times[0]), tz='UTC'), pd.Timestamp(int(bars.times[-1]), tz='UTC')
+        query = bars.frame
+    else:
+        data = normalize_ohlcv(pd.read_parquet(path))
+        first, last = data.index[0], data.index[-1]
+        query = lambda start, end: data.loc[start:end]
+    result = {'open_ms': (time.perf_counter() - start) * 1000, 'open_rss': rss_mb() - base}
+
+    rng = np.random.default_rng(0)
+    for label, span in QUERIES.items():
+        starts = first + (last - span - first) * rng.random(200)
+        times = []
+        for start in starts:
+            begin = time.perf_counter()
+            window = query(start, start + span)
+            window['Close'].to_numpy().sum()
+            times.append(time.perf_counter() - begin)
+        result[label] = np.median(times) * 1e6
+    result['query_rss'] = rss_mb() - base
+
+    begin = time.perf_counter()
+    window = query(last - QUERIES['1 year'], last)
+    indicators = compute_indicators(window)
+    indicators.rsi, indicators.macd, indicators.bollinger_upper
+    result['analyze_ms'] = (time.perf_counter() - begin) * 1000
+    result['rss'] = rss_mb() - base
+    print(json.dumps(result))
+
+
+def run_probe(kind, path):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), 'probe', kind, path],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    store = BarStore(directory)
+    for years in [1, 10]:
+        index = session_minutes(years)
+        data = make_bars(index)
+        symbol = f"SYM{years}Y"
+        parquet = os.path.join(directory, symbol + '.parquet')
+        start = time.perf_counter()
+        data.to_parquet(parquet)
+        parquet_write = time.perf_counter() - start
+        # Appended a month at a time, as a recorder would, to exercise growth of the file
+        start = time.perf_counter()
+        months = index.tz_convert(None).to_period('M').asi8
+        edges = np.flatnonzero(np.diff(months)) + 1
+        for chunk in np.split(np.arange(len(index)), edges):
+            store.append(symbol, '1m', data.iloc[chunk[0]:chunk[-1] + 1])
+        store_write = time.perf_counter() - start
+        bars = store.open(symbol, '1m')
+        assert np.array_equal(bars.frame().to_numpy(), data.to_numpy())
+        assert bars.frame().index.equals(data.index)
+
+        print(f"\n{years:>2} years of 1-minute bars ({len(index):,} bars): Parquet write {parquet_write:6.2f} s | "
+              f"store appends, one per month {store_write:6.2f} s | "
+              f"files {os.path.getsize(parquet) / 2**20:6.1f} MB vs {os.stat(bars.path).st_blocks * 512 / 2**20:6.1f} MB")
+        for kind, path in [('DataFrame', parquet), ('store', os.path.join(directory, symbol))]:
+            r = run_probe(kind, path)
+            print(f"  {kind:<9} open {r['open_ms']:8.2f} ms, +{r['open_rss']:6.1f} MB RSS | range query median: "
+                  + ", ".join(f"{label} {r[label]:7.1f} us" for label in QUERIES)
+                  + f" | +{r['query_rss']:6.1f} MB | 1y analyze {r['analyze_ms']:6.1f} ms, +{r['rss']:6.1f} MB total")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['probe']:
+        probe(*sys.argv[2:4])
+    else:
+        main()
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bar_cache import BarCache
+from batch_report import run_reports
+from fake_provider import FakeTicker, unthrottled_scheduler
+from providers import YFinanceProvider
+
+# Headless batch reports: startup cost without tkinter, and throughput in and across processes
+
+IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, 'tkinter' in sys.modules,
+      'matplotlib.backends.backend_tkagg' in sys.modules)
+"""
+
+
+def stand_in_provider(cache_dir, latency):
+    # Module level so worker processes can build it; the latency is set in each worker
+    FakeTicker.latency = latency
+    return YFinanceProvider(cache=BarCache(cache_dir), ticker_cls=FakeTicker,
+                            scheduler=unthrottled_scheduler())
+
+
+def import_cost(module):
+    out = subprocess.run([sys.executable, '-c', IMPORT_PROBE.format(module=module)], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout.split()
+    return float(out[0]) * 1000, out[1] == 'True', out[2] == 'True'
+
+
+def timed_run(symbols, formats, processes, latency):
+    with tempfile.TemporaryDirectory() as cache_dir, tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        summary = run_reports(symbols, ['1mo', '1y'], formats, output_dir, processes,
+                              provider_factory=stand_in_provider, factory_args=(cache_dir, latency))
+        elapsed = time.perf_counter() - start
+        assert (summary['error'] == '').all(), summary[summary['error'] != '']
+        written = sorted(os.listdir(output_dir))
+        expected = len(summary) * sum(f in formats for f in ('json', 'png')) + ('csv' in formats)
+        assert len(written) == expected, written
+    return elapsed, len(summary)
+
+
+def main():
+    for module in ['batch_report', 'Final_Yfinance']:
+        ms, tk_loaded, tkagg_loaded = import_cost(module)
+        print(f"import {module:<15} {ms:8.1f} ms | tkinter loaded: {tk_loaded} | TkAgg loaded: {tkagg_loaded}")
+
+    symbols = [f"SYM{i:03d}" for i in range(48)]
+    print(f"\n{os.cpu_count()} cores, {len(symbols)} symbols x 2 periods, stand-in provider")
+    for latency in [0.0, 0.25]:
+        for formats in [['json', 'csv'], ['json', 'csv', 'png']]:
+            for processes in [1, 4, 8]:
+                elapsed, reports = timed_run(symbols, formats, processes, latency)
+                print(f"latency {latency:4.2f}s | {'+'.join(formats):<12} | {processes} processes: "
+                      f"{elapsed:7.2f} s ({reports / elapsed:7.1f} reports/s)")
+
+
+if __name__ == "__main__":
+    main()
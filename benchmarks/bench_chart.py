@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chart import ChartRenderer
+from fake_provider import make_bars
+from indicators import IndicatorSet
+from streaming import StreamingIndicators
+
+# Draw time against bar count: the original plot_chart (clear, rebuild, one Rectangle per bar,
+# tight_layout, full draw) versus ChartRenderer's full render and its blitted live update
+
+OLD_PATH_LIMIT = 10_000  # one Rectangle per bar takes over a minute at 100k bars
+
+
+def old_plot_chart(figure, canvas, data):
+    indicators = IndicatorSet(data['Close'].to_numpy(), data['Volume'].to_numpy())
+    figure.clear()
+    gs = figure.add_gridspec(2, 1, height_ratios=[1, 1], hspace=0.3)
+    ax1 = figure.add_subplot(gs[0, 0])
+    ax1.plot(data.index, data['Close'], label='Close Price', color='blue')
+    ax1.plot(data.index, indicators.sma_20, label='SMA (20)', color='orange', linestyle='--')
+    ax1.plot(data.index, indicators.bollinger_upper, label='Bollinger Upper', color='red', linestyle='--')
+    ax1.plot(data.index, indicators.bollinger_lower, label='Bollinger Lower', color='green', linestyle='--')
+    ax1.fill_between(data.index, indicators.bollinger_lower, indicators.bollinger_upper, color='grey', alpha=0.2)
+    ax1.legend(loc='upper left')
+    ax2 = figure.add_subplot(gs[1, 0], sharex=ax1)
+    ax2.bar(data.index, data['Volume'], label='Volume', color='skyblue')
+    ax2.legend(loc='upper left')
+    figure.tight_layout()
+    canvas.draw()
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    for n in [1_000, 10_000, 100_000, 1_000_000]:
+        data = make_bars(pd.date_range('2000-01-03', periods=n + 1, freq='min'))
+        history = data.iloc[:n]
+
+        old = '         -'
+        if n <= OLD_PATH_LIMIT:
+            figure = Figure(figsize=(12, 8))
+            old = f"{timed(old_plot_chart, figure, FigureCanvasAgg(figure), history):7.0f} ms"
+
+        figure = Figure(figsize=(12, 8))
+        renderer = ChartRenderer(figure, FigureCanvasAgg(figure))
+        live = StreamingIndicators.from_frame(history)
+        render = timed(renderer.render, live.index, live, 'Benchmark')
+        rerender = timed(renderer.render, live.index, live, 'Benchmark')
+        live.push(data.index[-1], data['Close'].iloc[-1], data['Volume'].iloc[-1])
+        update = timed(renderer.update, live.index, live)
+
+        print(f"{n:>9,} bars: old plot_chart {old} | render {render:6.0f} ms (repeat {rerender:5.0f} ms) "
+              f"| live update {update:5.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
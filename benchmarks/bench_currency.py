@@ -0,0 +1,112 @@
+import bisect
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bar_cache import BarCache
+from currency import SUBUNITS, bar_dates
+from fake_provider import FakeTicker, fake_download, unthrottled_scheduler
+from providers import ConvertedProvider, YFinanceProvider
+
+# Cost of converting prices to one currency: a watchlist-style batch of 50 to 1000 symbols on
+# five exchanges and single-symbol fetches, converted to USD by the vectorized date-aligned
+# multiply, against looking up and applying the rate one value at a time. Also counts the FX
+# requests, which should be one per foreign currency however many symbols there are.
+
+SUFFIXES = ['', '.NS', '.L', '.T', '.DE']
+
+
+def make_provider(directory):
+    return YFinanceProvider(cache=BarCache(directory), ticker_cls=FakeTicker, download=fake_download,
+                            scheduler=unthrottled_scheduler())
+
+
+def per_value(provider, panel, symbols, target):
+    # Every price looked up and converted on its own, as a loop over values would
+    rates = {}
+    days = bar_dates(panel.index)
+    converted = panel.copy()
+    for symbol in symbols:
+        currency = provider.currency(symbol)
+        base, scale = SUBUNITS.get(currency, (currency, 1.0))
+        if base == target and scale == 1.0:
+            continue
+        if base != target and base not in rates:
+            closes = provider.get_fx_rates(base, target).dropna()
+            rates[base] = (list(bar_dates(closes.index)), list(closes))
+        for field in ['Open', 'High', 'Low', 'Close']:
+            column = converted.columns.get_loc((field, symbol))
+            for row, day in enumerate(days):
+                rate = 1.0
+                if base != target:
+                    # The latest rate at or before the bar's date
+                    dates, values = rates[base]
+                    rate = values[max(bisect.bisect_right(dates, day) - 1, 0)]
+                converted.iat[row, column] = panel.iat[row, column] * rate * scale
+    return converted
+
+
+def main():
+    FakeTicker.latency = 0.02
+    FakeTicker.per_bar = 0.0
+    print("batch of symbols on 5 exchanges, a year of daily bars, converted to USD:")
+    for n in [50, 200, 1000]:
+        symbols = [f"S{i}{SUFFIXES[i % len(SUFFIXES)]}" for i in range(n)]
+        with tempfile.TemporaryDirectory() as directory:
+            raw = make_provider(directory)
+            converted = ConvertedProvider(raw, 'USD')
+            panel = raw.get_batch_data(symbols, '1y', '1d')
+
+            calls = FakeTicker.calls
+            result = converted.get_batch_data(symbols, '1y', '1d')
+            fx_calls = FakeTicker.calls - calls - n  # the batch download itself makes one per symbol
+
+            start = time.perf_counter()
+            for _ in range(5):
+                expected = converted.converter.convert_panel(panel, {s: raw.currency(s) for s in symbols})
+            vectorized = (time.perf_counter() - start) / 5 * 1000
+
+            sample = symbols[:10]
+            start = time.perf_counter()
+            looped = per_value(raw, panel, sample, 'USD')
+            loop = (time.perf_counter() - start) * 1000 * n / len(sample)
+
+            assert np.allclose(result.to_numpy(), expected.to_numpy(), equal_nan=True)
+            columns = [c for c in panel.columns if c[1] in sample]
+            assert np.allclose(expected[columns].to_numpy(), looped[columns].to_numpy(), equal_nan=True)
+        print(f"  {n:4d} symbols: vectorized {vectorized:7.2f} ms | per value {loop:9.0f} ms (estimated from 10) | "
+              f"{fx_calls} FX requests for {len(SUFFIXES) - 1} foreign currencies")
+
+    print("\nsingle-symbol fetches converted to USD:")
+    with tempfile.TemporaryDirectory() as directory:
+        raw = make_provider(directory)
+        converted = ConvertedProvider(raw, 'USD')
+        symbols = [f"S{i}{SUFFIXES[i % len(SUFFIXES)]}" for i in range(100)]
+        for symbol in symbols:
+            raw.get_stock_data(symbol, '6mo')  # fill the bar cache
+        calls = FakeTicker.calls
+        start = time.perf_counter()
+        for symbol in symbols:
+            raw.get_stock_data(symbol, '6mo')
+        plain = (time.perf_counter() - start) / len(symbols) * 1000
+        start = time.perf_counter()
+        for symbol in symbols:
+            converted.get_stock_data(symbol, '6mo')
+        first = (time.perf_counter() - start) / len(symbols) * 1000
+        start = time.perf_counter()
+        for symbol in symbols:
+            converted.get_stock_data(symbol, '6mo')
+        warm = (time.perf_counter() - start) / len(symbols) * 1000
+        print(f"  100 symbols: {plain:.2f} ms per fetch unconverted, {first:.2f} ms converted with the FX loads, "
+              f"{warm:.2f} ms with rates cached | {FakeTicker.calls - calls} FX requests, "
+              f"{converted.converter.fx.loads} pairs loaded")
+    print("converted batches match a per-value conversion")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import os
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard import Dashboard, DashboardRenderer, RedrawQueue, sparkline
+from fake_provider import make_bars
+from indicators import compute_indicators
+
+# Cost of a dashboard refresh cycle for 10 to 50 symbols when none, a few or all panels changed:
+# the incremental path (one batched call, streaming updates, per-panel blits staggered over
+# frames) against recomputing every symbol's indicators and redrawing the whole figure
+
+
+class BatchFeed:
+    # Stand-in for provider.get_batch_data: a year of daily bars per symbol, (field, symbol)
+    # columns; revise() changes the last bar of some symbols as a live session would
+    def __init__(self, symbols):
+        index = pd.date_range(end='2025-06-30', periods=260, freq='B')
+        frames = {symbol: make_bars(index, seed=i) for i, symbol in enumerate(symbols)}
+        self.panel = pd.concat(frames, axis=1).swaplevel(axis=1).sort_index(axis=1)
+        self.calls = 0
+
+    def revise(self, symbols, rng):
+        self.panel = self.panel.copy()
+        for symbol in symbols:
+            self.panel.iloc[-1, self.panel.columns.get_loc(('Close', symbol))] *= 1 + rng.normal(0, 0.002)
+            self.panel.iloc[-1, self.panel.columns.get_loc(('Volume', symbol))] += 1000
+
+    def __call__(self, symbols, period):
+        self.calls += 1
+        return self.panel
+
+
+def make_canvas():
+    figure = Figure(figsize=(12, 8), dpi=100)
+    return figure, FigureCanvasAgg(figure)
+
+
+def full_cycle(feed, symbols, renderer, canvas):
+    # Everything recomputed from the fetched bars and the whole figure redrawn
+    panel = feed(symbols, '1y')
+    for symbol in symbols:
+        data = pd.DataFrame({'Close': panel['Close'][symbol], 'Volume': panel['Volume'][symbol]})
+        renderer.panels[symbol].set_data(sparkline(compute_indicators(data)))
+    canvas.draw()
+
+
+def incremental_cycle(dashboard, redraws):
+    # Returns (worker ms, total draw ms, frames, longest frame ms, changed panels)
+    start = time.perf_counter()
+    changed, errors = dashboard.refresh('1y')
+    worker = time.perf_counter() - start
+    assert not errors, errors
+    redraws.add(changed)
+    frames, draw, longest = 0, 0.0, 0.0
+    while redraws:
+        start = time.perf_counter()
+        redraws.drain()
+        elapsed = time.perf_counter() - start
+        frames += 1
+        draw += elapsed
+        longest = max(longest, elapsed)
+    return worker * 1000, draw * 1000, frames, longest * 1000, len(changed)
+
+
+def check_parity(dashboard, feed):
+    # The streamed panels must match a full recompute of the same bars
+    changed, _ = Dashboard(dashboard.symbols, fetch_batch=feed).refresh('1y')
+    for symbol, live in dashboard.live.items():
+        expected = changed[symbol]
+        actual = sparkline(live)
+        for name, values in expected['lines'].items():
+            assert np.allclose(actual['lines'][name], values, equal_nan=True), (symbol, name)
+        for key in ['price', 'change', 'rsi', 'macd', 'signal']:
+            assert np.isclose(actual[key], expected[key]), (symbol, key)
+
+
+def main(cycles=10):
+    rng = np.random.default_rng(0)
+    print("per refresh cycle, median of", cycles)
+    for n in [10, 20, 50]:
+        symbols = [f"SYM{i}" for i in range(n)]
+        feed = BatchFeed(symbols)
+
+        figure, canvas = make_canvas()
+        renderer = DashboardRenderer(figure, canvas, symbols)
+        redraws = RedrawQueue(renderer)
+        dashboard = Dashboard(symbols, fetch_batch=feed)
+        canvas.draw()
+        incremental_cycle(dashboard, redraws)  # first cycle seeds every panel
+
+        full_figure, full_canvas = make_canvas()
+        full_renderer = DashboardRenderer(full_figure, full_canvas, symbols, animated=False)
+
+        for label, changes in [("no change", 0), ("10% changed", max(1, n // 10)), ("all changed", n)]:
+            calls = feed.calls
+            incremental, full = [], []
+            for _ in range(cycles):
+                feed.revise(rng.choice(symbols, changes, replace=False), rng)
+                incremental.append(incremental_cycle(dashboard, redraws))
+                start = time.perf_counter()
+                full_cycle(feed, symbols, full_renderer, full_canvas)
+                full.append((time.perf_counter() - start) * 1000)
+            worker, draw, frames, longest, changed = np.median(np.array(incremental), axis=0)
+            print(f"  {n:2d} symbols, {label:<11} incremental {worker + draw:7.1f} ms "
+                  f"(worker {worker:5.1f} + draw {draw:5.1f} over {frames:.0f} frames, longest {longest:4.1f} ms, "
+                  f"{changed:.0f} redrawn) | full recompute and redraw {np.median(full):6.1f} ms | "
+                  f"{(feed.calls - calls) / cycles / 2:.0f} provider call per cycle")
+        check_parity(dashboard, feed)
+    print("streamed panels match a full recompute")
+
+
+if __name__ == "__main__":
+    main()
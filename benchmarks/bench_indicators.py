@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+
+import pandas as pd
+import ta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_provider import make_bars
+from indicators import IndicatorSet
+
+# Shared indicator engine versus the rolling + ta.momentum.RSIIndicator + ta.trend.MACD path.
+# Parity with ta is checked by tests/test_indicators.py.
+
+
+def ta_path(data):
+    close = data['Close']
+    sma_20 = close.rolling(window=20).mean()
+    std_dev = close.rolling(window=20).std()
+    bollinger_upper = sma_20 + (std_dev * 2)
+    bollinger_lower = sma_20 - (std_dev * 2)
+    rsi = ta.momentum.RSIIndicator(close=close, window=14).rsi()
+    macd_indicator = ta.trend.MACD(close=close)
+    return {
+        'sma_20': sma_20, 'bollinger_upper': bollinger_upper, 'bollinger_lower': bollinger_lower,
+        'rsi': rsi, 'macd': macd_indicator.macd(), 'signal': macd_indicator.macd_signal(),
+    }
+
+
+def ta_analyze(data):
+    # One Analyze before the engine: plot_chart and nlp_func recomputed SMA/std and RSI
+    result = ta_path(data)
+    data['Close'].rolling(window=20).mean()
+    data['Close'].rolling(window=20).std()
+    ta.momentum.RSIIndicator(close=data['Close'], window=14).rsi()
+    return result
+
+
+def engine_path(data):
+    indicators = IndicatorSet(data['Close'].to_numpy(), data['Volume'].to_numpy(), data.index)
+    return {name: getattr(indicators, name) for name in
+            ['sma_20', 'bollinger_upper', 'bollinger_lower', 'rsi', 'macd', 'signal']}
+
+
+def best_of(func, data, repeats=3):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(data)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    for n in [10_000, 100_000, 1_000_000]:
+        data = make_bars(pd.date_range('2000-01-03', periods=n, freq='min'))
+        ta_time, _ = best_of(ta_path, data)
+        engine_time, _ = best_of(engine_path, data)
+        analyze_time, _ = best_of(ta_analyze, data)
+        print(f"{n:>9,} bars: ta {ta_time * 1000:8.1f} ms | engine {engine_time * 1000:8.1f} ms "
+              f"({ta_time / engine_time:4.1f}x) | per Analyze: ta {analyze_time * 1000:8.1f} ms "
+              f"({analyze_time / engine_time:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
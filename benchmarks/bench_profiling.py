@@ -0,0 +1,86 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bar_cache import BarCache
+from fake_provider import FakeTicker, unthrottled_scheduler
+from indicators import compute_indicators
+from profiling import NULL_RUN, Profiler, span
+from providers import YFinanceProvider
+from reports import indicators_report, insights_report
+
+# Cost of the span instrumentation: per span with no active run, with timings off and on, and
+# on a headless analyze pipeline (cached fetch, resample, indicators, report text) per run
+
+
+def per_span_ns(run, repeats=200_000):
+    with run.activate():
+        start = time.perf_counter()
+        for _ in range(repeats):
+            with span('stage') as s:
+                s.set(rows=1)
+        elapsed = time.perf_counter() - start
+    return elapsed / repeats * 1e9
+
+
+def analyze(provider, run, period):
+    with run.activate():
+        with span('fetch') as fetch_span:
+            data = provider.get_stock_data('AAPL', period)
+            fetch_span.set(bars=len(data))
+        with span('indicators', bars=len(data)):
+            indicators = compute_indicators(data)
+            indicators.rsi, indicators.macd, indicators.bollinger_upper
+        with span('indicators text'):
+            indicators_report(data)
+        with span('insights text'):
+            insights_report('AAPL', data)
+    run.finish(bars=len(data))
+
+
+def pipeline_ms(provider, profiler, runs=300):
+    periods = ['1mo', '3mo', '6mo', '1y']
+    start = time.perf_counter()
+    for i in range(runs):
+        analyze(provider, profiler.start_run('analyze') if profiler else NULL_RUN, periods[i % len(periods)])
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    print("per span:")
+    print(f"  no active run    {per_span_ns(NULL_RUN):7.0f} ns")
+    disabled = Profiler(enabled=False)
+    print(f"  timings off      {per_span_ns(disabled.start_run('bench')):7.0f} ns")
+    enabled = Profiler()
+    print(f"  timings on       {per_span_ns(enabled.start_run('bench')):7.0f} ns")
+
+    FakeTicker.latency = FakeTicker.per_bar = 0.0
+    provider = YFinanceProvider(cache=BarCache(tempfile.mkdtemp()), ticker_cls=FakeTicker,
+                                scheduler=unthrottled_scheduler())
+    pipeline_ms(provider, None, runs=20)  # warm the cache
+    print("\nheadless analyze pipeline, cache hits, 1mo/3mo/6mo/1y in turn:")
+    baseline = min(pipeline_ms(provider, None) for _ in range(3))
+    print(f"  no profiler       {baseline:6.3f} ms/run")
+    for label, profiler in [("timings off", Profiler(enabled=False)), ("timings on", Profiler()),
+                            ("timings + cProfile", Profiler(capture=True))]:
+        ms = min(pipeline_ms(provider, profiler) for _ in range(3))
+        print(f"  {label:<17} {ms:6.3f} ms/run ({(ms / baseline - 1) * 100:+5.1f}%)")
+
+    summary = profiler.summary()
+    print(f"\n{len(summary)} stages recorded, e.g. " + ", ".join(
+        f"{name} p50 {stats['p50_ms']:.3f} / p99 {stats['p99_ms']:.3f} ms"
+        for name, stats in list(summary.items())[:3]))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'trace.json')
+        profiler.export_chrome_trace(path)
+        with open(path) as f:
+            events = json.load(f)['traceEvents']
+        print(f"Chrome trace: {len(events)} events, {os.path.getsize(path) / 1024:.0f} KB for {len(profiler.runs)} runs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bar_cache import BarCache
+from fake_provider import FakeTicker, FakeTimeSeries, make_bars, unthrottled_scheduler
+from indicators import compute_indicators
+from providers import (AV_COLUMNS, PERIOD_INTERVALS, AlphaVantageProvider, ReplayProvider, YFinanceProvider,
+                       is_normalized, normalize_ohlcv, record_bars)
+
+# Providers against each other: normalize cost on raw frames of each shape, and the cost of a
+# repeat get_stock_data per provider (cache hit or replay) with network time taken out
+
+
+def best_ms(func, repeats=5):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def raw_frames(n):
+    # What each source hands over: yfinance has extra columns and integer volume, Alpha Vantage
+    # its own column names with the newest bar first
+    index = pd.date_range('2000-01-03', periods=n, freq='min', tz='America/New_York')
+    bars = make_bars(index)
+    yahoo = bars.assign(Volume=bars['Volume'].astype('int64'), Dividends=0.0, **{'Stock Splits': 0.0})
+    alpha = bars.rename(columns={v: k for k, v in AV_COLUMNS.items()}).iloc[::-1].copy()
+    return yahoo, alpha
+
+
+def old_yahoo(data):
+    return data.sort_index(ascending=True)
+
+
+def old_alpha(data):
+    data = data.sort_index(ascending=True)
+    data.rename(columns=AV_COLUMNS, inplace=True)
+    return data
+
+
+def downstream(data):
+    # The first thing every consumer does: pull float64 arrays out of the frame
+    return [data[name].to_numpy(dtype='float64') for name in ['Close', 'Volume']]
+
+
+def main():
+    print("normalize: old GUI path vs normalize_ohlcv, then float64 extraction for the indicators")
+    for n in [1_000, 100_000, 1_000_000]:
+        yahoo, alpha = raw_frames(n)
+        for label, raw, old, columns in [('yfinance', yahoo, old_yahoo, None), ('alphavantage', alpha, old_alpha, AV_COLUMNS)]:
+            old_ms = best_ms(lambda: downstream(old(raw)))
+            new_ms = best_ms(lambda: downstream(normalize_ohlcv(raw, columns)))
+            normalized = normalize_ohlcv(raw, columns)
+            again_ms = best_ms(lambda: downstream(normalize_ohlcv(normalized)))
+            assert np.array_equal(normalized['Close'].to_numpy(), old(raw)['Close'].to_numpy())
+            assert is_normalized(normalized)
+            print(f"{n:>9,} bars {label:<12}: old {old_ms:8.2f} ms | new {new_ms:8.2f} ms | "
+                  f"already normalized {again_ms:6.3f} ms")
+
+    FakeTicker.latency = FakeTicker.per_bar = 0.0
+    FakeTimeSeries.latency = FakeTimeSeries.per_bar = 0.0
+    FakeTimeSeries.limit = 10 ** 9
+    replay_dir = tempfile.mkdtemp()
+    for interval in set(PERIOD_INTERVALS.values()):
+        for symbol in ['AAPL']:
+            record_bars(replay_dir, symbol, interval, FakeTicker(symbol).history(period='1y', interval=interval))
+
+    providers = [
+        YFinanceProvider(cache=BarCache(tempfile.mkdtemp()), ticker_cls=FakeTicker, scheduler=unthrottled_scheduler()),
+        AlphaVantageProvider('demo', cache=BarCache(tempfile.mkdtemp()), ts=FakeTimeSeries(),
+                             scheduler=unthrottled_scheduler()),
+        ReplayProvider(replay_dir),
+    ]
+    print("\nrepeat get_stock_data + compute_indicators (stand-in network at zero latency)")
+    for period in ['5d', '1mo', '1y']:
+        row = []
+        for provider in providers:
+            data = provider.get_stock_data('AAPL', period)
+            ms = best_ms(lambda: compute_indicators(provider.get_stock_data('AAPL', period)).rsi, repeats=20)
+            row.append(f"{provider.name} {ms:6.2f} ms ({len(data)} bars)")
+        print(f"{period:>4}: " + " | ".join(row))
+
+
+if __name__ == "__main__":
+    main()
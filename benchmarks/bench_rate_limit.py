@@ -0,0 +1,91 @@
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bar_cache import BarCache
+from fake_provider import FakeTimeSeries, unthrottled_scheduler
+from providers import AlphaVantageProvider
+from rate_limit import RequestScheduler, TokenBucket
+
+# Request scheduler against a stand-in Alpha Vantage that enforces its calls-per-window limit:
+# throttled vs unthrottled bursts, coalescing, compact-vs-full selection and retries
+
+
+def av_scheduler(retries=3, backoff=0.2):
+    # At most FakeTimeSeries.limit calls in any window: no burst beyond one call, and 10% headroom
+    # because thread wake-up jitter is not negligible against the shortened window
+    return RequestScheduler(TokenBucket(FakeTimeSeries.limit / (FakeTimeSeries.window * 1.1), 1),
+                            retries=retries, backoff=backoff)
+
+
+def burst(ts, scheduler, symbols, period='1mo', separate_caches=False):
+    shared = BarCache(tempfile.mkdtemp())
+
+    def fetch(symbol):
+        cache = BarCache(tempfile.mkdtemp()) if separate_caches else shared
+        provider = AlphaVantageProvider('demo', cache=cache, ts=ts, scheduler=scheduler)
+        try:
+            provider.get_stock_data(symbol, period)
+            return True
+        except Exception:
+            return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        ok = sum(pool.map(fetch, symbols))
+    return ok, time.perf_counter() - start
+
+
+def report(label, ok, total, elapsed, ts, scheduler):
+    metrics = scheduler.metrics()
+    print(f"{label:<36} {ok:3d}/{total} ok in {elapsed:5.2f}s | provider calls accepted {len(ts.calls):3d}, "
+          f"rejected {ts.rejected:3d} | made {metrics['calls_made']:3d}, saved {metrics['calls_saved']:3d}, "
+          f"retried {metrics['retries']:2d} | queue wait total {metrics['queue_wait']:5.2f}s, "
+          f"max {metrics['max_queue_wait']:4.2f}s")
+
+
+def main():
+    print(f"Stand-in limit: {FakeTimeSeries.limit} calls per {FakeTimeSeries.window:.0f}s window\n")
+    symbols = [f"SYM{i:02d}" for i in range(20)]
+
+    # Every symbol at once: without a scheduler most calls are rejected by the provider
+    for label, scheduler in [("no scheduler", RequestScheduler(TokenBucket(1e9, 1e9), retries=0)),
+                             ("token bucket, no retries", av_scheduler(retries=0)),
+                             ("token bucket + retries", av_scheduler())]:
+        ts = FakeTimeSeries()
+        ok, elapsed = burst(ts, scheduler, symbols)
+        report(f"20 symbols, {label}", ok, len(symbols), elapsed, ts, scheduler)
+
+    # The same request from independent clients sharing the key collapses into one call
+    ts, scheduler = FakeTimeSeries(), av_scheduler()
+    ok, elapsed = burst(ts, scheduler, ['IBM'] * 8, separate_caches=True)
+    report("8 identical requests, coalesced", ok, 8, elapsed, ts, scheduler)
+
+    # First fetch of a 5-day window: compact (100 bars) instead of the month-long full output
+    ts = FakeTimeSeries()
+    provider = AlphaVantageProvider('demo', cache=BarCache(tempfile.mkdtemp()), ts=ts,
+                                    scheduler=unthrottled_scheduler())
+    start = time.perf_counter()
+    data = provider.get_stock_data('IBM', '5d')
+    compact = time.perf_counter() - start
+    start = time.perf_counter()
+    full, _ = ts.get_intraday('IBM', interval='60min', outputsize='full')
+    full_time = time.perf_counter() - start
+    print(f"\n5d first fetch: {ts.calls[0][2]} ({len(data)} bars) {compact * 1000:6.1f} ms | "
+          f"full would transfer {len(full)} bars in {full_time * 1000:6.1f} ms")
+
+    # Two dropped connections, then success: retried with jittered backoff
+    ts, scheduler = FakeTimeSeries(), av_scheduler()
+    FakeTimeSeries.fail_next = 2
+    provider = AlphaVantageProvider('demo', cache=BarCache(tempfile.mkdtemp()), ts=ts, scheduler=scheduler)
+    start = time.perf_counter()
+    data = provider.get_stock_data('IBM', '1mo')
+    report("2 transient failures", int(not data.empty), 1, time.perf_counter() - start, ts, scheduler)
+
+
+if __name__ == "__main__":
+    main()
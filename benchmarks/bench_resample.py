@@ -0,0 +1,77 @@
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bar_cache import BarCache
+from bench_bar_store import session_minutes
+from fake_provider import FakeTicker, make_bars, unthrottled_scheduler
+from providers import PERIOD_INTERVALS, YFinanceProvider
+from resample import resample_ohlcv
+
+# OHLCV resampling against pandas' resample under yfinance's labelling, and the cost of switching
+# periods before and after one fetch serves the whole group. Parity with pandas and with a
+# provider's own coarser bars is checked by tests/test_resample.py.
+
+AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+def reference(data, interval):
+    # pandas on local wall-clock time: intraday buckets from each day's first bar, days at
+    # midnight, weeks starting Monday, months on the 1st
+    local = data.tz_localize(None)
+    if interval == '60m':
+        out = local.groupby(local.index.date, group_keys=False).apply(
+            lambda day: day.resample('60min', origin='start').agg(AGG))
+    elif interval == '1wk':
+        out = local.resample('W-MON', label='left', closed='left').agg(AGG)
+    else:
+        out = local.resample({'1d': 'D', '1mo': 'MS'}[interval]).agg(AGG)
+    out = out.dropna(subset=['Open'])
+    out.index = pd.DatetimeIndex(out.index).tz_localize(data.index.tz)
+    return out
+
+
+def main():
+    # Two years of 1-minute bars across daylight saving changes, with an outage and a holiday
+    data = make_bars(session_minutes(2))
+    data = data.drop(data.index[1000:1400]).drop(data.index[390 * 100:390 * 101])
+    print(f"resample {len(data):,} 1-minute bars against pandas resample")
+    for interval in ['60m', '1d', '1wk', '1mo']:
+        start = time.perf_counter()
+        ours = resample_ohlcv(data, interval)
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        expected = reference(data, interval)
+        reference_time = time.perf_counter() - start
+        print(f"  {interval:>4}: {len(ours):6,} bars | {elapsed * 1000:7.1f} ms vs pandas "
+              f"{reference_time * 1000:7.1f} ms")
+
+    print("\nswitching 1mo -> 3mo -> 6mo -> 1y, twice, at 0.25 s per provider call")
+    FakeTicker.latency = 0.25
+    FakeTicker.per_bar = 0.0
+    periods = ['1mo', '3mo', '6mo', '1y']
+    start = time.perf_counter()
+    for period in periods:
+        FakeTicker('AAPL').history(period=period, interval=PERIOD_INTERVALS[period])
+    print(f"  one call per period (before): first pass {time.perf_counter() - start:6.3f} s, "
+          f"{len(periods)} calls")
+    provider = YFinanceProvider(cache=BarCache(tempfile.mkdtemp()), ticker_cls=FakeTicker,
+                                scheduler=unthrottled_scheduler())
+    FakeTicker.calls = 0
+    for label in ['first pass', 'second pass']:
+        times = []
+        for period in periods:
+            start = time.perf_counter()
+            provider.get_stock_data('AAPL', period)
+            times.append((time.perf_counter() - start) * 1000)
+        print(f"  one daily fetch per group: {label} " + ", ".join(f"{p} {t:7.2f} ms" for p, t in zip(periods, times))
+              + f" | provider calls so far {FakeTicker.calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bar_cache import BarCache
+from fake_provider import unthrottled_scheduler
+from providers import YFinanceProvider
+from screener import CORRELATION_WINDOW, MIN_PERIODS, ClosesCache, load_closes, run_screen, screen, top_peers
+
+# The screener over universes of 500 to 3000 symbols: a cold run that downloads a year of daily
+# closes, a run the next day that only downloads the new bars, the memory of the blocked
+# computation against a full correlation matrix, and a check of beta, correlation and peers
+# against pandas. The stand-in market has a common factor and a few sectors, so correlations
+# and betas vary, and some symbols list late or skip days so pairwise-complete handling matters.
+
+INDEX = 'SPY'
+SECTORS = 10
+
+
+class UniverseDownload:
+    # Stand-in for yf.download over a synthetic market: one request per call of `latency` seconds
+    # plus `per_bar` seconds per bar sent. The market ends the business day before today, until
+    # advance() moves it on to today.
+    latency = 0.2
+    per_bar = 2e-6
+
+    def __init__(self, symbols, days=400, seed=0):
+        rng = np.random.default_rng(seed)
+        self.index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days + 1)
+        self.days = days
+        n = len(symbols)
+        market = rng.normal(0.0003, 0.01, len(self.index))
+        sectors = rng.normal(0, 0.008, (len(self.index), SECTORS))
+        betas = rng.uniform(0.3, 1.8, n)
+        sector = rng.integers(0, SECTORS, n)
+        noise = rng.normal(0, 0.012, (len(self.index), n))
+        returns = market[:, None] * betas + sectors[:, sector] + noise
+        closes = 50 * np.exp(np.cumsum(returns, axis=0))
+        # Late listings and missing days
+        late = rng.random(n) < 0.05
+        closes[:rng.integers(100, 300), late] = np.nan
+        closes[rng.random(closes.shape) < 0.01] = np.nan
+        self.closes = pd.DataFrame(closes, index=self.index, columns=symbols)
+        self.closes[INDEX] = 400 * np.exp(np.cumsum(market))
+        self.calls = 0
+        self.bars = 0
+
+    def advance(self):
+        self.days += 1
+
+    def __call__(self, symbols, period=None, interval='1d', **kwargs):
+        self.calls += 1
+        now = self.index[self.days - 1]
+        span = {'5d': pd.Timedelta(days=7), '1mo': pd.DateOffset(months=1), '3mo': pd.DateOffset(months=3),
+                '6mo': pd.DateOffset(months=6), '1y': pd.DateOffset(years=1)}[period]
+        closes = self.closes.loc[(self.index > now - span) & (self.index <= now), list(symbols)]
+        time.sleep(self.latency + self.per_bar * closes.size)
+        self.bars += int(closes.notna().sum().sum())
+        volumes = pd.DataFrame(1e6, index=closes.index, columns=closes.columns)
+        return pd.concat({'Close': closes, 'Volume': volumes}, axis=1)
+
+
+def make_provider(feed, directory):
+    return YFinanceProvider(cache=BarCache(directory), download=feed, scheduler=unthrottled_scheduler())
+
+
+def expire(cache, provider):
+    # Make the saved closes look older than the daily TTL
+    path = cache.path(provider.name, '1d', '1y')
+    old = time.time() - 2 * 60 * 60
+    os.utime(path, (old, old))
+
+
+def check_parity(closes, table, window=CORRELATION_WINDOW):
+    returns = closes.pct_change(fill_method=None).tail(window)
+    index = returns[INDEX]
+    for symbol in table.index:
+        joint = returns[[symbol, INDEX]].dropna()
+        expected_corr = returns[symbol].corr(index, min_periods=MIN_PERIODS)
+        assert np.isclose(table.at[symbol, 'Correlation'], expected_corr, equal_nan=True), symbol
+        if len(joint) >= 2:
+            expected_beta = joint[symbol].cov(joint[INDEX]) / joint[INDEX].var()
+            assert np.isclose(table.at[symbol, 'Beta'], expected_beta), symbol
+    # Peers: the most correlated other symbol from pandas' full matrix
+    symbols = list(table.index)
+    matrix = returns[symbols].corr(min_periods=MIN_PERIODS).to_numpy(copy=True)
+    np.fill_diagonal(matrix, np.nan)
+    best = np.nanargmax(np.where(np.isnan(matrix), -np.inf, matrix), axis=1)
+    for i, symbol in enumerate(symbols):
+        first = table.at[symbol, 'Peers'].split(' ')[0]
+        assert first == symbols[best[i]] or np.isclose(matrix[i, symbols.index(first)], matrix[i, best[i]]), symbol
+
+
+def peak_mb(function, *args):
+    tracemalloc.start()
+    result = function(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return result, peak
+
+
+def main(sizes=(500, 1000, 3000)):
+    for n in sizes:
+        symbols = [f"T{i:04d}" for i in range(n)]
+        feed = UniverseDownload(symbols, seed=n)
+        with tempfile.TemporaryDirectory() as directory:
+            provider = make_provider(feed, os.path.join(directory, 'bars'))
+            cache = ClosesCache(os.path.join(directory, 'screener'))
+
+            start = time.perf_counter()
+            table, errors = run_screen(provider, symbols, INDEX, '1y', cache)
+            cold = time.perf_counter() - start
+            cold_calls, cold_bars = feed.calls, feed.bars
+
+            feed.advance()
+            expire(cache, provider)
+            start = time.perf_counter()
+            run_screen(provider, symbols, INDEX, '1y', cache)
+            warm = time.perf_counter() - start
+            warm_calls, warm_bars = feed.calls - cold_calls, feed.bars - cold_bars
+
+            calls = feed.calls
+            start = time.perf_counter()
+            run_screen(provider, symbols, INDEX, '1y', cache)
+            cached = time.perf_counter() - start
+            cached_calls = feed.calls - calls
+
+            closes, _ = load_closes(provider, [INDEX] + symbols, '1y', cache)
+            start = time.perf_counter()
+            screened, peak = peak_mb(screen, closes, INDEX)
+            compute = time.perf_counter() - start
+            # Peers computed in blocks of rows against the whole correlation matrix at once
+            returns = closes.drop(columns=INDEX).pct_change(fill_method=None).to_numpy()[-CORRELATION_WINDOW:]
+            _, blocked = peak_mb(top_peers, returns, symbols)
+            _, full = peak_mb(top_peers, returns, symbols, 3, len(symbols))
+
+        print(f"{n} symbols ({len(errors)} skipped):")
+        print(f"  cold run        {cold:6.2f} s | {cold_calls:3d} provider calls, {cold_bars:8d} bars")
+        print(f"  next day        {warm:6.2f} s | {warm_calls:3d} provider calls, {warm_bars:8d} bars")
+        print(f"  within the TTL  {cached:6.2f} s | {cached_calls:3d} provider calls")
+        print(f"  screen compute  {compute:6.2f} s | peak {peak:6.1f} MB; peers in blocks {blocked:6.1f} MB, "
+              f"in one matrix {full:6.1f} MB")
+        if n <= 1000:
+            check_parity(closes, screened)
+            print("  beta, correlation and top peers match pandas")
+
+
+if __name__ == "__main__":
+    main()
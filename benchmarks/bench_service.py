@@ -0,0 +1,114 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from aiohttp import ClientSession, TCPConnector, web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_service import AnalysisCache, AnalysisService, make_app
+from bar_cache import BarCache
+from fake_provider import FakeTicker, unthrottled_scheduler
+from providers import YFinanceProvider
+
+# Load test of the JSON service against the stand-in provider: concurrent clients asking for a
+# skewed mix of 50 tickers (a few are far more popular) and four periods, with the report cache
+# on and off, plus a cold burst of identical requests and batch requests. Client and server
+# share this process and its event loop, so the numbers include the client's own cost.
+
+SYMBOLS = [f"SYM{i}" for i in range(50)]
+PERIODS = ['1mo', '3mo', '6mo', '1y']
+
+
+async def start_server(service):
+    runner = web.AppRunner(make_app(service), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def make_service(ttl, directory):
+    provider = YFinanceProvider(cache=BarCache(directory), ticker_cls=FakeTicker, scheduler=unthrottled_scheduler())
+    return AnalysisService(provider, AnalysisCache(ttl=ttl))
+
+
+def popular_paths(count, seed=0):
+    # Zipf-like popularity: the first few tickers get most of the requests
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, len(SYMBOLS) + 1)
+    symbols = rng.choice(SYMBOLS, count, p=weights / weights.sum())
+    periods = rng.choice(PERIODS, count)
+    return [f"/analyze?symbol={s}&period={p}" for s, p in zip(symbols, periods)]
+
+
+async def load(base, paths, concurrency):
+    # `concurrency` clients issue the paths one after another; returns (seconds, latencies in ms)
+    latencies = []
+    queue = iter(paths)
+
+    async def client(session):
+        for path in queue:
+            start = time.perf_counter()
+            async with session.get(base + path) as response:
+                await response.read()
+                assert response.status == 200, (path, response.status)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    async with ClientSession(connector=TCPConnector(limit=concurrency)) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        return time.perf_counter() - start, np.array(latencies)
+
+
+def counters(service):
+    return dict(service.cache.stats(), calls=FakeTicker.calls)
+
+
+def report(label, seconds, latencies, service, before):
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    stats = {key: value - before[key] for key, value in counters(service).items()}
+    print(f"  {label:<34} {len(latencies) / seconds:7.0f} req/s | p50 {p50:7.1f} p95 {p95:7.1f} p99 {p99:7.1f} ms | "
+          f"provider calls {stats['calls']:4d} | computes {stats['misses']:5d}, "
+          f"hits {stats['hits']:5d}, shared {stats['coalesced']:4d}")
+
+
+async def run(requests=3000, concurrency=64):
+    FakeTicker.latency = 0.25
+    FakeTicker.per_bar = 0.0005
+
+    print(f"{requests} /analyze requests, {concurrency} concurrent clients, 50 tickers x 4 periods:")
+    for label, ttl in [("report cache off", 0), ("report cache on (60 s TTL)", 60)]:
+        with tempfile.TemporaryDirectory() as directory:
+            service = make_service(ttl, directory)
+            runner, base = await start_server(service)
+            # The first pass starts with empty caches; the second is the steady state
+            for phase, seed in [("cold", 0), ("warm", 1)]:
+                before = counters(service)
+                seconds, latencies = await load(base, popular_paths(requests, seed), concurrency)
+                report(f"{label}, {phase}", seconds, latencies, service, before)
+            await runner.cleanup()
+
+    with tempfile.TemporaryDirectory() as directory:
+        service = make_service(60, directory)
+        runner, base = await start_server(service)
+        print("\ncold burst, 500 concurrent requests for one uncached report:")
+        before = counters(service)
+        seconds, latencies = await load(base, ["/analyze?symbol=HOT&period=1y"] * 500, 500)
+        report("burst", seconds, latencies, service, before)
+
+        print("\nbatch requests of 20 symbols, 8 concurrent clients:")
+        rng = np.random.default_rng(1)
+        paths = [f"/batch?period=1y&symbols={','.join(rng.choice(SYMBOLS, 20, replace=False))}" for _ in range(200)]
+        before = counters(service)
+        seconds, latencies = await load(base, paths, 8)
+        report("batch (20 symbols each)", seconds, latencies, service, before)
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_provider import make_bars
+from indicators import IndicatorSet
+from streaming import SERIES, StreamingIndicators
+
+# Cost of one live-refresh tick as history grows: full recompute versus the streaming update.
+# Parity with the full recompute is checked by tests/test_streaming.py.
+
+
+def main(ticks=200):
+    for n in [1_000, 10_000, 100_000, 1_000_000]:
+        data = make_bars(pd.date_range('2000-01-03', periods=n + ticks, freq='min'))
+        history, new_bars = data.iloc[:n], data.iloc[n:]
+
+        start = time.perf_counter()
+        for i in range(0, ticks, max(1, ticks // 10)):
+            grown = data.iloc[:n + i + 1]
+            indicators = IndicatorSet(grown['Close'].to_numpy(), grown['Volume'].to_numpy())
+            for name in SERIES[2:]:
+                getattr(indicators, name)
+        recompute = (time.perf_counter() - start) / len(range(0, ticks, max(1, ticks // 10)))
+
+        live = StreamingIndicators.from_frame(history)
+        start = time.perf_counter()
+        for timestamp, close, volume in zip(new_bars.index, new_bars['Close'].to_numpy(),
+                                            new_bars['Volume'].to_numpy()):
+            live.push(timestamp, close, volume)
+        streaming = (time.perf_counter() - start) / ticks
+
+        print(f"{n:>9,} bars of history: full recompute {recompute * 1e3:9.3f} ms/tick | "
+              f"streaming {streaming * 1e6:7.1f} us/tick")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bar_cache import BarCache
+from background import BackgroundTask
+from stockbot import StockMarketGUI
+from providers import YFinanceProvider
+from fake_provider import FakeTicker, unthrottled_scheduler
+
+# Measures how long the Tk mainloop stalls while an Analyze runs against a slow provider.
+# A heartbeat is scheduled every HEARTBEAT_MS; the largest gap between beats is the worst freeze.
+# Needs a display (run under Xvfb on a headless box).
+
+HEARTBEAT_MS = 10
+
+
+class Heartbeat:
+    def __init__(self, root):
+        self.root = root
+        self.last = time.perf_counter()
+        self.max_gap = 0.0
+        self.root.after(HEARTBEAT_MS, self.beat)
+
+    def beat(self):
+        now = time.perf_counter()
+        self.max_gap = max(self.max_gap, now - self.last)
+        self.last = now
+        self.root.after(HEARTBEAT_MS, self.beat)
+
+
+def run(blocking, latency, symbol='AAPL', period='1mo'):
+    root = tk.Tk()
+    FakeTicker.latency = latency
+    app = StockMarketGUI(root, YFinanceProvider(cache=BarCache(tempfile.mkdtemp()), ticker_cls=FakeTicker,
+                                                scheduler=unthrottled_scheduler()))
+    app.symbol_entry.insert(0, symbol)
+    heartbeat = Heartbeat(root)
+    start = time.perf_counter()
+
+    def finished():
+        root.elapsed = time.perf_counter() - start
+        root.after(200, root.quit)
+
+    if blocking:
+        # The pre-background behaviour: fetch and compute inline on the Tk thread
+        def analyze():
+            app.show_analysis(app.fetch_and_compute(BackgroundTask(), symbol, period))
+            finished()
+        root.after(50, analyze)
+    else:
+        show_analysis = app.show_analysis
+        app.show_analysis = lambda result: (show_analysis(result), finished())
+        root.after(50, app.analyze_stock)
+
+    root.mainloop()
+    app.runner.shutdown()
+    root.destroy()
+    return root.elapsed, heartbeat.max_gap
+
+
+def main():
+    for latency in [0.5, 2.0]:
+        for blocking in [True, False]:
+            elapsed, max_gap = run(blocking, latency)
+            mode = "inline    " if blocking else "background"
+            print(f"latency {latency:.1f}s {mode}: analyze {elapsed * 1000:7.0f} ms, "
+                  f"worst UI stall {max_gap * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# Stand-in for yf.Ticker that synthesizes deterministic OHLCV bars and simulates network cost
+
+INTERVAL_FREQ = {'60m': 'h', '1d': 'B', '1wk': 'W-FRI'}
+PERIOD_SPAN = {
+    '1d': pd.Timedelta(days=1),
+    '5d': pd.Timedelta(days=7),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+}
+
+
+def make_bars(index, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index))))
+    open_ = close * (1 + rng.normal(0, 0.002, len(index)))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.003, len(index))))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.003, len(index))))
+    volume = rng.integers(1_000_000, 5_000_000, len(index)).astype('float64')
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+                        index=index)
+
+
+class FakeTicker:
+    latency = 0.25  # seconds per request
+    per_bar = 0.0005  # seconds per bar transferred
+    calls = 0
+
+    def __init__(self, symbol, now=None):
+        self.symbol = symbol
+        self.now = now or pd.Timestamp.now(tz='America/New_York').floor('h')
+
+    def history(self, period=None, interval='1d', start=None):
+        FakeTicker.calls += 1
+        # Generate the full year once so overlapping requests agree on every bar
+        index = pd.date_range(end=self.now, periods=2000, freq=INTERVAL_FREQ[interval])
+        bars = make_bars(index, seed=sum(map(ord, self.symbol)))
+        if start is not None:
+            bars = bars[bars.index >= start]
+        else:
+            bars = bars[bars.index > self.now - PERIOD_SPAN[period]]
+        time.sleep(self.latency + self.per_bar * len(bars))
+        return bars.copy()
+
+
+def fake_download(symbols, period=None, interval='1d', threads=True, max_threads=16, **kwargs):
+    # Stand-in for yf.download: one threaded batch of FakeTicker requests, (field, symbol) columns
+    from concurrent.futures import ThreadPoolExecutor
+    workers = min(max_threads, len(symbols)) if threads else 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        frames = list(pool.map(lambda s: FakeTicker(s).history(period=period, interval=interval), symbols))
+    return pd.concat(dict(zip(symbols, frames)), axis=1).swaplevel(axis=1).sort_index(axis=1)
+
+
+def unthrottled_scheduler():
+    # For benchmarks that measure something other than the rate limit
+    from rate_limit import RequestScheduler, TokenBucket
+    return RequestScheduler(TokenBucket(1e9, 1e9))
+
+
+class FakeTimeSeries:
+    # Stand-in for alpha_vantage's TimeSeries: AV column names, newest bar first, and the free
+    # tier's calls-per-minute limit enforced over a sliding `window` (shortened for benchmarks)
+    latency = 0.05
+    per_bar = 0.0001
+    limit = 5
+    window = 1.0
+    full_bars = {'60min': 2000, '1d': 5000}
+    fail_next = 0  # number of upcoming calls that fail with a connection error
+
+    def __init__(self, key=None, output_format='pandas', now=None):
+        self.now = now or pd.Timestamp.now().floor('h')
+        self.lock = threading.Lock()
+        self.recent = []
+        self.calls = []  # (function, symbol, outputsize) of every accepted call
+        self.rejected = 0
+
+    def _call(self, function, symbol, interval, outputsize):
+        with self.lock:
+            now = time.monotonic()
+            self.recent = [t for t in self.recent if now - t < self.window]
+            if len(self.recent) >= self.limit:
+                self.rejected += 1
+                raise ValueError("Thank you for using Alpha Vantage! Our standard API call frequency is "
+                                 f"{self.limit} calls per minute. Please visit "
+                                 "https://www.alphavantage.co/premium/ if you would like to target a higher API call frequency.")
+            self.recent.append(now)
+            if FakeTimeSeries.fail_next > 0:
+                FakeTimeSeries.fail_next -= 1
+                raise ConnectionError("Connection reset by peer")
+            self.calls.append((function, symbol, outputsize))
+
+        freq = {'60min': 'h', '1d': 'B', '1wk': 'W-FRI'}[interval]
+        bars = 100 if outputsize == 'compact' else self.full_bars.get(interval, 1000)
+        index = pd.date_range(end=self.now, periods=bars, freq=freq)
+        data = make_bars(index, seed=sum(map(ord, symbol)))
+        data.columns = ['1. open', '2. high', '3. low', '4. close', '5. volume']
+        time.sleep(self.latency + self.per_bar * bars)
+        return data.iloc[::-1], {'2. Symbol': symbol}
+
+    def get_intraday(self, symbol, interval='60min', outputsize='compact'):
+        return self._call('intraday', symbol, interval, outputsize)
+
+    def get_daily(self, symbol, outputsize='compact'):
+        return self._call('daily', symbol, '1d', outputsize)
+
+    def get_weekly(self, symbol):
+        return self._call('weekly', symbol, '1wk', 'full')
@@ -0,0 +1,268 @@
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from tabulate import tabulate
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from chart import ChartRenderer
+from fake_provider import make_bars
+from providers import AV_COLUMNS, DataProvider
+from stockbot import StockMarketGUI
+
+# Reproducible benchmark suite: recorded OHLCV fixtures of 100 to 5M bars replayed through the
+# app's own code paths (provider normalization in get_stock_data, calculate_indicators,
+# update_indicators, nlp_func and plot_chart on an Agg canvas), with no network and no display.
+# Reports the best time over repeated passes and the peak traced memory of every stage, saves
+# baselines and exits with status 1 when a stage regresses past the thresholds. Baseline times
+# are scaled by how fast a fixed calibration workload ran then and now, so a busy or slower
+# machine is not a regression.
+#
+#   python benchmarks/run_suite.py --save-baseline          # record this machine's baseline
+#   python benchmarks/run_suite.py                          # compare against it
+#   python benchmarks/run_suite.py --sizes 100 10000 --threshold 0.5
+
+SIZES = [100, 1_000, 10_000, 100_000, 1_000_000, 5_000_000]
+STAGES = ['get_stock_data (yfinance)', 'get_stock_data (alphavantage)', 'calculate_indicators',
+          'update_indicators', 'nlp_func', 'plot_chart']
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+SYMBOL = 'FIXT'
+
+# The indicator subplots trip this on every draw; it says nothing about speed
+warnings.filterwarnings('ignore', message='This figure includes Axes that are not compatible with tight_layout')
+
+# Differences below these are noise however large they are in percent
+MIN_TIME_MS = 0.5
+MIN_MEMORY_MB = 1.0
+
+
+def record_fixture(n):
+    # 1-minute bars as yf.Ticker.history returns them: integer volume and the corporate action
+    # columns, in exchange time. Generated from a fixed seed once, then read back from disk.
+    path = os.path.join(FIXTURE_DIR, f"ohlcv_{n}.parquet")
+    if not os.path.exists(path):
+        os.makedirs(FIXTURE_DIR, exist_ok=True)
+        index = pd.date_range(end='2025-12-31 16:00', periods=n, freq='min', tz='America/New_York')
+        bars = make_bars(index, seed=n)
+        bars = bars.assign(Volume=bars['Volume'].astype('int64'), Dividends=0.0, **{'Stock Splits': 0.0})
+        bars.to_parquet(path + '.tmp')
+        os.replace(path + '.tmp', path)
+    return pd.read_parquet(path)
+
+
+def fixture_digest(data):
+    # Identifies the fixture's values independently of the Parquet writer
+    digest = hashlib.sha256(data.index.as_unit('ns').asi8.tobytes())
+    for name in ['Open', 'High', 'Low', 'Close', 'Volume']:
+        digest.update(data[name].to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+class FixtureProvider(DataProvider):
+    # Replays a recorded frame in a provider's raw layout through DataProvider.get_stock_data
+    def __init__(self, name, data, columns=None):
+        self.name = name
+        self.data = data
+        self.columns = columns
+
+    def fetch(self, symbol, period):
+        return self.data
+
+
+class TextSink:
+    # Stands in for a tk.Text widget
+    def __init__(self):
+        self.text = ''
+
+    def delete(self, *args):
+        self.text = ''
+
+    def insert(self, index, text):
+        self.text += text
+
+
+def headless_gui():
+    # The real StockMarketGUI methods on an Agg canvas, without building the Tk widgets
+    gui = object.__new__(StockMarketGUI)
+    gui.current_symbol = SYMBOL
+    gui.current_currency = 'USD'
+    gui.figure = Figure(figsize=(12, 8))
+    gui.canvas = FigureCanvasAgg(gui.figure)
+    gui.chart = ChartRenderer(gui.figure, gui.canvas)
+    gui.indicators_text = TextSink()
+    gui.nlp_text = TextSink()
+    return gui
+
+
+def pipeline(gui, providers):
+    # One Analyze, stage by stage. Every pass normalizes into a new frame, so the memoized
+    # indicators are computed afresh.
+    yahoo, alpha = providers
+    yield STAGES[0], lambda: yahoo.get_stock_data(SYMBOL, '1y')
+    yield STAGES[1], lambda: alpha.get_stock_data(SYMBOL, '1y')
+    data = gui.current_data
+    yield STAGES[2], lambda: gui.calculate_indicators(data)
+    yield STAGES[3], lambda: gui.update_indicators(data)
+    yield STAGES[4], lambda: gui.nlp_func(SYMBOL, data)
+    yield STAGES[5], lambda: gui.plot_chart(data)
+
+
+def calibrate(repeats=5):
+    # Best time of a fixed NumPy and interpreter workload, timed next to each fixture size
+    values = np.random.default_rng(0).random(200_000)
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        np.sort(values)
+        np.cumsum(values).std()
+        sum(i * i for i in range(50_000))
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run_pass(gui, providers, measure_memory=False):
+    times, peaks = {}, {}
+    for stage, work in pipeline(gui, providers):
+        if measure_memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        result = work()
+        times[stage] = (time.perf_counter() - start) * 1000
+        if measure_memory:
+            peaks[stage] = (tracemalloc.get_traced_memory()[1] - before) / 2 ** 20
+        if stage == STAGES[0]:
+            gui.current_data = result
+    return times, peaks
+
+
+def run_size(n, min_time=1.0, max_repeats=25):
+    raw = record_fixture(n)
+    alpha_raw = raw.rename(columns={v: k for k, v in AV_COLUMNS.items()}).iloc[::-1]
+    providers = (FixtureProvider('yfinance', raw), FixtureProvider('alphavantage', alpha_raw, AV_COLUMNS))
+    gui = headless_gui()
+
+    run_pass(gui, providers)  # warm-up: imports, fonts, first figure layout
+    samples = {stage: [] for stage in STAGES}
+    started = time.perf_counter()
+    repeats = 0
+    while repeats < 3 or (time.perf_counter() - started < min_time and repeats < max_repeats):
+        times, _ = run_pass(gui, providers)
+        for stage, ms in times.items():
+            samples[stage].append(ms)
+        repeats += 1
+
+    tracemalloc.start()
+    try:
+        _, peaks = run_pass(gui, providers, measure_memory=True)
+    finally:
+        tracemalloc.stop()
+    # The fastest pass is the one least disturbed by the rest of the machine
+    results = {stage: {'ms': min(samples[stage]), 'peak_mb': peaks[stage]} for stage in STAGES}
+    results['calibration'] = {'ms': calibrate(), 'peak_mb': 0.0}
+    return results, fixture_digest(raw), repeats
+
+
+def compare(results, baseline, threshold, memory_threshold):
+    # Rows for the report table and the list of regressions
+    rows, regressions = [], []
+    for size, stages in results['results'].items():
+        base_size = baseline.get('results', {}).get(size, {}) if baseline else {}
+        same_fixture = baseline and baseline.get('fixtures', {}).get(size) == results['fixtures'][size]
+        speed = stages['calibration']['ms'] / base_size['calibration']['ms'] if 'calibration' in base_size else 1.0
+        for stage, r in stages.items():
+            if stage == 'calibration':
+                continue
+            base = base_size.get(stage) if same_fixture else None
+            status = ''
+            if base is not None:
+                expected = base['ms'] * speed
+                slower = r['ms'] > expected * (1 + threshold) and r['ms'] - expected > MIN_TIME_MS
+                bigger = (r['peak_mb'] > base['peak_mb'] * (1 + memory_threshold)
+                          and r['peak_mb'] - base['peak_mb'] > MIN_MEMORY_MB)
+                kinds = [kind for kind, hit in [('time', slower), ('memory', bigger)] if hit]
+                status = 'REGRESSED' if kinds else 'ok'
+                if kinds:
+                    regressions.append((size, stage, ' and '.join(kinds)))
+            elif baseline:
+                status = 'no baseline' if not base_size or same_fixture else 'fixture changed'
+            rows.append([f"{int(size):,}", stage, r['ms'], expected if base else None,
+                         (r['ms'] / expected - 1) * 100 if base else None, r['peak_mb'],
+                         base['peak_mb'] if base else None, status])
+    return rows, regressions
+
+
+def environment():
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'matplotlib': matplotlib.__version__, 'machine': platform.machine(), 'cpus': os.cpu_count(),
+            'created': time.strftime('%Y-%m-%d %H:%M:%S')}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded OHLCV fixtures through the analyze pipeline.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help="Fixture sizes in bars")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Baseline file to compare with or save to")
+    parser.add_argument('--save-baseline', action='store_true', help="Save this run as the baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed slowdown per stage as a fraction (default: 0.25)")
+    parser.add_argument('--memory-threshold', type=float, default=0.10,
+                        help="Allowed growth of peak memory per stage as a fraction (default: 0.10)")
+    parser.add_argument('--min-time', type=float, default=1.0, help="Seconds of repeats per size (default: 1)")
+    parser.add_argument('-o', '--output', help="Also write this run's results to a JSON file")
+    args = parser.parse_args(argv)
+
+    results = {'environment': environment(), 'results': {}, 'fixtures': {}}
+    for n in args.sizes:
+        start = time.perf_counter()
+        results['results'][str(n)], results['fixtures'][str(n)], repeats = run_size(n, args.min_time)
+        print(f"{n:>10,} bars: {repeats} passes in {time.perf_counter() - start:5.1f}s", file=sys.stderr)
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    rows, regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+    headers = ['bars', 'stage', 'ms', 'expected ms', 'change %', 'peak MB', 'baseline MB', 'status']
+    print(tabulate(rows, headers=headers, floatfmt='.2f', missingval='-'))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
+    if args.save_baseline:
+        if os.path.exists(args.baseline):
+            # Sizes not run this time keep their previous baseline
+            with open(args.baseline) as f:
+                previous = json.load(f)
+            for key in ['results', 'fixtures']:
+                results[key] = dict(previous.get(key, {}), **results[key])
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=1)
+        print(f"Baseline saved to {args.baseline}")
+    elif baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%} time / {args.memory_threshold:.0%} memory:")
+        for size, stage, kind in regressions:
+            print(f"  {int(size):,} bars, {stage}: {kind}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import matplotlib.dates as mdates
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+from indicators import SMA_WINDOW
+from profiling import span
+from streaming import as_datetime64
+
+# Price/indicator lines drawn on the upper axes: series name -> line style
+PRICE_LINES = {
+    'close': dict(label='Close Price', color='blue'),
+    'sma_20': dict(label=f'SMA ({SMA_WINDOW})', color='orange', linestyle='--'),
+    'bollinger_upper': dict(label='Bollinger Upper', color='red', linestyle='--'),
+    'bollinger_lower': dict(label='Bollinger Lower', color='green', linestyle='--'),
+}
+
+# Empty space kept right of the last bar, so live bars can be blitted in without a relayout
+X_HEADROOM = 0.02
+X_MARGIN = 0.01
+Y_MARGIN = 0.05
+
+
+def bucket_edges(n, buckets):
+    # Split n samples into at most `buckets` contiguous runs
+    size = int(np.ceil(n / buckets))
+    return size, np.arange(0, n, size)
+
+
+def decimate_minmax(x, y, buckets):
+    # Keep each pixel column's extremes, in time order, so spikes survive decimation
+    n = len(x)
+    if n <= 2 * buckets:
+        return x, y
+    size, starts = bucket_edges(n, buckets)
+    padded = np.full(len(starts) * size, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(-1, size)
+    low = np.argmin(np.where(np.isnan(blocks), np.inf, blocks), axis=1)
+    high = np.argmax(np.where(np.isnan(blocks), -np.inf, blocks), axis=1)
+    first, second = np.minimum(low, high), np.maximum(low, high)
+    index = np.minimum(np.column_stack([starts + first, starts + second]).ravel(), n - 1)
+    return x[index], y[index]
+
+
+def bar_verts(x, height, width):
+    # Rectangles for all bars as one (n, 4, 2) vertex array
+    left, right = x - width / 2, x + width / 2
+    zero = np.zeros_like(height)
+    return np.stack([np.column_stack([left, zero]), np.column_stack([left, height]),
+                     np.column_stack([right, height]), np.column_stack([right, zero])], axis=1)
+
+
+def band_verts(x, lower, upper):
+    # One polygon between the bands, over the bars where both are defined
+    valid = ~(np.isnan(lower) | np.isnan(upper))
+    if not valid.any():
+        return []
+    x, lower, upper = x[valid], lower[valid], upper[valid]
+    return [np.concatenate([np.column_stack([x, lower]), np.column_stack([x[::-1], upper[::-1]])])]
+
+
+class ChartRenderer:
+    # Builds the price and volume axes once and reuses every artist. render() sets new data and
+    # redraws the canvas; update() blits just the data artists when the axes limits still fit.
+    # With animated=False the artists are ordinary ones, for static output such as PNG files.
+
+    def __init__(self, figure, canvas, animated=True):
+        self.figure = figure
+        self.canvas = canvas
+        gs = figure.add_gridspec(2, 1, height_ratios=[1, 1], hspace=0.3)
+        self.price_ax = figure.add_subplot(gs[0, 0])
+        self.volume_ax = figure.add_subplot(gs[1, 0], sharex=self.price_ax)
+
+        self.lines = {name: self.price_ax.plot([], [], animated=animated, **style)[0]
+                      for name, style in PRICE_LINES.items()}
+        self.band_fill = PolyCollection([], facecolor='grey', alpha=0.2, animated=animated)
+        self.price_ax.add_collection(self.band_fill)
+        self.volume_bars = PolyCollection([], facecolor='skyblue', label='Volume', animated=animated)
+        self.volume_ax.add_collection(self.volume_bars)
+        self.artists = list(self.lines.values()) + [self.band_fill, self.volume_bars]
+
+        self.price_ax.xaxis_date()
+        self.price_ax.set_xlabel('Date')
+        self.price_ax.set_ylabel('Price')
+        self.price_ax.grid(True)
+        self.price_ax.legend(loc='upper left')
+        self.volume_ax.set_ylabel('Volume')
+        self.volume_ax.grid(True)
+        self.volume_ax.legend(handles=[self.volume_bars], loc='upper left')
+        figure.tight_layout()
+
+        self.background = None
+        if animated:
+            canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        # After every full draw: keep the static background and paint the data artists over it
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.figure.draw_artist(artist)
+
+    def _set_data(self, x, indicators):
+        # Decimate to the axes' pixel width; the bands and volume follow the same buckets
+        buckets = max(int(self.price_ax.bbox.width), 1)
+        for name, line in self.lines.items():
+            line.set_data(*decimate_minmax(x, getattr(indicators, name), buckets))
+
+        n = len(x)
+        lower, upper, volume = indicators.bollinger_lower, indicators.bollinger_upper, indicators.volume
+        if n > 2 * buckets:
+            size, starts = bucket_edges(n, buckets)
+            band_x = x[starts]
+            lower = np.fmin.reduceat(lower, starts)
+            upper = np.fmax.reduceat(upper, starts)
+            volume = np.fmax.reduceat(volume, starts)
+            # Decimated bars fill their pixel column; gaps at this density only alias
+            width = (x[-1] - x[0]) / len(starts)
+        else:
+            band_x = x
+            width = np.median(np.diff(x)) * 0.8 if n > 1 else 0.8
+        self.band_fill.set_verts(band_verts(band_x, lower, upper))
+        self.volume_bars.set_verts(bar_verts(band_x, np.nan_to_num(volume), width))
+        return volume
+
+    def _set_limits(self, x, indicators, volume):
+        span = x[-1] - x[0] if len(x) > 1 else 1.0
+        self.price_ax.set_xlim(x[0] - span * X_MARGIN, x[-1] + span * X_HEADROOM)
+        values = np.concatenate([indicators.close, indicators.bollinger_lower, indicators.bollinger_upper])
+        low, high = np.fmin.reduce(values), np.fmax.reduce(values)
+        pad = (high - low) * Y_MARGIN or abs(high) * Y_MARGIN or 1.0
+        self.price_ax.set_ylim(low - pad, high + pad)
+        self.volume_ax.set_ylim(0, (np.fmax.reduce(volume) if len(volume) else 1.0) * (1 + 2 * Y_MARGIN) or 1.0)
+
+    def _fits_limits(self, x, indicators, volume):
+        x1 = self.price_ax.get_xlim()[1]
+        y0, y1 = self.price_ax.get_ylim()
+        tail = slice(-2, None)
+        values = np.concatenate([indicators.close[tail], indicators.bollinger_lower[tail],
+                                 indicators.bollinger_upper[tail]])
+        return (x[-1] <= x1 and np.fmin.reduce(values) >= y0 and np.fmax.reduce(values) <= y1
+                and np.fmax.reduce(volume[tail]) <= self.volume_ax.get_ylim()[1])
+
+    def render(self, index, indicators, title):
+        with span('chart data', bars=len(index)):
+            x = mdates.date2num(as_datetime64(index))
+            volume = self._set_data(x, indicators)
+            self._set_limits(x, indicators, volume)
+            self.price_ax.set_title(title)
+        # Layout and rasterization of the whole figure
+        with span('canvas draw'):
+            self.canvas.draw()
+
+    def update(self, index, indicators):
+        # Live bars: blit when they land inside the current limits, otherwise rescale and redraw
+        x = mdates.date2num(as_datetime64(index))
+        volume = self._set_data(x, indicators)
+        if self.background is None or not self._fits_limits(x, indicators, volume):
+            self._set_limits(x, indicators, volume)
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_artists()
+        self.canvas.blit(self.figure.bbox)
@@ -0,0 +1,162 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from bar_cache import INTERVAL_TTL
+
+# Quote currencies of symbols and conversion of their prices to one currency. Daily FX closes
+# are loaded through the data provider (and so its bar cache and rate limit), once per currency
+# pair, and applied to each bar by date: one multiply over a whole OHLC frame or panel.
+
+# Exchange suffixes (yfinance's, then Alpha Vantage's) -> currency prices are quoted in. Symbols
+# without a suffix are taken to trade in USD.
+SUFFIX_CURRENCIES = {
+    'NS': 'INR', 'BO': 'INR', 'BSE': 'INR',
+    'L': 'GBp', 'LON': 'GBp', 'IL': 'USD',
+    'TO': 'CAD', 'V': 'CAD', 'NE': 'CAD', 'TRT': 'CAD', 'TRV': 'CAD',
+    'DE': 'EUR', 'F': 'EUR', 'DEX': 'EUR', 'FRK': 'EUR', 'PA': 'EUR', 'AS': 'EUR', 'BR': 'EUR', 'MI': 'EUR',
+    'MC': 'EUR', 'LS': 'EUR', 'VI': 'EUR', 'HE': 'EUR', 'IR': 'EUR',
+    'SW': 'CHF', 'ST': 'SEK', 'OL': 'NOK', 'CO': 'DKK',
+    'T': 'JPY', 'HK': 'HKD', 'SS': 'CNY', 'SZ': 'CNY', 'SHH': 'CNY', 'SHZ': 'CNY',
+    'KS': 'KRW', 'KQ': 'KRW', 'TW': 'TWD', 'SI': 'SGD', 'AX': 'AUD', 'NZ': 'NZD',
+    'SA': 'BRL', 'MX': 'MXN', 'JO': 'ZAc', 'TA': 'ILA',
+}
+INDEX_CURRENCIES = {
+    '^NSEI': 'INR', '^BSESN': 'INR', '^NSEBANK': 'INR', '^FTSE': 'GBP', '^GDAXI': 'EUR', '^FCHI': 'EUR',
+    '^STOXX50E': 'EUR', '^N225': 'JPY', '^HSI': 'HKD', '^GSPTSE': 'CAD', '^AXJO': 'AUD',
+}
+# Currencies quoted in hundredths of another, e.g. London prices in pence
+SUBUNITS = {'GBp': ('GBP', 0.01), 'GBX': ('GBP', 0.01), 'ZAc': ('ZAR', 0.01), 'ILA': ('ILS', 0.01)}
+CURRENCY_SIGNS = {'USD': '$', 'INR': '₹', 'EUR': '€', 'GBP': '£', 'JPY': '¥', 'CNY': '¥', 'KRW': '₩', 'GBp': 'p'}
+
+# Price columns of provider frames and yf.download panels; Volume is never converted
+PRICE_FIELDS = ['Open', 'High', 'Low', 'Close', 'Adj Close']
+
+
+def quote_currency(symbol):
+    symbol = symbol.upper()
+    if symbol in INDEX_CURRENCIES:
+        return INDEX_CURRENCIES[symbol]
+    if symbol.endswith('=X'):
+        # FX pairs: 'EURINR=X' is quoted in INR, and yfinance's 'INR=X' is USDINR
+        return symbol[-5:-2]
+    if '.' in symbol:
+        return SUFFIX_CURRENCIES.get(symbol.rsplit('.', 1)[1], 'USD')
+    return 'USD'
+
+
+def fx_symbol(base, quote):
+    # Ticker of the daily rate of `quote` per unit of `base`, in yfinance's naming
+    return f"{base}{quote}=X"
+
+
+def format_price(value, currency=None):
+    # "₹1234.50", "$12.00", "1234.50p", "CHF 9.10"; without a currency, the bare number
+    if currency is None:
+        return f"{value:.2f}"
+    sign = CURRENCY_SIGNS.get(currency)
+    if sign is None:
+        return f"{currency} {value:.2f}"
+    if sign == 'p':
+        return f"{value:.2f}p"
+    return f"{sign}{value:.2f}"
+
+
+def bar_dates(index):
+    # Calendar date of each bar in its own time zone, as int64 nanoseconds of midnight
+    if getattr(index, 'tz', None) is not None:
+        index = index.tz_localize(None)
+    return index.normalize().as_unit('ns').asi8
+
+
+def rates_at(dates, rates, index):
+    # The rate of each bar's date, or of the latest date before it. Bars older than every rate
+    # take the first one rather than going without a price.
+    positions = np.searchsorted(dates, bar_dates(index), side='right') - 1
+    return rates[np.clip(positions, 0, len(rates) - 1)]
+
+
+class FxRates:
+    # Daily FX closes per currency pair, kept for the daily interval's TTL. Every symbol quoted in
+    # a currency shares one load; the provider's bar cache keeps the series between sessions.
+
+    def __init__(self, provider, ttl=None, clock=time.monotonic):
+        self.provider = provider
+        self.ttl = INTERVAL_TTL['1d'] if ttl is None else ttl
+        self.clock = clock
+        self.pairs = {}  # (base, quote) -> (loaded at, dates as int64 ns, rates)
+        self.pair_locks = {}  # (base, quote) -> lock held while that pair loads
+        self.lock = threading.Lock()
+        self.loads = 0
+
+    def get(self, base, quote):
+        # (dates, rates) of `quote` per unit of `base`, oldest first. Called from worker threads;
+        # concurrent requests for a pair wait for a single load, while other pairs load or are
+        # read alongside it.
+        pair = (base, quote)
+        entry = self.pairs.get(pair)
+        if entry is not None and self.clock() - entry[0] < self.ttl:
+            return entry[1], entry[2]
+        with self.lock:
+            pair_lock = self.pair_locks.setdefault(pair, threading.Lock())
+        with pair_lock:
+            entry = self.pairs.get(pair)
+            if entry is None or self.clock() - entry[0] >= self.ttl:
+                closes = self.provider.get_fx_rates(base, quote).dropna()
+                if closes.empty:
+                    raise ValueError(f"No FX rates found for {base} to {quote}")
+                entry = (self.clock(), bar_dates(closes.index), closes.to_numpy(dtype='float64'))
+                with self.lock:
+                    self.loads += 1
+                    self.pairs[pair] = entry
+            return entry[1], entry[2]
+
+
+class CurrencyConverter:
+    def __init__(self, fx, target):
+        self.fx = fx
+        self.target = target
+
+    def factors(self, currency, index):
+        # Multiplier taking prices in `currency` to the target on each bar of index, or None
+        base, scale = SUBUNITS.get(currency, (currency, 1.0))
+        if base == self.target:
+            return None if scale == 1.0 else np.full(len(index), scale)
+        dates, rates = self.fx.get(base, self.target)
+        return rates_at(dates, rates, index) * scale
+
+    def convert_frame(self, data, currency):
+        # A normalized OHLCV frame with its prices in the target currency
+        if data is None or data.empty:
+            return data
+        factors = self.factors(currency, data.index)
+        if factors is None:
+            return data
+        # Columns stay contiguous, as normalize_ohlcv lays them out
+        values = data.to_numpy(dtype='float64').T.copy()
+        prices = [i for i, name in enumerate(data.columns) if name in PRICE_FIELDS]
+        values[prices] *= factors
+        return pd.DataFrame(values.T, index=data.index, columns=data.columns, copy=False)
+
+    def convert_panel(self, panel, currencies):
+        # A (field, symbol) panel with its price fields in the target currency. `currencies` maps
+        # each symbol to its quote currency; one factor column per symbol is filled per currency
+        # and the whole panel is multiplied at once.
+        if panel is None or panel.empty:
+            return panel
+        fields = panel.columns.get_level_values(0)
+        symbols = panel.columns.get_level_values(1)
+        factors = np.ones(panel.shape)
+        converted = False
+        for currency in set(currencies.values()):
+            column_factors = self.factors(currency, panel.index)
+            if column_factors is None:
+                continue
+            columns = fields.isin(PRICE_FIELDS) & symbols.isin([s for s, c in currencies.items() if c == currency])
+            factors[:, columns] = column_factors[:, None]
+            converted = True
+        if not converted:
+            return panel
+        return pd.DataFrame(panel.to_numpy(dtype='float64') * factors, index=panel.index, columns=panel.columns)
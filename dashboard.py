@@ -0,0 +1,215 @@
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from profiling import span
+from streaming import StreamingIndicators
+from watchlist import fetch_panel
+
+# A grid of sparkline panels for many symbols, refreshed together. Each cycle makes one provider
+# call for every symbol, feeds the bars through each symbol's StreamingIndicators and hands on
+# only the panels whose bars changed; those are redrawn by blitting their own rectangle, a few
+# per frame, so the cost of a cycle follows the number of changes rather than of symbols.
+
+SPARK_BARS = 120  # bars shown per sparkline
+DASHBOARD_COLUMNS = 5
+MAX_PANELS = 50
+FRAME_MS = 16  # delay between redraw frames
+FRAME_BUDGET = 0.008  # seconds of panel drawing per frame
+
+# Sparkline series: name -> line style
+SPARK_LINES = {
+    'close': dict(color='blue', linewidth=1.0),
+    'sma_20': dict(color='orange', linewidth=0.8, linestyle='--'),
+    'bollinger_upper': dict(color='red', linewidth=0.6, linestyle='--'),
+    'bollinger_lower': dict(color='green', linewidth=0.6, linestyle='--'),
+}
+
+
+def sparkline(live, bars=SPARK_BARS):
+    # The last `bars` values of each series, scaled together to 0..1, and the panel's key values
+    tail = {name: getattr(live, name)[-bars:] for name in SPARK_LINES}
+    values = np.concatenate(list(tail.values()))
+    low, high = np.fmin.reduce(values), np.fmax.reduce(values)
+    scale = (high - low) or 1.0
+    close = live.close
+    return {
+        'lines': {name: (series - low) / scale for name, series in tail.items()},
+        'price': close[-1],
+        'change': (close[-1] / close[-2] - 1) * 100 if len(close) > 1 else math.nan,
+        'rsi': live.rsi[-1],
+        'macd': live.macd[-1],
+        'signal': live.signal[-1],
+    }
+
+
+def last_bars(closes, volumes):
+    # Per column of a (bars, symbols) panel: timestamp of the last bar with a close, and that
+    # bar's close, volume and the number of bars. Equal rows mean the column has not changed.
+    values = closes.to_numpy(dtype='float64')
+    valid = ~np.isnan(values)
+    last = len(values) - 1 - valid[::-1].argmax(axis=0)
+    columns = np.arange(values.shape[1])
+    times = closes.index.asi8[last]
+    return times, np.vstack([values[last, columns], volumes.to_numpy(dtype='float64')[last, columns],
+                             valid.sum(axis=0)])
+
+
+def moved(seen, previous):
+    if previous is None:
+        return np.ones(len(seen[0]), dtype=bool)
+    (times, values), (old_times, old_values) = seen, previous
+    same = (values == old_values) | (np.isnan(values) & np.isnan(old_values))
+    return (times != old_times) | ~same.all(axis=0)
+
+
+class Dashboard:
+    # Incremental indicator state of every panel. refresh() runs on a worker thread; cycles of one
+    # Dashboard must not overlap, which the tab ensures by scheduling the next one when one ends.
+
+    def __init__(self, symbols, fetch=None, fetch_batch=None, bars=SPARK_BARS, max_workers=8):
+        self.symbols = symbols
+        self.fetch = fetch
+        self.fetch_batch = fetch_batch
+        self.bars = bars
+        self.max_workers = max_workers
+        self.period = None
+        self.live = {}
+        self.seen = None
+
+    def refresh(self, period):
+        # ({symbol: sparkline snapshot} of the panels that changed, {symbol: error})
+        if period != self.period:
+            self.period = period
+            self.live = {}
+            self.seen = None
+        with span('fetch', symbols=len(self.symbols)):
+            panel, errors = fetch_panel(self.symbols, period, self.fetch, self.fetch_batch, self.max_workers)
+
+        changed = {}
+        if panel.empty:
+            for symbol in self.symbols:
+                errors.setdefault(symbol, "No data found")
+            return changed, errors
+        with span('streaming update') as update_span:
+            closes = panel['Close'].reindex(columns=self.symbols)
+            volumes = panel['Volume'].reindex(columns=self.symbols)
+            # One vectorized comparison of every symbol's last bar picks the columns to stream
+            seen = last_bars(closes, volumes)
+            counts = seen[1][2]
+            for j in np.flatnonzero(counts == 0):
+                errors.setdefault(self.symbols[j], "No data found")
+            for j in np.flatnonzero(moved(seen, self.seen) & (counts > 0)):
+                symbol = self.symbols[j]
+                data = pd.DataFrame({'Close': closes.iloc[:, j], 'Volume': volumes.iloc[:, j]})
+                data = data[data['Close'].notna()]
+                live = self.live.get(symbol)
+                if live is None:
+                    self.live[symbol] = live = StreamingIndicators.from_frame(data)
+                elif not live.update_from(data):
+                    continue
+                changed[symbol] = sparkline(live, self.bars)
+            self.seen = seen
+            update_span.set(changed=len(changed))
+        return changed, errors
+
+
+class SparklinePanel:
+    def __init__(self, ax, symbol, bars, animated):
+        self.ax = ax
+        self.bars = bars
+        # Lines are drawn in 0..1 units and the text sits above them, so the limits never change
+        ax.set_xlim(0, bars - 1)
+        ax.set_ylim(-0.05, 1.5)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        ax.text(0.02, 0.96, symbol, transform=ax.transAxes, va='top', fontsize=8, fontweight='bold')
+        self.lines = {name: ax.plot([], [], animated=animated, **style)[0] for name, style in SPARK_LINES.items()}
+        self.price_text = ax.text(0.98, 0.96, '', transform=ax.transAxes, ha='right', va='top', fontsize=8,
+                                  animated=animated)
+        self.values_text = ax.text(0.98, 0.78, '', transform=ax.transAxes, ha='right', va='top', fontsize=7,
+                                   color='dimgray', animated=animated)
+        self.artists = list(self.lines.values()) + [self.price_text, self.values_text]
+
+    def set_data(self, snapshot):
+        for name, line in self.lines.items():
+            values = snapshot['lines'][name]
+            line.set_data(np.arange(self.bars - len(values), self.bars), values)
+        change = snapshot['change']
+        self.price_text.set_text(f"{snapshot['price']:,.2f}  {change:+.2f}%")
+        self.price_text.set_color('green' if change >= 0 else 'red')
+        trend = 'Bullish' if snapshot['macd'] > snapshot['signal'] else 'Bearish'
+        self.values_text.set_text(f"RSI {snapshot['rsi']:.0f}  MACD {trend}")
+
+
+class DashboardRenderer:
+    # One small axes per symbol on a single canvas. After a full draw every panel's background is
+    # kept, so show() repaints a panel by restoring its rectangle and blitting its artists.
+
+    def __init__(self, figure, canvas, symbols, columns=DASHBOARD_COLUMNS, bars=SPARK_BARS, animated=True):
+        self.figure = figure
+        self.canvas = canvas
+        rows = max(1, math.ceil(len(symbols) / columns))
+        gs = figure.add_gridspec(rows, columns, left=0.01, right=0.99, bottom=0.01, top=0.99,
+                                 hspace=0.08, wspace=0.04)
+        self.panels = {symbol: SparklinePanel(figure.add_subplot(gs[i // columns, i % columns]), symbol, bars, animated)
+                       for i, symbol in enumerate(symbols)}
+        self.backgrounds = None
+        self.draw_cid = canvas.mpl_connect('draw_event', self._on_draw) if animated else None
+
+    def close(self):
+        # Stop blitting: the panels become ordinary artists, so they stay on screen through later
+        # full draws, and a renderer built on the same canvas afterwards is the only one listening
+        if self.draw_cid is not None:
+            self.canvas.mpl_disconnect(self.draw_cid)
+            self.draw_cid = None
+        for panel in self.panels.values():
+            for artist in panel.artists:
+                artist.set_animated(False)
+        self.backgrounds = None
+
+    def _on_draw(self, event):
+        self.backgrounds = {symbol: self.canvas.copy_from_bbox(panel.ax.bbox) for symbol, panel in self.panels.items()}
+        for panel in self.panels.values():
+            for artist in panel.artists:
+                self.figure.draw_artist(artist)
+
+    def show(self, symbol, snapshot):
+        panel = self.panels[symbol]
+        panel.set_data(snapshot)
+        if self.backgrounds is None:
+            # Not drawn yet: the first full draw paints every panel with its latest data
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.backgrounds[symbol])
+        for artist in panel.artists:
+            self.figure.draw_artist(artist)
+        self.canvas.blit(panel.ax.bbox)
+
+
+class RedrawQueue:
+    # Changed panels waiting to be drawn, oldest first; a newer snapshot replaces a queued one.
+    # drain() draws until the frame budget is spent, so a cycle in which every panel changed is
+    # spread over several frames instead of holding up the event loop.
+
+    def __init__(self, renderer, budget=FRAME_BUDGET):
+        self.renderer = renderer
+        self.budget = budget
+        self.pending = {}
+
+    def __len__(self):
+        return len(self.pending)
+
+    def add(self, changed):
+        self.pending.update(changed)
+
+    def drain(self):
+        deadline = time.perf_counter() + self.budget
+        drawn = 0
+        while self.pending and (drawn == 0 or time.perf_counter() < deadline):
+            symbol = next(iter(self.pending))
+            self.renderer.show(symbol, self.pending.pop(symbol))
+            drawn += 1
+        return drawn
@@ -0,0 +1,129 @@
+import tkinter as tk
+from tkinter import ttk
+
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+from background import BackgroundRunner
+from dashboard import FRAME_MS, MAX_PANELS, Dashboard, DashboardRenderer, RedrawQueue
+from profiling import NULL_RUN
+from watchlist import parse_symbols
+
+
+class DashboardTab:
+    def __init__(self, notebook, root, period_var, update_interval, profiler, fetch=None, fetch_batch=None):
+        self.root = root
+        self.period_var = period_var
+        self.update_interval = update_interval
+        self.profiler = profiler
+        self.fetch = fetch
+        self.fetch_batch = fetch_batch
+        # Its own runner, so a refresh cycle and an Analyze or a scan do not cancel each other
+        self.runner = BackgroundRunner(root)
+        self.dashboard = None
+        self.redraws = None
+        self.cycle_job = None
+        self.frame_job = None
+
+        self.frame = ttk.Frame(notebook)
+        notebook.add(self.frame, text="Dashboard")
+
+        input_frame = ttk.Frame(self.frame, padding="5")
+        input_frame.pack(fill=tk.X)
+        ttk.Label(input_frame, text="Symbols:").pack(side=tk.LEFT)
+        self.symbols_entry = ttk.Entry(input_frame, width=60)
+        self.symbols_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        ttk.Button(input_frame, text="Start", command=self.start).pack(side=tk.LEFT, padx=5)
+        ttk.Button(input_frame, text="Stop", command=self.stop).pack(side=tk.LEFT, padx=5)
+        self.status_label = ttk.Label(input_frame, text="")
+        self.status_label.pack(side=tk.LEFT, padx=10)
+
+        self.figure = Figure(figsize=(12, 8))
+        self.canvas = FigureCanvasTkAgg(self.figure, self.frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    def start(self):
+        symbols = parse_symbols(self.symbols_entry.get())
+        if not symbols:
+            self.set_status("Please enter one or more stock symbols", error=True)
+            return
+        if len(symbols) > MAX_PANELS:
+            self.set_status(f"At most {MAX_PANELS} symbols fit on the dashboard", error=True)
+            return
+
+        self.stop()
+        self.dashboard = Dashboard(symbols, self.fetch, self.fetch_batch)
+        self.figure.clear()
+        self.redraws = RedrawQueue(DashboardRenderer(self.figure, self.canvas, symbols))
+        self.canvas.draw_idle()
+        self.refresh()
+
+    def stop(self):
+        self.dashboard = None
+        self.runner.cancel()
+        if self.redraws is not None:
+            self.redraws.renderer.close()
+            self.redraws = None
+        for job in (self.cycle_job, self.frame_job):
+            if job is not None:
+                self.root.after_cancel(job)
+        self.cycle_job = self.frame_job = None
+
+    def refresh(self):
+        # One cycle: a single provider call for all symbols on the worker, then the changed panels
+        self.cycle_job = None
+        dashboard = self.dashboard
+        if dashboard is None:
+            return
+        period = self.period_var.get()
+        self.set_status(f"Refreshing {len(dashboard.symbols)} symbols ({period})...")
+        run = self.profiler.start_run('dashboard', symbols=len(dashboard.symbols), period=period)
+        self.runner.submit(
+            lambda task: self.fetch_cycle(dashboard, period, run),
+            on_done=lambda result: self.apply_cycle(dashboard, result, run),
+            on_error=lambda e: self.cycle_failed(dashboard, e, run),
+        )
+
+    def fetch_cycle(self, dashboard, period, run=NULL_RUN):
+        with run.activate():
+            return dashboard.refresh(period)
+
+    def apply_cycle(self, dashboard, result, run=NULL_RUN):
+        if dashboard is not self.dashboard:
+            return
+        changed, errors = result
+        run.finish(changed=len(changed))
+        self.redraws.add(changed)
+        if self.frame_job is None:
+            self.draw_frame()
+        status = f"{len(changed)} of {len(dashboard.symbols)} panels changed"
+        if errors:
+            status += f", {len(errors)} skipped: " + ", ".join(f"{s} ({e})" for s, e in errors.items())
+        self.set_status(status, error=bool(errors))
+        self.schedule_cycle()
+
+    def cycle_failed(self, dashboard, error, run=NULL_RUN):
+        run.finish(error=str(error))
+        if dashboard is not self.dashboard:
+            return
+        self.set_status(f"Refresh failed: {str(error)}", error=True)
+        self.schedule_cycle()
+
+    def schedule_cycle(self):
+        self.cycle_job = self.root.after(self.update_interval, self.refresh)
+
+    def draw_frame(self):
+        # Staggered redraws: a frame's worth of panels, then back to the event loop
+        self.frame_job = None
+        if self.redraws is None:
+            return
+        self.redraws.drain()
+        if self.redraws:
+            self.frame_job = self.root.after(FRAME_MS, self.draw_frame)
+
+    def shutdown(self):
+        self.stop()
+        self.runner.shutdown()
+
+    def set_status(self, message, error=False):
+        self.status_label.config(text=message, foreground="red" if error else "")
@@ -0,0 +1,75 @@
+import tkinter as tk
+from tkinter import ttk, filedialog
+
+# Stage timings of recent Analyze runs, the last cProfile capture, and exports
+STAGE_COLUMNS = ['Stage', 'Count', 'Last ms', 'p50 ms', 'p95 ms', 'p99 ms']
+
+
+class DiagnosticsTab:
+    def __init__(self, notebook, profiler):
+        self.profiler = profiler
+
+        self.frame = ttk.Frame(notebook)
+        notebook.add(self.frame, text="Diagnostics")
+
+        controls = ttk.Frame(self.frame, padding="5")
+        controls.pack(fill=tk.X)
+        self.enabled_var = tk.BooleanVar(value=profiler.enabled)
+        ttk.Checkbutton(controls, text="Record timings", variable=self.enabled_var,
+                        command=self.toggle_enabled).pack(side=tk.LEFT)
+        self.capture_var = tk.BooleanVar(value=profiler.capture)
+        ttk.Checkbutton(controls, text="cProfile capture", variable=self.capture_var,
+                        command=self.toggle_capture).pack(side=tk.LEFT, padx=10)
+        ttk.Button(controls, text="Export JSON", command=self.export_json).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="Export Chrome trace", command=self.export_trace).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="Reset", command=self.reset).pack(side=tk.LEFT, padx=5)
+        self.status_label = ttk.Label(controls, text="")
+        self.status_label.pack(side=tk.LEFT, padx=10)
+
+        self.tree = ttk.Treeview(self.frame, columns=STAGE_COLUMNS, show='headings', height=12)
+        for column in STAGE_COLUMNS:
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=160 if column == 'Stage' else 90,
+                             anchor=tk.W if column == 'Stage' else tk.E)
+        self.tree.pack(fill=tk.X)
+
+        self.profile_text = tk.Text(self.frame, wrap=tk.NONE, height=20, font=("Courier", 9))
+        self.profile_text.pack(fill=tk.BOTH, expand=True)
+
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        for stage, stats in self.profiler.summary().items():
+            self.tree.insert('', tk.END, values=[stage, stats['count']] + [
+                f"{stats[key]:,.2f}" for key in ('last_ms', 'p50_ms', 'p95_ms', 'p99_ms')])
+        if self.profiler.capture:
+            self.profile_text.delete(1.0, tk.END)
+            self.profile_text.insert(tk.END, self.profiler.profile_text())
+
+    def toggle_enabled(self):
+        self.profiler.enabled = self.enabled_var.get()
+
+    def toggle_capture(self):
+        self.profiler.capture = self.capture_var.get()
+        self.refresh()
+
+    def reset(self):
+        self.profiler.reset()
+        self.profile_text.delete(1.0, tk.END)
+        self.refresh()
+
+    def export_json(self):
+        path = filedialog.asksaveasfilename(defaultextension='.json', initialfile='stockbot_timings.json',
+                                            filetypes=[("JSON", "*.json")])
+        if path:
+            self.profiler.export_json(path)
+            self.set_status(f"Saved {path}")
+
+    def export_trace(self):
+        path = filedialog.asksaveasfilename(defaultextension='.json', initialfile='stockbot_trace.json',
+                                            filetypes=[("Chrome trace", "*.json")])
+        if path:
+            self.profiler.export_chrome_trace(path)
+            self.set_status(f"Saved {path} (open in chrome://tracing or ui.perfetto.dev)")
+
+    def set_status(self, message, error=False):
+        self.status_label.config(text=message, foreground="red" if error else "")
@@ -0,0 +1,256 @@
+import weakref
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Indicator windows shared by the chart, the indicators tab, the insights and the watchlist
+SMA_WINDOW = 20
+BOLLINGER_STD = 2
+RSI_WINDOW = 14
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+
+# Largest exponent the EMA's b ** -k factors may reach within a block (float64 overflows near e**709)
+EMA_MAX_EXPONENT = 600
+# Rows per block for the rolling-window running sums
+ROLLING_BLOCK_SIZE = 1024
+
+
+def _first_valid(x):
+    # Row of the first non-NaN value in each column (len(x) for all-NaN columns)
+    if len(x) == 0:
+        return np.zeros(x.shape[1:], dtype='int64')
+    valid = ~np.isnan(x)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), len(x))
+
+
+def _mask_before(out, start):
+    # NaN out each column above its start row, touching only the rows that need it
+    head = int(min(start.max(initial=0), len(out)))
+    if head > 0:
+        out[:head][np.arange(head)[:, None] < start] = np.nan
+    return out
+
+
+def ema(x, alpha, min_periods):
+    # Same values as Series.ewm(alpha=alpha, min_periods=min_periods, adjust=False).mean() for
+    # columns whose NaNs are all leading. Each block is solved in closed form:
+    # y[t] = b**t * (y[-1] + alpha * cumsum(x[i] / b**i))
+    x = np.asarray(x, dtype='float64')
+    squeeze = x.ndim == 1
+    if squeeze:
+        x = x[:, None]
+    n = len(x)
+    out = np.empty_like(x)
+    if n == 0:
+        return out[:, 0] if squeeze else out
+
+    start = _first_valid(x)
+    filled = x
+    if start.any():
+        # Backfill the leading NaNs with each column's first value: an EMA resting at x[start]
+        # gives exactly y[start] = x[start], as adjust=False starts there
+        filled = np.where(np.isnan(x), x[np.minimum(start, n - 1), np.arange(x.shape[1])], x)
+
+    b = 1 - alpha
+    # Blocks are as long as the decay allows, so the Python loop runs only n / block_size times
+    block_size = max(1, min(n, int(EMA_MAX_EXPONENT / -np.log(b))))
+    powers = b ** np.arange(1, block_size + 1)[:, None]
+    y = filled[0]
+    for block in range(0, n, block_size):
+        chunk = filled[block:block + block_size]
+        p = powers[:len(chunk)]
+        # In place: out = p * (y + alpha * cumsum(chunk / p))
+        segment = out[block:block + len(chunk)]
+        np.divide(chunk, p, out=segment)
+        np.cumsum(segment, axis=0, out=segment)
+        segment *= alpha
+        segment += y
+        segment *= p
+        y = segment[-1]
+
+    _mask_before(out, start + min_periods - 1)
+    return out[:, 0] if squeeze else out
+
+
+def rolling_mean_std(x, window):
+    # Rolling mean and sample std (ddof=1) from running sums, NaN until the window is full.
+    # Rows are cut into overlapping blocks of ROLLING_BLOCK_SIZE windows, laid side by side as
+    # a strided view, so every block's sums come from one cumsum over the whole array.
+    x = np.asarray(x, dtype='float64')
+    n = len(x)
+    mean = np.full(x.shape, np.nan)
+    std = np.full(x.shape, np.nan)
+    rows = n - window + 1
+    if rows <= 0:
+        return mean, std
+    block = min(ROLLING_BLOCK_SIZE, rows)
+    blocks = -(-rows // block)
+    length = block + window - 1
+    # Padded to whole blocks by repeating the last row; the extra outputs are dropped
+    columns = x.reshape(n, -1)
+    padded = np.concatenate([columns, np.repeat(columns[-1:], blocks * block + window - 1 - n, axis=0)])
+    # (blocks, length, columns): block i holds the inputs of output rows i * block .. (i + 1) * block - 1
+    chunks = np.moveaxis(sliding_window_view(padded, length, axis=0)[::block], -1, 1)
+    valid = ~np.isnan(chunks)
+    gaps = not valid.all()
+    # Sums are taken around each block's mean, which keeps the sum-of-squares cancellation
+    # error far below the indicator precision
+    if gaps:
+        counts = valid.sum(axis=1, keepdims=True)
+        centred = np.where(valid, chunks, 0.0)
+        offset = centred.sum(axis=1, keepdims=True) / np.maximum(counts, 1)
+        centred -= offset
+        centred[~valid] = 0.0
+    else:
+        offset = chunks.mean(axis=1, keepdims=True)
+        centred = chunks - offset
+    sums = np.cumsum(centred, axis=1)
+    np.square(centred, out=centred)
+    squares = np.cumsum(centred, axis=1)
+    window_sum = sums[:, window - 1:].copy()
+    window_sum[:, 1:] -= sums[:, :-window]
+    window_squares = squares[:, window - 1:].copy()
+    window_squares[:, 1:] -= squares[:, :-window]
+    block_mean = window_sum / window
+    window_sum *= block_mean
+    window_squares -= window_sum
+    window_squares /= window - 1
+    np.maximum(window_squares, 0.0, out=window_squares)
+    block_std = np.sqrt(window_squares, out=window_squares)
+    block_mean += offset
+    if gaps:
+        filled = np.cumsum(valid, axis=1, dtype='int32')
+        partial = filled[:, window - 1:].copy()
+        partial[:, 1:] -= filled[:, :-window]
+        partial = partial != window
+        block_mean[partial] = np.nan
+        block_std[partial] = np.nan
+    mean.reshape(n, -1)[window - 1:] = block_mean.reshape(-1, columns.shape[1])[:rows]
+    std.reshape(n, -1)[window - 1:] = block_std.reshape(-1, columns.shape[1])[:rows]
+    return mean, std
+
+
+class IndicatorSet:
+    # Every indicator is computed on first access and kept, so the chart, the indicators tab
+    # and the insights all share one computation per dataset. Arrays are (bars,) for a single
+    # symbol or (bars, symbols) for a panel, with NaNs only at the start of each column.
+
+    def __init__(self, close, volume=None, index=None):
+        self.close = np.asarray(close, dtype='float64')
+        self.volume = None if volume is None else np.asarray(volume, dtype='float64')
+        self.index = index
+
+    @cached_property
+    def _sma_std(self):
+        return rolling_mean_std(self.close, SMA_WINDOW)
+
+    @cached_property
+    def sma_20(self):
+        return self._sma_std[0]
+
+    @cached_property
+    def std_20(self):
+        return self._sma_std[1]
+
+    @cached_property
+    def bollinger_upper(self):
+        return self.sma_20 + self.std_20 * BOLLINGER_STD
+
+    @cached_property
+    def bollinger_lower(self):
+        return self.sma_20 - self.std_20 * BOLLINGER_STD
+
+    @cached_property
+    def bollinger_percent_b(self):
+        return (self.close - self.bollinger_lower) / (self.bollinger_upper - self.bollinger_lower)
+
+    @cached_property
+    def _smoothed_moves(self):
+        # Wilder smoothing, matching ta.momentum.RSIIndicator: the first bar counts as no change
+        close = self.close if self.close.ndim == 2 else self.close[:, None]
+        diff = np.diff(close, axis=0, prepend=np.nan)
+        first = _first_valid(close)
+        columns = np.flatnonzero(first < len(close))
+        diff[first[columns], columns] = 0.0
+        gains = np.maximum(diff, 0.0)
+        losses = np.maximum(np.negative(diff, out=diff), 0.0, out=diff)
+        if self.close.ndim == 1:
+            # Two contiguous passes: an EMA down two interleaved columns costs several times more
+            return ema(gains[:, 0], 1 / RSI_WINDOW, RSI_WINDOW), ema(losses[:, 0], 1 / RSI_WINDOW, RSI_WINDOW)
+        # Panels: gains and losses side by side, so both are smoothed in a single EMA pass
+        smoothed = ema(np.concatenate([gains, losses], axis=1), 1 / RSI_WINDOW, RSI_WINDOW)
+        return tuple(np.split(smoothed, 2, axis=1))
+
+    @cached_property
+    def average_gain(self):
+        return self._smoothed_moves[0]
+
+    @cached_property
+    def average_loss(self):
+        return self._smoothed_moves[1]
+
+    @cached_property
+    def rsi(self):
+        ema_up, ema_down = self.average_gain, self.average_loss
+        # 100 - 100 / (1 + up / down), in place, and 100 where nothing was lost
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.divide(ema_up, ema_down)
+            rsi += 1
+            np.divide(100, rsi, out=rsi)
+            np.subtract(100, rsi, out=rsi)
+        rsi[ema_down == 0] = 100
+        return rsi
+
+    @cached_property
+    def ema_fast(self):
+        return ema(self.close, 2 / (MACD_FAST + 1), MACD_FAST)
+
+    @cached_property
+    def ema_slow(self):
+        return ema(self.close, 2 / (MACD_SLOW + 1), MACD_SLOW)
+
+    @cached_property
+    def macd(self):
+        return self.ema_fast - self.ema_slow
+
+    @cached_property
+    def signal(self):
+        return ema(self.macd, 2 / (MACD_SIGNAL + 1), MACD_SIGNAL)
+
+    @cached_property
+    def average_volume(self):
+        return np.nanmean(self.volume, axis=0)
+
+    @cached_property
+    def volume_ratio(self):
+        # Latest volume as a percentage of the average over the whole window
+        return self.volume[-1] / self.average_volume * 100
+
+    def series(self, name):
+        # Zero-copy pandas view for plotting and for the existing text/insight code
+        return pd.Series(getattr(self, name), index=self.index, name=name)
+
+
+_indicator_cache = {}
+
+
+def compute_indicators(data):
+    # One IndicatorSet per DataFrame object, dropped when the frame is garbage collected
+    key = id(data)
+    cached = _indicator_cache.get(key)
+    if cached is not None and cached[0]() is data:
+        return cached[1]
+    close = data['Close']
+    if close.hasnans:
+        # The kernels only accept leading NaNs, so carry the last price over any gap
+        close = close.ffill()
+    indicators = IndicatorSet(close.to_numpy(dtype='float64'),
+                              data['Volume'].to_numpy(dtype='float64') if 'Volume' in data else None,
+                              data.index)
+    _indicator_cache[key] = (weakref.ref(data), indicators)
+    weakref.finalize(data, _indicator_cache.pop, key, None)
+    return indicators
@@ -0,0 +1,209 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# Per-stage timings of the analyze pipeline. A run is started for each Analyze and activated on
+# every thread that works on it; code anywhere below (providers, cache, chart) opens spans with
+# span(name), which record into the run active on the current thread. With no active run, or
+# with the profiler turned off, span() returns a shared no-op object.
+
+PERCENTILES = [50, 95, 99]
+
+
+class NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span:
+    def __init__(self, run, name, attrs):
+        self.run = run
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        self.run.spans.append((self.name, self.start, end, threading.get_ident(), self.attrs))
+        return False
+
+    def set(self, **attrs):
+        # Data sizes and other facts known only once the work is done
+        self.attrs.update(attrs)
+
+
+class NullRun:
+    def span(self, name, **attrs):
+        return NULL_SPAN
+
+    @contextmanager
+    def activate(self):
+        yield self
+
+    def finish(self, **attrs):
+        pass
+
+
+NULL_RUN = NullRun()
+_active = threading.local()
+
+
+def span(name, **attrs):
+    run = getattr(_active, 'run', None)
+    if run is None:
+        return NULL_SPAN
+    return run.span(name, **attrs)
+
+
+class Run:
+    def __init__(self, profiler, name, attrs, capture):
+        self.profiler = profiler
+        self.name = name
+        self.attrs = attrs
+        self.spans = []  # (name, start, end, thread id, attrs); list.append is thread-safe
+        self.profile = cProfile.Profile() if capture else None
+        self.start = time.perf_counter()
+        self.end = None
+
+    def span(self, name, **attrs):
+        return Span(self, name, attrs)
+
+    @contextmanager
+    def activate(self):
+        # Make this the run that span() records into on the calling thread. The parts of a run
+        # execute one after another, so one cProfile.Profile can follow it across threads.
+        previous = getattr(_active, 'run', None)
+        _active.run = self
+        if self.profile is not None:
+            self.profile.enable()
+        try:
+            yield self
+        finally:
+            if self.profile is not None:
+                self.profile.disable()
+            _active.run = previous
+
+    def finish(self, **attrs):
+        self.end = time.perf_counter()
+        self.attrs.update(attrs)
+        self.profiler.record(self)
+
+
+class Profiler:
+    # Keeps the last `window` runs and, per run kind and per stage ('analyze: fetch'), the last
+    # `window` durations for rolling percentiles. Turning it off makes start_run() return NULL_RUN.
+
+    def __init__(self, enabled=True, capture=False, window=500):
+        self.enabled = enabled
+        self.capture = capture
+        self.window = window
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.runs = deque(maxlen=self.window)
+            self.durations = {}
+            self.last_profile = None
+
+    def start_run(self, name, **attrs):
+        if not self.enabled:
+            return NULL_RUN
+        return Run(self, name, attrs, self.capture)
+
+    def record(self, run):
+        with self.lock:
+            self.runs.append(run)
+            self._add(run.name, run.end - run.start)
+            for name, start, end, thread, attrs in run.spans:
+                self._add(f"{run.name}: {name}", end - start)
+            if run.profile is not None:
+                self.last_profile = run.profile
+
+    def _add(self, name, seconds):
+        if name not in self.durations:
+            self.durations[name] = deque(maxlen=self.window)
+        self.durations[name].append(seconds)
+
+    def summary(self):
+        # {stage: {'count', 'last_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms'}}, in first-seen order
+        with self.lock:
+            durations = {name: np.array(values) * 1000 for name, values in self.durations.items()}
+        result = {}
+        for name, ms in durations.items():
+            stats = {'count': len(ms), 'last_ms': float(ms[-1]), 'mean_ms': float(ms.mean())}
+            for p, value in zip(PERCENTILES, np.percentile(ms, PERCENTILES)):
+                stats[f'p{p}_ms'] = float(value)
+            result[name] = stats
+        return result
+
+    def profile_text(self, limit=25):
+        # The top functions by cumulative time of the last captured run
+        with self.lock:
+            profile = self.last_profile
+        if profile is None:
+            return "No cProfile capture yet: turn it on and run Analyze."
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats('cumulative').print_stats(limit)
+        return out.getvalue()
+
+    def _run_dict(self, run):
+        return {
+            'name': run.name,
+            'start_ms': (run.start - self.origin) * 1000,
+            'duration_ms': (run.end - run.start) * 1000,
+            'attrs': run.attrs,
+            'spans': [{'name': name, 'start_ms': (start - self.origin) * 1000, 'duration_ms': (end - start) * 1000,
+                       'thread': thread, 'attrs': attrs} for name, start, end, thread, attrs in run.spans],
+        }
+
+    def to_json(self):
+        with self.lock:
+            runs = list(self.runs)
+        return {'summary': self.summary(), 'runs': [self._run_dict(run) for run in runs]}
+
+    def chrome_trace(self):
+        # Trace Event Format, for chrome://tracing or https://ui.perfetto.dev: one complete
+        # event per run and per span, on the thread it ran on
+        with self.lock:
+            runs = list(self.runs)
+        pid = os.getpid()
+        events = []
+        for run in runs:
+            events.append({'name': run.name, 'ph': 'X', 'pid': pid, 'tid': 0, 'ts': (run.start - self.origin) * 1e6,
+                           'dur': (run.end - run.start) * 1e6, 'args': run.attrs})
+            for name, start, end, thread, attrs in run.spans:
+                events.append({'name': name, 'ph': 'X', 'pid': pid, 'tid': thread, 'ts': (start - self.origin) * 1e6,
+                               'dur': (end - start) * 1e6, 'args': attrs})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_json(), f, default=str)
+
+    def export_chrome_trace(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f, default=str)
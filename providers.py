@@ -0,0 +1,413 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from alpha_vantage.foreignexchange import ForeignExchange
+from alpha_vantage.timeseries import TimeSeries
+
+from bar_cache import BarCache, trim_to_period
+from bar_store import BarStore
+from currency import CurrencyConverter, FxRates, fx_symbol, quote_currency
+from profiling import span
+from rate_limit import scheduler_for
+from resample import resample_ohlcv
+
+# Data sources without any GUI dependency, shared by the Tk app and the headless report CLI
+
+# Bar interval requested from yfinance (and used to name replay files) for each selectable period
+PERIOD_INTERVALS = {
+    '1d': '60m',
+    '5d': '60m',
+    '1mo': '1d',
+    '3mo': '1wk',
+    '6mo': '1wk',
+    '1y': '1wk',
+}
+
+# What is fetched for each period: the bars of the longest period in its group, at the group's
+# finest interval. Every other period of the group is then cut from the cached bars and
+# resampled locally, so switching among 1mo, 3mo, 6mo and 1y needs no network call.
+PERIOD_SOURCES = {
+    '1d': ('60m', '5d'),
+    '5d': ('60m', '5d'),
+    '1mo': ('1d', '1y'),
+    '3mo': ('1d', '1y'),
+    '6mo': ('1d', '1y'),
+    '1y': ('1d', '1y'),
+}
+
+# Every provider returns these columns, in this order
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Alpha Vantage column names -> the OHLCV ones the rest of the app uses
+AV_COLUMNS = {'1. open': 'Open', '2. high': 'High', '3. low': 'Low', '4. close': 'Close', '5. volume': 'Volume'}
+
+# Alpha Vantage's compact output is the latest 100 bars. Periods needing no more than that
+# (60min bars including extended hours, or daily bars) are never fetched with outputsize='full'.
+AV_COMPACT_BARS = 100
+AV_PERIOD_BARS = {'1d': 16, '5d': 80, '1mo': 23}
+# Alpha Vantage keeps its own intervals (a year of daily bars needs the full 20-year output), but
+# the periods sharing an interval share one fetch
+AV_PERIOD_SOURCES = {
+    '1d': ('60min', '5d'),
+    '5d': ('60min', '5d'),
+    '1mo': ('1d', '1mo'),
+    '3mo': ('1wk', '1y'),
+    '6mo': ('1wk', '1y'),
+    '1y': ('1wk', '1y'),
+}
+
+
+def is_normalized(data):
+    return (list(data.columns) == OHLCV_COLUMNS and data.index.is_monotonic_increasing
+            and all(dtype == 'float64' for dtype in data.dtypes)
+            and all(data[name].to_numpy().flags.c_contiguous for name in OHLCV_COLUMNS))
+
+
+def period_bars(data, period, interval):
+    # The bars of period at interval, from bars of that interval or finer
+    data = trim_to_period(data, period)
+    if data is None or data.empty:
+        return data
+    return resample_ohlcv(data, interval)
+
+
+def normalize_ohlcv(data, columns=None):
+    # OHLCV columns as one float64 block in which each column is contiguous, oldest bar first.
+    # `columns` maps the source's own column names to OHLCV ones. A frame already in this
+    # layout is returned as is; anything else costs exactly one copy, sorting included.
+    if data is None or data.empty:
+        return data
+    if is_normalized(data):
+        return data
+
+    source = {target: name for name, target in (columns or {}).items() if name in data}
+    order = None if data.index.is_monotonic_increasing else data.index.argsort(kind='stable')
+    values = np.empty((len(OHLCV_COLUMNS), len(data)))
+    for row, name in enumerate(OHLCV_COLUMNS):
+        name = source.get(name, name)
+        if name not in data:
+            # Replay files without volume still chart and analyze
+            values[row] = np.nan
+            continue
+        column = data[name].to_numpy(dtype='float64')
+        if order is None:
+            values[row] = column
+        else:
+            np.take(column, order, out=values[row])
+    index = data.index if order is None else data.index[order]
+    return pd.DataFrame(values.T, index=index, columns=OHLCV_COLUMNS, copy=False)
+
+
+class DataProvider:
+    # A source of OHLCV bars. Subclasses implement fetch(symbol, period), returning the bars for
+    # the period in any column layout that `columns` maps; get_stock_data() normalizes them.
+    name = None
+    columns = None
+    supports_batch = False
+
+    def fetch(self, symbol, period):
+        raise NotImplementedError
+
+    def normalize(self, data):
+        with span('normalize', rows=0 if data is None else len(data)):
+            return normalize_ohlcv(data, self.columns)
+
+    def get_stock_data(self, symbol, period='1mo'):
+        # Called from worker threads: failures are raised for the caller to report, never shown here
+        if period not in PERIOD_INTERVALS:
+            raise ValueError(f"Invalid period: {period}")
+        try:
+            data = self.fetch(symbol, period)
+        except Exception as e:
+            print(f"Error fetching data for {symbol}: {str(e)}")
+            raise
+
+        if data is None or data.empty:
+            raise ValueError(f"No data found for symbol: {symbol} and period: {period}")
+        return self.normalize(data)
+
+    def currency(self, symbol):
+        # Currency of the symbol's prices, from its exchange suffix; no request is made
+        return quote_currency(symbol)
+
+    def get_fx_rates(self, base, quote):
+        # Closes of `quote` per unit of `base`, oldest first. Daily where the provider has them;
+        # this default serves the pair like any symbol, e.g. a recorded USDINR=X file.
+        return self.get_stock_data(fx_symbol(base, quote), '1y')['Close']
+
+
+class YFinanceProvider(DataProvider):
+    name = 'yfinance'
+    supports_batch = True
+
+    def __init__(self, cache=None, ticker_cls=None, download=None, scheduler=None):
+        self.cache = cache if cache is not None else BarCache()
+        self.ticker_cls = ticker_cls or yf.Ticker
+        self.download = download or yf.download
+        self.scheduler = scheduler or scheduler_for('yfinance')
+
+    def fetch(self, symbol, period):
+        interval, source_period = PERIOD_SOURCES[period]
+        data = self.history(symbol, interval, source_period)
+        if interval == PERIOD_INTERVALS[period]:
+            return trim_to_period(data, period)
+        return period_bars(data, period, PERIOD_INTERVALS[period])
+
+    def history(self, symbol, interval, source_period):
+        # Bars are normalized before they are cached, so cache hits need no further copy
+        ticker = self.ticker_cls(symbol)
+        return self.cache.get(
+            'yfinance', symbol, interval, source_period,
+            fetch_full=lambda: self.normalize(self.scheduler.call(
+                ('history', symbol, interval, source_period),
+                lambda: ticker.history(period=source_period, interval=interval))),
+            fetch_since=lambda start: self.normalize(self.scheduler.call(
+                ('history', symbol, interval, str(start)),
+                lambda: ticker.history(start=start, interval=interval))),
+        )
+
+    def get_fx_rates(self, base, quote):
+        # The year of daily bars cached for the '1mo' to '1y' periods, not the weekly ones
+        data = self.history(fx_symbol(base, quote), '1d', '1y')
+        if data is None or data.empty:
+            raise ValueError(f"No FX rates found for {base} to {quote}")
+        return data['Close']
+
+    def get_batch_data(self, symbols, period='1mo', interval=None):
+        # One yf.download call for the whole watchlist; columns are (field, symbol). The interval
+        # defaults to the period's own.
+        if period not in PERIOD_INTERVALS:
+            raise ValueError(f"Invalid period: {period}")
+        interval = interval or PERIOD_INTERVALS[period]
+        try:
+            data = self.scheduler.call(
+                ('download', tuple(symbols), period, interval),
+                lambda: self.download(symbols, period=period, interval=interval,
+                                      group_by='column', threads=True, progress=False))
+        except Exception as e:
+            print(f"Error fetching data for {', '.join(symbols)}: {str(e)}")
+            raise
+        if data is None or data.empty:
+            raise ValueError(f"No data found for symbols: {', '.join(symbols)} and period: {period}")
+        return data.sort_index()
+
+
+class AlphaVantageProvider(DataProvider):
+    name = 'alphavantage'
+    # Also maps series cached before normalization, which kept Alpha Vantage's own names
+    columns = AV_COLUMNS
+
+    def __init__(self, api_key, cache=None, ts=None, scheduler=None, fx=None):
+        self.ts = ts or TimeSeries(key=api_key, output_format='pandas')  # Initialize Alpha Vantage API client
+        self.fx = fx or ForeignExchange(key=api_key, output_format='pandas')
+        self.cache = cache if cache is not None else BarCache()
+        # Calls are throttled per API key, shared with every other client using the same key
+        self.scheduler = scheduler or scheduler_for('alphavantage', api_key)
+
+    def fetch(self, symbol, period):
+        interval, source_period = AV_PERIOD_SOURCES[period]
+        if interval == '60min':
+            function = lambda size: self.ts.get_intraday(symbol=symbol, interval='60min', outputsize=size)[0]
+        elif interval == '1d':
+            function = lambda size: self.ts.get_daily(symbol=symbol, outputsize=size)[0]
+        else:
+            function = lambda size: self.ts.get_weekly(symbol=symbol)[0]
+        fetch = lambda size: self.normalize(self.scheduler.call((symbol, interval, size), lambda: function(size)))
+        full_size = 'compact' if AV_PERIOD_BARS.get(source_period, AV_COMPACT_BARS + 1) <= AV_COMPACT_BARS else 'full'
+        # A top-up only needs the latest bars, which the compact output (last 100 points) covers
+        data = self.cache.get(
+            'alphavantage', symbol, interval, source_period,
+            fetch_full=lambda: fetch(full_size),
+            fetch_since=lambda start: fetch('compact'),
+        )
+        # Cut to the period, as the other providers do; weekly bars come as the whole history
+        return trim_to_period(data, period)
+
+    def get_fx_rates(self, base, quote):
+        # FX_DAILY has no volume column; normalize() leaves it NaN
+        pair = fx_symbol(base, quote)
+        fetch = lambda size: self.normalize(self.scheduler.call(
+            (pair, '1d', size),
+            lambda: self.fx.get_currency_exchange_daily(from_symbol=base, to_symbol=quote, outputsize=size)[0]))
+        data = self.cache.get('alphavantage', pair, '1d', '1y', fetch_full=lambda: fetch('full'),
+                              fetch_since=lambda start: fetch('compact'))
+        if data is None or data.empty:
+            raise ValueError(f"No FX rates found for {base} to {quote}")
+        return data['Close']
+
+
+# Recorded intervals from finest to coarsest, searched when a file of the requested one is missing
+REPLAY_INTERVALS = ['1m', '2m', '5m', '15m', '30m', '60m', '1d', '1wk']
+
+
+class ReplayProvider(DataProvider):
+    # Bars recorded to Parquet or CSV files, served without network access. For each request
+    # the directory is searched for <SYMBOL>_<interval>, then for a finer interval, then for
+    # <SYMBOL>, as .parquet or .csv; bars from any but the first are resampled to the interval.
+    # Files are read once and kept in normalized form until they change on disk.
+    name = 'replay'
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.frames = {}
+        self.lock = threading.Lock()
+
+    def find(self, symbol, interval):
+        # (path, interval of the file's bars or None if unknown)
+        finer = REPLAY_INTERVALS[:REPLAY_INTERVALS.index(interval)][::-1] if interval in REPLAY_INTERVALS else []
+        for stem, stem_interval in [(f"{symbol}_{i}", i) for i in [interval] + finer] + [(symbol, None)]:
+            for extension in ['.parquet', '.csv']:
+                path = os.path.join(self.directory, stem.replace('/', '_').replace('^', '_') + extension)
+                if os.path.exists(path):
+                    return path, stem_interval
+        raise ValueError(f"No recorded bars for {symbol} ({interval}) in {self.directory}")
+
+    def load(self, path):
+        mtime = os.path.getmtime(path)
+        with self.lock:
+            cached = self.frames.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        if path.endswith('.parquet'):
+            data = pd.read_parquet(path)
+        else:
+            data = pd.read_csv(path, index_col=0)
+        if not isinstance(data.index, pd.DatetimeIndex):
+            data.index = pd.to_datetime(data.index, utc=True)
+        # Headers such as 'close' or 'CLOSE' are accepted too
+        data = normalize_ohlcv(data, {name: name.capitalize() for name in data.columns})
+        with self.lock:
+            self.frames[path] = (mtime, data)
+        return data
+
+    def fetch(self, symbol, period):
+        return self.bars(symbol, period, PERIOD_INTERVALS[period])
+
+    def bars(self, symbol, period, interval):
+        path, file_interval = self.find(symbol, interval)
+        if file_interval == interval:
+            return trim_to_period(self.load(path), period)
+        return period_bars(self.load(path), period, interval)
+
+    def get_fx_rates(self, base, quote):
+        # Daily bars of the pair, not the weekly ones of the '1y' period
+        data = self.bars(fx_symbol(base, quote), '1y', '1d')
+        if data is None or data.empty:
+            raise ValueError(f"No FX rates found for {base} to {quote}")
+        return data['Close']
+
+
+class StoreProvider(DataProvider):
+    # Bars from a memory-mapped BarStore: each period is a slice found by binary search, and the
+    # frame's index and columns are views of the file. With `interval` set, every period is
+    # resampled from that one series, e.g. years of 1m bars.
+    name = 'store'
+
+    def __init__(self, directory=None, interval=None):
+        self.store = BarStore(directory)
+        self.interval = interval
+
+    def fetch(self, symbol, period):
+        return self.bars(symbol, period, PERIOD_INTERVALS[period])
+
+    def bars(self, symbol, period, interval):
+        data = self.store.open(symbol, self.interval or interval).period(period)
+        if self.interval is None or self.interval == interval or data.empty:
+            return data
+        return resample_ohlcv(data, interval)
+
+    def get_fx_rates(self, base, quote):
+        # Daily bars of the pair, not the weekly ones of the '1y' period
+        data = self.bars(fx_symbol(base, quote), '1y', '1d')
+        if data.empty:
+            raise ValueError(f"No FX rates found for {base} to {quote}")
+        return data['Close']
+
+
+class ConvertedProvider(DataProvider):
+    # Another provider's bars with their prices in `currency`. Each bar is multiplied by the FX
+    # rate of its date; rates are loaded through the wrapped provider once per currency pair.
+
+    def __init__(self, provider, currency, fx=None):
+        self.provider = provider
+        self.target = currency
+        self.name = f"{provider.name}-{currency}"
+        self.supports_batch = provider.supports_batch
+        # batch_report reports the wrapped provider's rate limit metrics
+        self.scheduler = getattr(provider, 'scheduler', None)
+        self.converter = CurrencyConverter(fx or FxRates(provider), currency)
+
+    def currency(self, symbol):
+        return self.target
+
+    def get_fx_rates(self, base, quote):
+        return self.provider.get_fx_rates(base, quote)
+
+    def get_stock_data(self, symbol, period='1mo'):
+        data = self.provider.get_stock_data(symbol, period)
+        with span('convert', rows=len(data)):
+            return self.converter.convert_frame(data, self.provider.currency(symbol))
+
+    def get_batch_data(self, symbols, period='1mo', interval=None):
+        panel = self.provider.get_batch_data(symbols, period, interval)
+        with span('convert', rows=len(panel)):
+            return self.converter.convert_panel(panel, {s: self.provider.currency(s) for s in symbols})
+
+
+def record_bars(directory, symbol, interval, data):
+    # Save bars where a ReplayProvider on `directory` will find them
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{symbol}_{interval}".replace('/', '_').replace('^', '_') + '.parquet')
+    normalize_ohlcv(data).to_parquet(path)
+    return path
+
+
+PROVIDERS = {
+    'yfinance': YFinanceProvider,
+    'alphavantage': AlphaVantageProvider,
+    'replay': ReplayProvider,
+    'store': StoreProvider,
+}
+
+
+def make_provider(name='yfinance', api_key=None, cache_dir=None, replay_dir=None, store_dir=None,
+                  store_interval=None, currency=None):
+    if name == 'alphavantage':
+        provider = AlphaVantageProvider(api_key, cache=BarCache(cache_dir))
+    elif name == 'replay':
+        provider = ReplayProvider(replay_dir)
+    elif name == 'store':
+        provider = StoreProvider(store_dir, store_interval)
+    elif name == 'yfinance':
+        provider = YFinanceProvider(cache=BarCache(cache_dir))
+    else:
+        raise ValueError(f"Unknown provider: {name}")
+    return ConvertedProvider(provider, currency) if currency else provider
+
+
+def add_provider_arguments(parser):
+    parser.add_argument('--provider', choices=list(PROVIDERS), default='yfinance')
+    parser.add_argument('--api-key', default=os.environ.get('ALPHA_VANTAGE_API_KEY'),
+                        help="Alpha Vantage API key (default: $ALPHA_VANTAGE_API_KEY)")
+    parser.add_argument('--cache-dir', help="Bar cache directory (default: ~/.stockbot_cache)")
+    parser.add_argument('--replay-dir', help="Directory of recorded bars for --provider replay")
+    parser.add_argument('--store-dir', help="Bar store directory for --provider store (default: ~/.stockbot_store)")
+    parser.add_argument('--store-interval', help="Serve every period from this stored interval, e.g. 1m")
+    parser.add_argument('--currency', type=str.upper,
+                        help="Convert prices to this currency, e.g. USD or INR (default: each symbol's own)")
+
+
+def check_provider_arguments(parser, args):
+    if args.provider == 'alphavantage' and not args.api_key:
+        parser.error("--api-key or ALPHA_VANTAGE_API_KEY is required for Alpha Vantage")
+    if args.provider == 'replay' and not args.replay_dir:
+        parser.error("--replay-dir is required for the replay provider")
+
+
+def provider_options(args):
+    return (args.provider, args.api_key, args.cache_dir, args.replay_dir, args.store_dir, args.store_interval,
+            args.currency)
@@ -0,0 +1,154 @@
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+from profiling import span
+
+# Sustained requests per second and burst size per provider. Alpha Vantage's free tier allows
+# 5 calls in any minute, which a burst above one call would break; yfinance publishes no limit,
+# so this only keeps bursts polite.
+PROVIDER_LIMITS = {
+    'alphavantage': (5 / 60, 1),
+    'yfinance': (5.0, 20),
+}
+
+# Error messages that mean "slow down" rather than "bad request"
+THROTTLE_MESSAGES = ['call frequency', 'rate limit', 'too many requests']
+
+
+def is_transient(error):
+    # Network failures and throttling are worth retrying; an invalid symbol is not
+    if isinstance(error, OSError):
+        return True
+    message = str(error).lower()
+    return 'ratelimit' in type(error).__name__.lower() or any(m in message for m in THROTTLE_MESSAGES)
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = capacity
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        # Take a token now, letting the balance go negative, and return how long the caller has
+        # to wait for it. Callers are served in the order they arrive, with no polling.
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+
+class RequestScheduler:
+    # Every provider call goes through call(): identical calls already in flight share one
+    # result, each real call waits for a token, and transient failures are retried with
+    # full-jitter exponential backoff.
+
+    def __init__(self, bucket, retries=3, backoff=2.0, max_backoff=60.0, retry_on=is_transient,
+                 sleep=time.sleep):
+        self.bucket = bucket
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_on = retry_on
+        self.sleep = sleep
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'calls_made': 0, 'calls_saved': 0, 'retries': 0, 'failures': 0,
+                      'queue_wait': 0.0, 'max_queue_wait': 0.0}
+
+    def call(self, key, func):
+        with self.lock:
+            self.stats['requests'] += 1
+            future = self.in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self.in_flight[key] = Future()
+            else:
+                self.stats['calls_saved'] += 1
+        if not owner:
+            return future.result()
+
+        try:
+            future.set_result(self._run(func))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+        return future.result()
+
+    def _run(self, func):
+        for attempt in range(self.retries + 1):
+            with span('rate limit wait'):
+                wait = self.bucket.acquire()
+            with self.lock:
+                self.stats['calls_made'] += 1
+                self.stats['queue_wait'] += wait
+                self.stats['max_queue_wait'] = max(self.stats['max_queue_wait'], wait)
+            try:
+                with span('provider call', attempt=attempt):
+                    return func()
+            except Exception as e:
+                if attempt == self.retries or not self.retry_on(e):
+                    with self.lock:
+                        self.stats['failures'] += 1
+                    raise
+                delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+                print(f"Provider call failed ({str(e)}), retrying in {delay:.1f}s")
+                with self.lock:
+                    self.stats['retries'] += 1
+                self.sleep(delay)
+
+    def metrics(self):
+        with self.lock:
+            return dict(self.stats)
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+_rate_share = 1
+
+
+def share_limits(processes):
+    # Worker processes each hold their own buckets, so each gets an equal share of the limit
+    global _rate_share
+    _rate_share = max(1, processes)
+    # Buckets inherited from a forked parent carry the parent's full limit
+    with _schedulers_lock:
+        _schedulers.clear()
+
+
+def max_processes(provider, processes):
+    # However small its share, each worker process can make one call at once, so together they
+    # stay within the limit only if there are no more of them than the burst size. Providers
+    # without a limit (replay, store) take any number.
+    if provider not in PROVIDER_LIMITS:
+        return processes
+    return min(processes, max(1, int(PROVIDER_LIMITS[provider][1])))
+
+
+def scheduler_for(provider, api_key=None):
+    # One scheduler, and so one token bucket, per provider and API key
+    with _schedulers_lock:
+        key = (provider, api_key)
+        if key not in _schedulers:
+            rate, capacity = PROVIDER_LIMITS[provider]
+            # Fractional shares: a worker with less than one token of burst waits for the rest, so
+            # all workers together never burst beyond the provider's own capacity
+            bucket = TokenBucket(rate / _rate_share, capacity / _rate_share)
+            _schedulers[key] = RequestScheduler(bucket)
+        return _schedulers[key]
@@ -0,0 +1,125 @@
+import math
+
+from currency import format_price
+from indicators import SMA_WINDOW, compute_indicators
+
+# Text and summary values shown by the Technical Indicators and Insights tabs. `indicators` is
+# either the IndicatorSet for data or the live StreamingIndicators; both share attribute names.
+# `currency` is the currency of data's prices, used to label them.
+
+# RSI above RSI_OVERBOUGHT reads as overbought, below RSI_OVERSOLD as oversold
+RSI_OVERBOUGHT = 70
+RSI_OVERSOLD = 30
+
+
+def indicators_report(data, indicators=None, currency=None):
+    if len(data) < SMA_WINDOW:
+        return "Insufficient data to calculate indicators"
+
+    if indicators is None:
+        indicators = compute_indicators(data)
+    sma_20, rsi, macd, signal = indicators.sma_20, indicators.rsi, indicators.macd, indicators.signal
+    bollinger_upper, bollinger_lower = indicators.bollinger_upper, indicators.bollinger_lower
+
+    current_price = indicators.close[-1]
+    prev_close = indicators.close[-2]
+    price_change = ((current_price - prev_close) / prev_close) * 100
+
+    indicators_text = f"Current Price: {format_price(current_price, currency)} ({price_change:+.2f}%)\n\n"
+    indicators_text += f"SMA (20): {format_price(sma_20[-1], currency)}"
+    indicators_text += " (Bullish)" if current_price > sma_20[-1] else " (Bearish)"
+
+    indicators_text += f"\n\nBollinger Bands:"
+    indicators_text += f"\n  Upper: {format_price(bollinger_upper[-1], currency)}"
+    indicators_text += f"\n  Lower: {format_price(bollinger_lower[-1], currency)}"
+    if current_price > bollinger_upper[-1]:
+        indicators_text += " (Potentially Overbought)"
+    elif current_price < bollinger_lower[-1]:
+        indicators_text += " (Potentially Oversold)"
+
+    indicators_text += f"\n\nRSI (14): {rsi[-1]:.2f}"
+    if rsi[-1] > RSI_OVERBOUGHT:
+        indicators_text += " (Overbought - Consider Selling)"
+    elif rsi[-1] < RSI_OVERSOLD:
+        indicators_text += " (Oversold - Consider Buying)"
+    else:
+        indicators_text += " (Neutral)"
+
+    indicators_text += f"\n\nMACD: {macd[-1]:.2f}"
+    indicators_text += " (Bullish Signal)" if macd[-1] > signal[-1] else " (Bearish Signal)"
+
+    # Add trading volume analysis
+    avg_volume = indicators.average_volume
+    current_volume = indicators.volume[-1]
+    volume_ratio = indicators.volume_ratio
+
+    indicators_text += f"\n\nVolume Analysis:"
+    indicators_text += f"\nCurrent Volume: {current_volume:,.0f}"
+    indicators_text += f"\nAverage Volume: {avg_volume:,.0f}"
+    indicators_text += f"\nVolume Ratio: {volume_ratio:.1f}% of Average"
+    return indicators_text
+
+
+def insights_report(symbol, data, indicators=None, currency=None):
+    if indicators is None:
+        indicators = compute_indicators(data)
+    if len(indicators.close) < 2:
+        return f"Insufficient data to analyze {symbol}: at least two bars are needed"
+    current_price = indicators.close[-1]
+    rsi_value = indicators.rsi[-1]
+    sentiment = "positive" if current_price > indicators.close[-2] else "negative"
+
+    response = f"""
+                🤖 ChatBot Analysis for {symbol}:
+
+                - The current stock price is {format_price(current_price, currency)}.
+                - The recent trend seems to be {sentiment}.
+                - The RSI is at {rsi_value:.2f}, indicating it is {"overbought" if rsi_value > RSI_OVERBOUGHT else "oversold" if rsi_value < RSI_OVERSOLD else "neutral"}.
+                - Based on this, you may want to {"wait for a dip" if rsi_value > RSI_OVERBOUGHT else "consider buying" if rsi_value < RSI_OVERSOLD else "hold your position"}.
+
+                📊 I hope this helps! Type another query or click Analyze again.
+            """
+    return response.strip()
+
+
+def report_texts(symbol, data, indicators=None, currency=None):
+    # The Technical Indicators and Insights text, as the JSON reports carry them
+    if indicators is None:
+        indicators = compute_indicators(data)
+    return {'indicators_text': indicators_report(data, indicators, currency),
+            'insights_text': insights_report(symbol, data, indicators, currency)}
+
+
+def _number(value):
+    # JSON has no NaN: undefined indicator values are written as null
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def report_summary(symbol, period, data, indicators=None, currency=None):
+    # Latest values as plain floats, one row of the batch CSV and the core of the JSON report
+    if indicators is None:
+        indicators = compute_indicators(data)
+    close = indicators.close
+    summary = {
+        'symbol': symbol,
+        'period': period,
+        'bars': len(data),
+        'last_bar': str(data.index[-1]),
+        'currency': currency,
+        'price': _number(close[-1]),
+        'change_pct': _number((close[-1] / close[-2] - 1) * 100) if len(close) > 1 else None,
+    }
+    if len(data) >= SMA_WINDOW:
+        summary.update({
+            'sma_20': _number(indicators.sma_20[-1]),
+            'bollinger_upper': _number(indicators.bollinger_upper[-1]),
+            'bollinger_lower': _number(indicators.bollinger_lower[-1]),
+            'rsi': _number(indicators.rsi[-1]),
+            'macd': _number(indicators.macd[-1]),
+            'signal': _number(indicators.signal[-1]),
+            'volume': _number(indicators.volume[-1]),
+            'average_volume': _number(indicators.average_volume),
+            'volume_ratio': _number(indicators.volume_ratio),
+        })
+    return summary
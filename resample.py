@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from profiling import span
+
+# Coarser OHLCV bars built from finer ones, so one fetch of fine bars serves several periods.
+# Bars are grouped in the index's own time zone and labelled the way yfinance labels them:
+# intraday bars by their start, counted from the first bar of each day (the session open);
+# daily bars by the date, weekly bars by the Monday and monthly bars by the first of the month.
+
+DAY_NS = 86_400 * 10 ** 9
+
+# How each column is aggregated over (starts, ends) row ranges; other columns are summed
+AGGREGATIONS = {
+    'Open': lambda column, starts, ends: column[starts],
+    'High': lambda column, starts, ends: np.fmax.reduceat(column, starts),
+    'Low': lambda column, starts, ends: np.fmin.reduceat(column, starts),
+    'Close': lambda column, starts, ends: column[ends - 1],
+}
+
+
+def interval_minutes(interval):
+    # Length of an intraday interval ('15m', '60m', '60min', '1h'); None for 1d, 1wk and 1mo
+    if interval.endswith('min'):
+        return int(interval[:-3])
+    if interval.endswith('m') and interval[:-1].isdigit():
+        return int(interval[:-1])
+    if interval.endswith('h') and interval[:-1].isdigit():
+        return 60 * int(interval[:-1])
+    if interval in ('1d', '1wk', '1mo'):
+        return None
+    raise ValueError(f"Unsupported interval: {interval}")
+
+
+def _localize(local_ns, tz):
+    index = pd.DatetimeIndex(local_ns.view('M8[ns]'))
+    if tz is None:
+        return index
+    return index.tz_localize(tz, ambiguous=np.zeros(len(index), dtype=bool), nonexistent='shift_forward')
+
+
+def bucket_starts(index, interval):
+    # (first row of each bucket, bucket labels) for an ascending DatetimeIndex
+    index = index.as_unit('ns')
+    local = (index.tz_localize(None) if index.tz is not None else index).asi8
+    day = local // DAY_NS
+    minutes = interval_minutes(interval)
+    if minutes is not None:
+        # Offsets are measured in elapsed time, so daylight saving changes do not move buckets
+        utc = index.asi8
+        day_starts = np.flatnonzero(np.diff(day, prepend=day[0] - 1))
+        day_open = np.repeat(utc[day_starts], np.diff(np.append(day_starts, len(utc))))
+        slot = (utc - day_open) // (minutes * 60 * 10 ** 9)
+        key = day * 10_000 + slot
+        starts = np.flatnonzero(np.diff(key, prepend=key[0] - 1))
+        labels = pd.DatetimeIndex((day_open[starts] + slot[starts] * minutes * 60 * 10 ** 9).view('M8[ns]'))
+        return starts, labels if index.tz is None else labels.tz_localize('UTC').tz_convert(index.tz)
+
+    if interval == '1d':
+        key = day
+        label_days = day
+    elif interval == '1wk':
+        # 1970-01-01 was a Thursday; weeks start on Monday
+        key = (day + 3) // 7
+        label_days = key * 7 - 3
+    else:
+        key = local.view('M8[ns]').astype('M8[M]').view('int64')
+        label_days = None
+    starts = np.flatnonzero(np.diff(key, prepend=key[0] - 1))
+    if label_days is None:
+        label_ns = key[starts].view('M8[M]').astype('M8[ns]').view('int64')
+    else:
+        label_ns = label_days[starts] * DAY_NS
+    return starts, _localize(label_ns, index.tz)
+
+
+def in_session(data, start='09:30', end='16:00'):
+    # Bars starting within [start, end) local time, e.g. to leave out extended-hours bars
+    return data.iloc[data.index.indexer_between_time(start, end, include_end=False)]
+
+
+def resample_ohlcv(data, interval, session=None):
+    # Bars of `data` (ascending, OHLCV columns) aggregated to `interval`, as one float64 block.
+    # session=(start, end) first drops the bars outside those local times.
+    if data is None or data.empty:
+        return data
+    if session is not None:
+        data = in_session(data, *session)
+        if data.empty:
+            return data
+    with span('resample', rows=len(data), interval=interval):
+        starts, labels = bucket_starts(data.index, interval)
+        ends = np.append(starts[1:], len(data))
+        values = np.empty((len(data.columns), len(starts)))
+        for row, name in enumerate(data.columns):
+            column = data[name].to_numpy(dtype='float64')
+            aggregate = AGGREGATIONS.get(name)
+            values[row] = np.add.reduceat(column, starts) if aggregate is None else aggregate(column, starts, ends)
+        return pd.DataFrame(values.T, index=labels, columns=data.columns, copy=False)
@@ -0,0 +1,306 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from tabulate import tabulate
+
+from bar_cache import INTERVAL_TTL, PERIOD_ORDER, trim_to_period
+from indicators import IndicatorSet
+from providers import (PERIOD_INTERVALS, add_provider_arguments, check_provider_arguments, make_provider,
+                       provider_options)
+from reports import RSI_OVERBOUGHT, RSI_OVERSOLD
+from watchlist import fetch_panel, parse_symbols, right_align
+
+# Screens a whole universe against an index: relative strength over several lookbacks, beta and
+# correlation of returns, each symbol's most correlated peers, and the RSI/MACD/SMA/Bollinger
+# states the Technical Indicators tab reports. Closes are downloaded in chunks and kept on disk,
+# so a later run only fetches new symbols and the bars since the last one. Results are computed
+# a chunk of symbols at a time; the correlation matrix is built one block of rows at a time and
+# only each row's top peers are kept, so memory stays bounded however large the universe is.
+
+SCREEN_INTERVAL = '1d'  # requested from providers with a batch call; others use the period's
+CORRELATION_WINDOW = 60  # returns used for beta, correlation and peers
+MIN_PERIODS = 20  # fewest joint returns for a correlation
+# Relative strength lookbacks and their weights in the RS score; recent ones weigh more. They are
+# calendar offsets, so they mean the same with the weekly bars of providers without batch calls.
+RS_LOOKBACKS = {'RS 1m': (pd.DateOffset(months=1), 0.4), 'RS 3m': (pd.DateOffset(months=3), 0.4),
+                'RS 6m': (pd.DateOffset(months=6), 0.2)}
+FETCH_CHUNK = 200  # symbols per download
+SCREEN_CHUNK = 500  # symbols per block of computation
+PEER_BLOCK = 200  # rows of the correlation matrix held at once
+# Shortest download that covers the bars missing since the last cached one
+TOPUP_PERIODS = [('5d', pd.Timedelta(days=6)), ('1mo', pd.Timedelta(days=28)), ('3mo', pd.Timedelta(days=88)),
+                 ('6mo', pd.Timedelta(days=180))]
+
+SCREEN_COLUMNS = ['Price', 'Return %', 'RS 1m', 'RS 3m', 'RS 6m', 'RS Score', 'RS Rank', 'Beta', 'Correlation',
+                  'RSI', 'RSI State', 'MACD', 'SMA', 'Bollinger', 'Signal Score', 'Peers']
+
+
+class ClosesCache:
+    # Closes (bars, symbols) of every symbol screened so far, one Parquet file per provider,
+    # interval and period
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(os.path.expanduser('~'), '.stockbot_screener')
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, provider, interval, period):
+        return os.path.join(self.directory, f"closes_{provider}_{interval}_{period}.parquet")
+
+    def load(self, provider, interval, period):
+        # (closes, seconds since they were saved), or (None, None)
+        path = self.path(provider, interval, period)
+        try:
+            return pd.read_parquet(path), time.time() - os.path.getmtime(path)
+        except (OSError, ValueError):
+            return None, None
+
+    def save(self, provider, interval, period, closes):
+        path = self.path(provider, interval, period)
+        closes.to_parquet(path + '.tmp')
+        os.replace(path + '.tmp', path)
+
+
+def fetch_closes(provider, symbols, period, interval, errors, chunk_size=FETCH_CHUNK):
+    # Closes of `symbols` as one date-aligned frame, downloaded `chunk_size` symbols at a time
+    frames = []
+    for start in range(0, len(symbols), chunk_size):
+        chunk = symbols[start:start + chunk_size]
+        try:
+            if provider.supports_batch:
+                panel, chunk_errors = fetch_panel(
+                    chunk, period, fetch_batch=lambda s, p: provider.get_batch_data(s, p, interval))
+            else:
+                panel, chunk_errors = fetch_panel(chunk, period, fetch=provider.get_stock_data)
+        except Exception as e:
+            errors.update({symbol: str(e) for symbol in chunk})
+            continue
+        errors.update(chunk_errors)
+        if not panel.empty:
+            frames.append(panel['Close'])
+    if not frames:
+        return pd.DataFrame()
+    closes = pd.concat(frames, axis=1).sort_index()
+    return closes.loc[:, ~closes.columns.duplicated()]
+
+
+def topup_period(last, period):
+    # The shortest download reaching back past the last cached bar, or None for a full one
+    now = pd.Timestamp.now(tz=last.tz)
+    for topup, span in TOPUP_PERIODS:
+        if now - last < span and PERIOD_ORDER.index(topup) < PERIOD_ORDER.index(period):
+            return topup
+    return None
+
+
+def merge_closes(cached, fresh):
+    # Fresh closes over cached ones, on the union of their dates and symbols. One reindex of each
+    # frame instead of combine_first, which works column by column and is slow on wide frames.
+    index = cached.index.union(fresh.index)
+    columns = cached.columns.union(fresh.columns, sort=False)
+    fresh = fresh.reindex(index=index, columns=columns)
+    return fresh.where(fresh.notna(), cached.reindex(index=index, columns=columns))
+
+
+def load_closes(provider, symbols, period='1y', cache=None, chunk_size=FETCH_CHUNK):
+    # (closes of `symbols`, errors). With a cache, only symbols it lacks are downloaded in full;
+    # the rest get the bars since the last cached one once the interval's TTL has passed.
+    interval = SCREEN_INTERVAL if provider.supports_batch else PERIOD_INTERVALS[period]
+    errors = {}
+    cached, age = cache.load(provider.name, interval, period) if cache is not None else (None, None)
+    known = [s for s in symbols if cached is not None and s in cached.columns]
+    missing = [s for s in symbols if cached is None or s not in cached.columns]
+
+    frames = []
+    if missing:
+        frames.append(fetch_closes(provider, missing, period, interval, errors, chunk_size))
+    if known and age >= INTERVAL_TTL.get(interval, 0):
+        # Without a batch call each symbol is fetched through the provider's own bar cache, which
+        # already tops up; a shorter period would also change the interval. The top-up reaches
+        # the oldest last close among them, as symbols left out of recent runs were not updated.
+        stale = cached[known].notna().to_numpy()[::-1].argmax(axis=0).max()
+        topup = (topup_period(cached.index[-1 - stale], period) if provider.supports_batch else None) or period
+        frames.append(fetch_closes(provider, known, topup, interval, errors, chunk_size))
+        # A symbol whose top-up failed keeps its cached bars
+        for symbol in known:
+            errors.pop(symbol, None)
+
+    closes = cached
+    for frame in frames:
+        if not frame.empty:
+            # Downloaded bars replace cached ones, so revised bars are picked up too
+            closes = frame if closes is None else merge_closes(closes, frame)
+    if closes is None or closes.empty:
+        return pd.DataFrame(), errors
+    closes = trim_to_period(closes.sort_index(), period)
+    if cache is not None and frames:
+        cache.save(provider.name, interval, period, closes)
+    return closes[[s for s in symbols if s in closes.columns]], errors
+
+
+def joint_moments(x, y):
+    # Pairwise-complete Pearson correlation, covariance and y variance of every column of x with
+    # every column of y, from zero-filled values and validity masks: six matrix products
+    mx, my = ~np.isnan(x), ~np.isnan(y)
+    x0, y0 = np.where(mx, x, 0.0), np.where(my, y, 0.0)
+    mx, my = mx.astype('float64'), my.astype('float64')
+    n = mx.T @ my
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sx, sy = (x0.T @ my) / n, (mx.T @ y0) / n
+        cov = (x0.T @ y0) / n - sx * sy
+        var_x = ((x0 * x0).T @ my) / n - sx * sx
+        var_y = (mx.T @ (y0 * y0)) / n - sy * sy
+        corr = cov / np.sqrt(var_x * var_y)
+    corr[n < MIN_PERIODS] = np.nan
+    return corr, cov, var_y
+
+
+def top_peers(returns, symbols, top=3, block=PEER_BLOCK):
+    # Each symbol's `top` most correlated other symbols over the returns, as "SYM (0.93)" text,
+    # computing the (symbols, symbols) correlation matrix one block of rows at a time
+    peers = []
+    for start in range(0, returns.shape[1], block):
+        corr, _, _ = joint_moments(returns[:, start:start + block], returns)
+        rows = np.arange(corr.shape[0])
+        corr[rows, start + rows] = np.nan  # a symbol is not its own peer
+        ranked = np.where(np.isnan(corr), -np.inf, corr)
+        k = min(top, corr.shape[1] - 1)
+        best = np.argpartition(-ranked, k - 1, axis=1)[:, :k] if k > 0 else np.empty((len(rows), 0), int)
+        order = np.argsort(-np.take_along_axis(ranked, best, axis=1), axis=1)
+        best = np.take_along_axis(best, order, axis=1)
+        for row, columns in enumerate(best):
+            peers.append(", ".join(f"{symbols[j]} ({corr[row, j]:.2f})" for j in columns
+                                   if not np.isnan(corr[row, j])))
+    return peers
+
+
+def signal_states(closes):
+    # The Technical Indicators tab's readings for every column, and a score from +4 (all of
+    # them bullish or oversold) to -4
+    indicators = IndicatorSet(right_align(closes).to_numpy())
+    price, rsi = indicators.close[-1], indicators.rsi[-1]
+    macd_bullish = indicators.macd[-1] > indicators.signal[-1]
+    above_sma = price > indicators.sma_20[-1]
+    above_upper, below_lower = price > indicators.bollinger_upper[-1], price < indicators.bollinger_lower[-1]
+    overbought, oversold = rsi > RSI_OVERBOUGHT, rsi < RSI_OVERSOLD
+    score = (np.where(macd_bullish, 1, -1) + np.where(above_sma, 1, -1) + oversold.astype(int) - overbought
+             + below_lower.astype(int) - above_upper)
+    return pd.DataFrame({
+        'RSI': rsi,
+        'RSI State': np.select([overbought, oversold], ['Overbought', 'Oversold'], 'Neutral'),
+        'MACD': np.where(macd_bullish, 'Bullish', 'Bearish'),
+        'SMA': np.where(above_sma, 'Bullish', 'Bearish'),
+        'Bollinger': np.select([above_upper, below_lower], ['Overbought', 'Oversold'], ''),
+        'Signal Score': score,
+    }, index=closes.columns)
+
+
+def lookback_return(closes, offset):
+    # Return of each column since its last close at or before `offset` before the last bar
+    filled = closes.ffill()
+    past = filled.loc[:closes.index[-1] - offset]
+    if past.empty:
+        return np.full(closes.shape[1:], np.nan)
+    return filled.iloc[-1].to_numpy() / past.iloc[-1].to_numpy() - 1
+
+
+def screen(closes, index_symbol, window=CORRELATION_WINDOW, peers=3, chunk_size=SCREEN_CHUNK):
+    # One row per symbol of `closes` (date-aligned, the index among the columns)
+    index_returns = closes[index_symbol].pct_change(fill_method=None).to_numpy()[-window:, None]
+    index_rs = {column: lookback_return(closes[[index_symbol]], offset)
+                for column, (offset, weight) in RS_LOOKBACKS.items()}
+    symbols = [s for s in closes.columns if s != index_symbol]
+    tail_returns = np.empty((min(window, len(closes)), len(symbols)))
+
+    tables = []
+    for start in range(0, len(symbols), chunk_size):
+        chunk = closes[symbols[start:start + chunk_size]]
+        values = right_align(chunk).to_numpy()
+        table = signal_states(chunk)
+        table.insert(0, 'Price', values[-1])
+        table.insert(1, 'Return %', (values[-1] / values[np.argmax(~np.isnan(values), axis=0),
+                                                        np.arange(values.shape[1])] - 1) * 100)
+        for column, (offset, weight) in RS_LOOKBACKS.items():
+            table[column] = ((1 + lookback_return(chunk, offset)) / (1 + index_rs[column]) - 1) * 100
+
+        returns = chunk.pct_change(fill_method=None).to_numpy()[-window:]
+        tail_returns[:, start:start + chunk.shape[1]] = returns
+        corr, cov, var_index = joint_moments(returns, index_returns)
+        table['Beta'] = cov[:, 0] / var_index[:, 0]
+        table['Correlation'] = corr[:, 0]
+        tables.append(table)
+
+    table = pd.concat(tables)
+    table['RS Score'] = sum(table[column].fillna(0) * weight for column, (offset, weight) in RS_LOOKBACKS.items())
+    table['RS Rank'] = (table['RS Score'].rank(pct=True) * 98 + 1).round()
+    table['Peers'] = top_peers(tail_returns, symbols, peers) if peers else ''
+    table.index.name = 'Symbol'
+    return table[SCREEN_COLUMNS]
+
+
+def run_screen(provider, symbols, index_symbol, period='1y', cache=None, window=CORRELATION_WINDOW, peers=3):
+    # (table, errors) for the symbols that loaded, sorted by RS rank
+    closes, errors = load_closes(provider, list(dict.fromkeys([index_symbol] + symbols)), period, cache)
+    if index_symbol not in closes.columns:
+        raise ValueError(f"No data for the index {index_symbol}: {errors.get(index_symbol, 'No data found')}")
+    counts = closes.notna().sum()
+    for symbol in counts[counts < MIN_PERIODS].index:
+        errors[symbol] = "Insufficient data to calculate indicators"
+    closes = closes.loc[:, counts >= MIN_PERIODS]
+    table = screen(closes, index_symbol, window, peers)
+    return table.sort_values('RS Rank', ascending=False), errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen a universe of symbols by relative strength, beta, "
+                                                 "correlation and indicator state.")
+    parser.add_argument('symbols', nargs='*', help="Stock symbols, e.g. AAPL TSLA INFY.NS")
+    parser.add_argument('--symbols-file', help="File of symbols separated by commas, spaces or newlines")
+    parser.add_argument('--index', default='SPY', help="Symbol to measure beta and relative strength against")
+    parser.add_argument('-p', '--period', default='1y', choices=PERIOD_ORDER)
+    parser.add_argument('--window', type=int, default=CORRELATION_WINDOW,
+                        help=f"Returns used for beta, correlation and peers (default: {CORRELATION_WINDOW})")
+    parser.add_argument('--peers', type=int, default=3, help="Most correlated symbols listed per symbol, 0 for none")
+    parser.add_argument('--sort', default='RS Rank', choices=SCREEN_COLUMNS, help="Column to rank by")
+    parser.add_argument('--ascending', action='store_true')
+    parser.add_argument('-n', '--top', type=int, default=25, help="Rows to print (default: 25)")
+    parser.add_argument('-o', '--output', help="Write every symbol's row to this CSV file")
+    parser.add_argument('--screen-cache', help="Closes cache directory (default: ~/.stockbot_screener)")
+    parser.add_argument('--no-cache', action='store_true', help="Download every close and keep nothing")
+    add_provider_arguments(parser)
+    args = parser.parse_args(argv)
+    check_provider_arguments(parser, args)
+    symbols = list(args.symbols)
+    if args.symbols_file:
+        with open(args.symbols_file) as f:
+            symbols += f.read().split()
+    symbols = parse_symbols(' '.join(symbols))
+    if not symbols:
+        parser.error("no symbols given")
+
+    start = time.perf_counter()
+    cache = None if args.no_cache else ClosesCache(args.screen_cache)
+    try:
+        table, errors = run_screen(make_provider(*provider_options(args)), symbols, args.index.upper(), args.period,
+                                   cache, args.window, args.peers)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    for symbol, error in errors.items():
+        print(f"  {symbol}: {error}", file=sys.stderr)
+
+    # Ties on a state column are broken by relative strength
+    table = table.sort_values([args.sort, 'RS Score'], ascending=[args.ascending, False], kind='stable')
+    if args.output:
+        table.to_csv(args.output)
+    print(tabulate(table.head(args.top), headers='keys', floatfmt='.2f'))
+    print(f"{len(table)} symbols screened against {args.index.upper()} in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+import argparse
+import tkinter as tk
+from tkinter import ttk, messagebox
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from alerts import load_rules, make_sinks
+from alerts_tab import AlertsTab
+from background import BackgroundRunner
+from chart import ChartRenderer
+from dashboard_tab import DashboardTab
+from diagnostics_tab import DiagnosticsTab
+from indicators import compute_indicators
+from profiling import NULL_RUN, Profiler, span
+from providers import add_provider_arguments, check_provider_arguments, make_provider, provider_options
+from reports import indicators_report, insights_report
+from streaming import StreamingIndicators
+from watchlist_tab import WatchlistTab
+
+class StockMarketGUI:
+    def __init__(self, root, provider, profiler=None):
+        self.root = root
+        self.root.title("Stock Market Analysis")
+        self.root.geometry("1200x800")
+
+        self.provider = provider
+        # Per-stage timings of every Analyze and refresh, shown in the Diagnostics tab
+        self.profiler = profiler or Profiler()
+        self.current_symbol = ""
+        self.update_interval = 60000
+        # Currency the shown prices are in: the symbol's own, or the one given with --currency
+        self.current_currency = None
+        self.runner = BackgroundRunner(root)
+        # Live refresh state: incremental indicators for the symbol on screen and the pending timer
+        self.refresh_runner = BackgroundRunner(root)
+        self.refresh_job = None
+        self.live = None
+        self.current_data = None
+        self.current_period = None
+        self.trace_path = None  # Where to save a Chrome trace of the session on exit
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        self.input_frame = ttk.Frame(root, padding="10")
+        self.input_frame.pack(fill=tk.X)
+
+        self.title_frame = ttk.Frame(root, padding="5")
+        self.title_frame.pack(fill=tk.X)
+        self.company_name_label = ttk.Label(self.title_frame, text="", font=("Helvetica", 16, "bold"))
+        self.company_name_label.pack()
+
+        self.content_frame = ttk.Frame(root, padding="10")
+        self.content_frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(self.input_frame, text="Stock Symbol:").pack(side=tk.LEFT)
+        self.symbol_entry = ttk.Entry(self.input_frame, width=10)
+        self.symbol_entry.pack(side=tk.LEFT, padx=5)
+
+        self.period_var = tk.StringVar(value="1mo")
+        ttk.Label(self.input_frame, text="Period:").pack(side=tk.LEFT, padx=(10, 0))
+        period_combo = ttk.Combobox(self.input_frame, textvariable=self.period_var,
+                                     values=["1d", "5d", "1mo", "3mo", "6mo", "1y"],
+                                     width=5)
+        period_combo.pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(self.input_frame, text="Analyze", command=self.analyze_stock).pack(side=tk.LEFT, padx=10)
+
+        self.auto_refresh_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.input_frame, text="Auto refresh", variable=self.auto_refresh_var,
+                        command=self.toggle_auto_refresh).pack(side=tk.LEFT, padx=10)
+
+        self.status_label = ttk.Label(self.input_frame, text="")
+        self.status_label.pack(side=tk.LEFT, padx=10)
+
+        self.notebook = ttk.Notebook(self.content_frame)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
+
+        self.chart_tab = ttk.Frame(self.notebook)
+        self.indicators_tab = ttk.Frame(self.notebook)
+        self.nlp_tab = ttk.Frame(self.notebook)
+
+        self.notebook.add(self.chart_tab, text="Price Chart")
+        self.notebook.add(self.indicators_tab, text="Technical Indicators")
+        self.notebook.add(self.nlp_tab, text="Insights")
+        # Providers with a batch call fetch the whole watchlist or dashboard at once, the rest one
+        # symbol per thread
+        if provider.supports_batch:
+            fetchers = dict(fetch_batch=provider.get_batch_data)
+        else:
+            fetchers = dict(fetch=self.get_stock_data)
+        self.watchlist = WatchlistTab(self.notebook, self.root, self.period_var, **fetchers)
+        self.dashboard = DashboardTab(self.notebook, self.root, self.period_var, self.update_interval,
+                                      self.profiler, **fetchers)
+        self.alerts = AlertsTab(self.notebook, self.root, self.period_var, self.update_interval,
+                                self.profiler, **fetchers)
+        self.diagnostics = DiagnosticsTab(self.notebook, self.profiler)
+
+        self.figure = Figure(figsize=(12, 8))  # Increased figure height to accommodate more plots
+        self.canvas = FigureCanvasTkAgg(self.figure, self.chart_tab)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.chart = ChartRenderer(self.figure, self.canvas)
+
+        self.indicators_text = tk.Text(self.indicators_tab, wrap=tk.WORD, height=20)
+        self.indicators_text.pack(fill=tk.BOTH, expand=True)
+
+        self.nlp_text = tk.Text(self.nlp_tab, wrap=tk.WORD, height=20)
+        self.nlp_text.pack(fill=tk.BOTH, expand=True)
+
+    def get_stock_data(self, symbol, period='1mo'):
+        # Normalized by the provider: float64 OHLCV columns, oldest bar first
+        return self.provider.get_stock_data(symbol, period)
+
+    def plot_chart(self, data):
+        self.chart.render(data.index, compute_indicators(data),
+                          f'{self.current_symbol} Stock Price with SMA and Bollinger Bands')
+
+    def update_chart(self, live):
+        # Live refresh: reuse the chart's artists and blit the new bars in
+        self.chart.update(live.index, live)
+
+    def calculate_indicators(self, data):
+        indicators = compute_indicators(data)
+        return (indicators.series('sma_20'), indicators.series('rsi'), indicators.series('macd'),
+                indicators.series('signal'), indicators.series('bollinger_upper'),
+                indicators.series('bollinger_lower'))
+
+    def update_indicators(self, data, indicators=None):
+        # Either the full IndicatorSet for data or the live StreamingIndicators
+        self.indicators_text.delete(1.0, tk.END)
+        self.indicators_text.insert(tk.END, indicators_report(data, indicators, self.current_currency))
+
+    def analyze_stock(self):
+        symbol = self.symbol_entry.get().upper()
+        if not symbol:
+            messagebox.showwarning("Warning", "Please enter a stock symbol")
+            return
+
+        period = self.period_var.get()
+        self.stop_live_refresh()
+        self.set_status(f"Fetching {symbol} ({period})...")
+        run = self.profiler.start_run('analyze', symbol=symbol, period=period)
+        self.runner.submit(
+            lambda task: self.fetch_and_compute(task, symbol, period, run),
+            on_done=self.show_analysis,
+            on_error=lambda e: self.analysis_failed(symbol, e, run),
+            on_progress=self.set_status,
+        )
+
+    def fetch_and_compute(self, task, symbol, period, run=NULL_RUN):
+        # Runs on a worker thread, so it must not touch any widget
+        with run.activate():
+            with span('fetch') as fetch_span:
+                data = self.get_stock_data(symbol, period)
+                fetch_span.set(bars=len(data))
+            task.check()
+            task.report(f"Calculating indicators for {symbol}...")
+            # Fills the memoized indicator set, so the Tk thread only reads finished arrays
+            with span('indicators', bars=len(data)):
+                self.calculate_indicators(data)
+            task.check()
+        return symbol, data, period, run
+
+    def show_analysis(self, result):
+        symbol, data, period, run = result
+        self.current_symbol = symbol
+        self.current_data = data
+        self.current_period = period
+        self.current_currency = self.provider.currency(symbol)
+        with run.activate():
+            with span('chart', bars=len(data)):
+                self.plot_chart(data)
+            with span('indicators text'):
+                self.update_indicators(data)
+            with span('insights text'):
+                self.nlp_func(symbol, data)
+        run.finish(bars=len(data))
+        self.diagnostics.refresh()
+        self.set_status(f"{symbol}: {len(data)} bars analyzed")
+        if self.auto_refresh_var.get():
+            self.start_live_refresh()
+
+    def analysis_failed(self, symbol, error, run):
+        run.finish(error=str(error))
+        self.diagnostics.refresh()
+        self.set_status(f"Could not retrieve data for {symbol}: {str(error)}", error=True)
+
+    def toggle_auto_refresh(self):
+        if self.auto_refresh_var.get():
+            self.start_live_refresh()
+        else:
+            self.stop_live_refresh()
+
+    def start_live_refresh(self):
+        if self.current_data is None:
+            return
+        self.live = StreamingIndicators.from_frame(self.current_data)
+        self.schedule_refresh()
+
+    def stop_live_refresh(self):
+        self.live = None
+        self.refresh_runner.cancel()
+        if self.refresh_job is not None:
+            self.root.after_cancel(self.refresh_job)
+            self.refresh_job = None
+
+    def schedule_refresh(self):
+        if self.refresh_job is not None:
+            self.root.after_cancel(self.refresh_job)
+        self.refresh_job = self.root.after(self.update_interval, self.refresh_live)
+
+    def refresh_live(self):
+        self.refresh_job = None
+        if self.live is None:
+            return
+        symbol, period = self.current_symbol, self.current_period
+        run = self.profiler.start_run('refresh', symbol=symbol, period=period)
+        self.refresh_runner.submit(
+            lambda task: self.fetch_live_bars(symbol, period, run),
+            on_done=lambda data: self.apply_live_bars(data, run),
+            on_error=lambda e: self.live_refresh_failed(symbol, e, run),
+        )
+
+    def fetch_live_bars(self, symbol, period, run=NULL_RUN):
+        with run.activate():
+            with span('fetch') as fetch_span:
+                data = self.get_stock_data(symbol, period)
+                fetch_span.set(bars=len(data))
+        return data
+
+    def apply_live_bars(self, data, run=NULL_RUN):
+        if self.live is None:
+            return
+        # Only the new or revised bars go through the O(1) per-bar indicator update
+        with run.activate():
+            with span('streaming update') as update_span:
+                applied = self.live.update_from(data)
+                update_span.set(bars=applied)
+            if applied:
+                with span('chart update'):
+                    self.update_chart(self.live)
+                with span('indicators text'):
+                    self.update_indicators(data, self.live)
+                with span('insights text'):
+                    self.nlp_func(self.current_symbol, data, self.live)
+                self.set_status(f"{self.current_symbol}: {applied} new bar(s), {len(self.live)} total")
+        run.finish(bars=applied)
+        self.schedule_refresh()
+
+    def live_refresh_failed(self, symbol, error, run=NULL_RUN):
+        run.finish(error=str(error))
+        self.set_status(f"Refresh failed for {symbol}: {str(error)}", error=True)
+        self.schedule_refresh()
+
+    def set_status(self, message, error=False):
+        self.status_label.config(text=message, foreground="red" if error else "")
+
+    def on_close(self):
+        if self.trace_path:
+            self.profiler.export_chrome_trace(self.trace_path)
+        self.stop_live_refresh()
+        self.runner.shutdown()
+        self.refresh_runner.shutdown()
+        self.watchlist.runner.shutdown()
+        self.dashboard.shutdown()
+        self.alerts.shutdown()
+        self.root.destroy()
+
+    def nlp_func(self, symbol, data, indicators=None):
+        try:
+            response = insights_report(symbol, data, indicators, self.current_currency)
+            self.nlp_text.delete(1.0, tk.END)
+            self.nlp_text.insert(tk.END, response)
+
+        except Exception as e:
+            self.nlp_text.delete(1.0, tk.END)
+            self.nlp_text.insert(tk.END, f"Error processing NLP response: {str(e)}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stock market analysis GUI.")
+    add_provider_arguments(parser)
+    parser.add_argument('--profile', action='store_true', help="Capture a cProfile of every Analyze")
+    parser.add_argument('--no-timings', action='store_true', help="Start with stage timings turned off")
+    parser.add_argument('--trace-out', help="Save a Chrome trace of the session's timings to this file on exit")
+    parser.add_argument('--alert-rules', help="Rules for the Alerts tab, one per line (default: the built-in rules)")
+    parser.add_argument('--alert-log', help="Also append alerts to this file as JSON lines")
+    parser.add_argument('--alert-webhook', help="Also POST alerts as JSON to this URL")
+    args = parser.parse_args(argv)
+    check_provider_arguments(parser, args)
+    try:
+        rules = load_rules(args.alert_rules) if args.alert_rules else None
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    root = tk.Tk()
+    profiler = Profiler(enabled=not args.no_timings, capture=args.profile)
+    app = StockMarketGUI(root, make_provider(*provider_options(args)), profiler)
+    app.trace_path = args.trace_out
+    if rules:
+        app.alerts.rules = rules
+    app.alerts.sinks = make_sinks(args.alert_log, args.alert_webhook)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+import copy
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from indicators import (BOLLINGER_STD, MACD_FAST, MACD_SIGNAL, MACD_SLOW, RSI_WINDOW, SMA_WINDOW,
+                        compute_indicators)
+
+# Per-bar indicator updates for live refresh. Each new bar costs O(1) regardless of how much
+# history is loaded. The values are not bit-identical to a full IndicatorSet recompute: the
+# EMAs here are the per-bar recursion and the rolling sums run over the whole stream, where
+# IndicatorSet solves EMA blocks in closed form and centres its sums per block. They agree
+# within RECOMPUTE_RTOL relative plus RECOMPUTE_ATOL absolute (for MACD near its zero crossings).
+RECOMPUTE_RTOL = 1e-9
+RECOMPUTE_ATOL = 1e-8
+
+SERIES = ['close', 'volume', 'sma_20', 'std_20', 'bollinger_upper', 'bollinger_lower', 'rsi', 'macd', 'signal']
+
+
+def as_datetime64(index):
+    # Naive UTC timestamps, which is also how matplotlib places tz-aware dates. The UTC
+    # nanoseconds are what the index stores, so this is a view unless the unit differs.
+    index = pd.DatetimeIndex(index)
+    if index.unit != 'ns':
+        index = index.as_unit('ns')
+    return index.asi8.view('datetime64[ns]')
+
+
+def same_value(a, b):
+    # Equal, or both missing: NaN volumes of an unchanged bar do not count as a revision
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+def timestamp_to_datetime64(timestamp):
+    # Single-value as_datetime64 without building an index
+    return np.datetime64(pd.Timestamp(timestamp).as_unit('ns').value, 'ns')
+
+
+class GrowingArray:
+    # Append-only buffer with amortised O(1) appends; view() is zero-copy
+    def __init__(self, values=(), dtype='float64'):
+        values = np.asarray(values, dtype=dtype)
+        self.data = np.empty(max(16, 2 * len(values)), dtype=dtype)
+        self.data[:len(values)] = values
+        self.size = len(values)
+
+    def append(self, value):
+        if self.size == len(self.data):
+            self.data = np.concatenate([self.data, np.empty_like(self.data)])
+        self.data[self.size] = value
+        self.size += 1
+
+    def pop(self):
+        self.size -= 1
+
+    def view(self):
+        return self.data[:self.size]
+
+
+class RunningEMA:
+    # The Series.ewm(alpha=alpha, min_periods=min_periods, adjust=False) recursion, one value at a time
+    def __init__(self, alpha, min_periods, value=math.nan, count=0):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = value
+        self.count = count
+
+    def update(self, x):
+        if not math.isnan(x):
+            self.value = x if self.count == 0 else (1 - self.alpha) * self.value + self.alpha * x
+            self.count += 1
+        return self.current()
+
+    def current(self):
+        return self.value if self.count >= self.min_periods else math.nan
+
+
+class RunningWindow:
+    # Rolling mean and sample std from running sums around an anchor value. The sums are
+    # rebuilt from the window once every `window` pushes, so rounding cannot accumulate.
+    def __init__(self, window, values=()):
+        self.window = window
+        self.values = deque(values, maxlen=window)
+        self.pushes = 0
+        self._resync()
+
+    def _resync(self):
+        self.anchor = self.values[0] if self.values else 0.0
+        self.total = sum(v - self.anchor for v in self.values)
+        self.squares = sum((v - self.anchor) ** 2 for v in self.values)
+
+    def push(self, x):
+        if len(self.values) == self.window:
+            old = self.values[0] - self.anchor
+            self.total -= old
+            self.squares -= old * old
+        self.values.append(x)
+        self.total += x - self.anchor
+        self.squares += (x - self.anchor) ** 2
+        self.pushes += 1
+        if self.pushes % self.window == 0:
+            self._resync()
+
+    def copy(self):
+        other = copy.copy(self)
+        other.values = self.values.copy()
+        return other
+
+    def mean_std(self):
+        if len(self.values) < self.window:
+            return math.nan, math.nan
+        mean = self.total / self.window
+        variance = max((self.squares - self.total * mean) / (self.window - 1), 0.0)
+        return self.anchor + mean, math.sqrt(variance)
+
+
+class StreamingIndicators:
+    # Same attribute names as IndicatorSet, so the chart and the indicator text accept either
+
+    def __init__(self):
+        self.buffers = {name: GrowingArray() for name in SERIES}
+        self.timestamps = GrowingArray(dtype='datetime64[ns]')
+        self.last_timestamp = None
+        self.window = RunningWindow(SMA_WINDOW)
+        self.gain = RunningEMA(1 / RSI_WINDOW, RSI_WINDOW)
+        self.loss = RunningEMA(1 / RSI_WINDOW, RSI_WINDOW)
+        self.fast = RunningEMA(2 / (MACD_FAST + 1), MACD_FAST)
+        self.slow = RunningEMA(2 / (MACD_SLOW + 1), MACD_SLOW)
+        self.signal_ema = RunningEMA(2 / (MACD_SIGNAL + 1), MACD_SIGNAL)
+        self.prev_close = math.nan
+        self.volume_total = 0.0
+        self.volume_count = 0
+        self._before_last = None
+
+    @classmethod
+    def from_frame(cls, data):
+        live = cls()
+        indicators = compute_indicators(data)
+        n = len(data)
+        if n <= MACD_SLOW + MACD_SIGNAL:
+            # Too short for every state to be defined yet: replay the bars
+            for timestamp, close, volume in zip(data.index, indicators.close, indicators.volume):
+                live.push(timestamp, close, volume)
+            return live
+
+        # Take the states as of the second to last bar from the full computation, then push the
+        # last bar normally so that it can later be replaced if the provider revises it
+        for name in SERIES:
+            live.buffers[name] = GrowingArray(getattr(indicators, name)[:-1])
+        live.timestamps = GrowingArray(as_datetime64(data.index[:-1]), dtype='datetime64[ns]')
+        close = indicators.close
+        live.window = RunningWindow(SMA_WINDOW, close[-SMA_WINDOW - 1:-1])
+        live.gain = RunningEMA(1 / RSI_WINDOW, RSI_WINDOW, indicators.average_gain[-2], n - 1)
+        live.loss = RunningEMA(1 / RSI_WINDOW, RSI_WINDOW, indicators.average_loss[-2], n - 1)
+        live.fast = RunningEMA(2 / (MACD_FAST + 1), MACD_FAST, indicators.ema_fast[-2], n - 1)
+        live.slow = RunningEMA(2 / (MACD_SLOW + 1), MACD_SLOW, indicators.ema_slow[-2], n - 1)
+        live.signal_ema = RunningEMA(2 / (MACD_SIGNAL + 1), MACD_SIGNAL, indicators.signal[-2],
+                                     n - MACD_SLOW)
+        live.prev_close = close[-2]
+        volume = indicators.volume[:-1]
+        live.volume_total = float(np.nansum(volume))
+        live.volume_count = int(np.count_nonzero(~np.isnan(volume)))
+        live.push(data.index[-1], close[-1], indicators.volume[-1])
+        return live
+
+    def __len__(self):
+        return self.timestamps.size
+
+    def push(self, timestamp, close, volume):
+        self._before_last = self._state()
+        if math.isnan(close):
+            # Carry the last price over a gap, as compute_indicators does
+            close = self.prev_close
+
+        diff = 0.0 if math.isnan(self.prev_close) else close - self.prev_close
+        self.prev_close = close
+        self.window.push(close)
+        sma, std = self.window.mean_std()
+        average_gain = self.gain.update(max(diff, 0.0))
+        average_loss = self.loss.update(max(-diff, 0.0))
+        if average_loss == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - (100 / (1 + average_gain / average_loss))
+        macd = self.fast.update(close) - self.slow.update(close)
+        # The signal line only starts once MACD itself is defined, as in the full computation
+        if not math.isnan(macd):
+            self.signal_ema.update(macd)
+        if not math.isnan(volume):
+            self.volume_total += volume
+            self.volume_count += 1
+
+        values = {
+            'close': close, 'volume': volume, 'sma_20': sma, 'std_20': std,
+            'bollinger_upper': sma + std * BOLLINGER_STD, 'bollinger_lower': sma - std * BOLLINGER_STD,
+            'rsi': rsi, 'macd': macd, 'signal': self.signal_ema.current(),
+        }
+        for name, value in values.items():
+            self.buffers[name].append(value)
+        self.timestamps.append(timestamp_to_datetime64(timestamp))
+        self.last_timestamp = timestamp
+
+    def replace_last(self, timestamp, close, volume):
+        # A still-forming bar came back with new values: rewind one bar and push it again
+        state = self._before_last
+        for name in SERIES:
+            self.buffers[name].pop()
+        self.timestamps.pop()
+        (self.window, self.gain, self.loss, self.fast, self.slow, self.signal_ema,
+         self.prev_close, self.volume_total, self.volume_count, self.last_timestamp) = state
+        self.push(timestamp, close, volume)
+
+    def _state(self):
+        return (self.window.copy(), copy.copy(self.gain), copy.copy(self.loss),
+                copy.copy(self.fast), copy.copy(self.slow), copy.copy(self.signal_ema),
+                self.prev_close, self.volume_total, self.volume_count, self.last_timestamp)
+
+    def update_from(self, data, on_bar=None):
+        # Apply bars from a fresh fetch: revise the last bar if it changed, append anything newer.
+        # on_bar(revised) is called after each bar, e.g. to evaluate alert rules on every one.
+        # Returns the number of bars applied.
+        applied = 0
+        if self.last_timestamp is None:
+            new_bars = data
+        else:
+            new_bars = data[data.index > self.last_timestamp]
+        if self.last_timestamp is not None and self.last_timestamp in data.index:
+            row = data.loc[self.last_timestamp]
+            if not (same_value(float(row['Close']), self.close[-1])
+                    and same_value(float(row['Volume']), self.volume[-1])):
+                self.replace_last(self.last_timestamp, float(row['Close']), float(row['Volume']))
+                applied += 1
+                if on_bar is not None:
+                    on_bar(True)
+        for timestamp, close, volume in zip(new_bars.index, new_bars['Close'].to_numpy(dtype='float64'),
+                                            new_bars['Volume'].to_numpy(dtype='float64')):
+            self.push(timestamp, close, volume)
+            applied += 1
+            if on_bar is not None:
+                on_bar(False)
+        return applied
+
+    def __getattr__(self, name):
+        # close, sma_20, rsi, ... resolve to zero-copy views of the buffers
+        if name in SERIES:
+            return self.buffers[name].view()
+        raise AttributeError(name)
+
+    @property
+    def index(self):
+        return self.timestamps.view()
+
+    @property
+    def average_volume(self):
+        return self.volume_total / self.volume_count if self.volume_count else math.nan
+
+    @property
+    def volume_ratio(self):
+        return self.volume[-1] / self.average_volume * 100
+
+    def series(self, name):
+        return pd.Series(getattr(self, name), index=self.index, name=name)
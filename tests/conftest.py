@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Tests import the top-level modules and the benchmarks' stand-in data, as the benchmarks do
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+# Stand-in market data for the tests
+
+AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+
+
+def session_minutes(years, end='2025-12-31'):
+    # Regular-session 1-minute bars in New York, 390 a day
+    days = pd.bdate_range(end=end, periods=252 * years, tz='America/New_York')
+    opens = days + SESSION_OPEN
+    offsets = pd.to_timedelta(np.arange(390), unit='min')
+    return pd.DatetimeIndex((opens.as_unit('ns').asi8[:, None] + offsets.as_unit('ns').asi8).ravel(),
+                            dtype='datetime64[ns, UTC]').tz_convert('America/New_York')
+
+
+def session_bars(minutes, interval):
+    # Coarser bars the way Yahoo serves them, built by grouping on explicit keys rather than with
+    # resample: hours counted from the 09:30 open, days by local date, weeks by their Monday
+    local = minutes.index.tz_localize(None)
+    day = local.normalize()
+    if interval == '60m':
+        key = day + SESSION_OPEN + ((local - day - SESSION_OPEN) // pd.Timedelta(hours=1)) * pd.Timedelta(hours=1)
+    elif interval == '1d':
+        key = day
+    elif interval == '1wk':
+        key = day - pd.to_timedelta(day.dayofweek, unit='D')
+    else:
+        raise ValueError(interval)
+    bars = minutes.groupby(np.asarray(key)).agg(AGG)
+    bars.index = pd.DatetimeIndex(bars.index).tz_localize(minutes.index.tz)
+    return bars
@@ -0,0 +1,53 @@
+import json
+import sys
+import threading
+
+import pandas as pd
+
+from bar_cache import BarCache
+from fake_provider import make_bars
+
+
+def test_concurrent_stores_keep_every_entry(tmp_path):
+    # Threads storing different series must not lose each other's index entries
+    cache = BarCache(str(tmp_path))
+    data = make_bars(pd.date_range('2025-01-02', periods=5, freq='D'))
+    symbols = [f"SYM{i}" for i in range(64)]
+    start = threading.Barrier(len(symbols))
+    errors = []
+
+    def store(symbol):
+        start.wait()
+        try:
+            for _ in range(3):
+                cache.store('replay', symbol, '1d', data, '1mo')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=store, args=(symbol,)) for symbol in symbols]
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads often, so unguarded index updates interleave
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert errors == []
+    expected = {cache._key('replay', symbol, '1d') for symbol in symbols}
+    assert set(cache.index) == expected
+    with open(cache.index_path) as f:
+        assert set(json.load(f)) == expected
+    assert all(cache.is_fresh('replay', symbol, '1d') for symbol in symbols)
+
+
+def test_get_tops_up_a_stale_entry(tmp_path):
+    cache = BarCache(str(tmp_path), ttl={'1d': 0})
+    data = make_bars(pd.date_range('2025-01-02', periods=10, freq='D'))
+    first = cache.get('replay', 'AAA', '1d', '1mo', lambda: data.iloc[:8], lambda since: None)
+    assert len(first) == 8
+    merged = cache.get('replay', 'AAA', '1d', '1mo', lambda: None, lambda since: data.loc[since:])
+    assert merged.equals(data)
+    assert cache._entry(cache._key('replay', 'AAA', '1d'))['period'] == '1mo'
@@ -0,0 +1,57 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from currency import FxRates
+from fake_provider import make_bars
+from providers import ReplayProvider, record_bars
+
+
+class BlockingFx:
+    # Loads of EUR wait until released; every other pair answers at once
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def get_fx_rates(self, base, quote):
+        if base == 'EUR':
+            self.started.set()
+            assert self.release.wait(5)
+        index = pd.date_range('2025-01-01', periods=5, freq='D')
+        return pd.Series(np.arange(1.0, 6.0), index=index)
+
+
+def test_slow_pair_does_not_block_other_pairs():
+    provider = BlockingFx()
+    fx = FxRates(provider)
+    slow = threading.Thread(target=fx.get, args=('EUR', 'USD'))
+    slow.start()
+    assert provider.started.wait(5)
+    dates, rates = fx.get('INR', 'USD')  # returns while the EUR load is still waiting
+    assert len(rates) == 5 and slow.is_alive()
+    provider.release.set()
+    slow.join(5)
+    fx.get('EUR', 'USD')
+    assert fx.loads == 2
+
+
+def test_concurrent_requests_share_one_load():
+    provider = BlockingFx()
+    fx = FxRates(provider)
+    threads = [threading.Thread(target=fx.get, args=('EUR', 'USD')) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    assert provider.started.wait(5)
+    provider.release.set()
+    for thread in threads:
+        thread.join(5)
+    assert fx.loads == 1
+
+
+def test_replay_fx_rates_are_daily(tmp_path):
+    index = pd.bdate_range(end='2025-06-30', periods=300)
+    record_bars(str(tmp_path), 'EURUSD=X', '1d', make_bars(index))
+    closes = ReplayProvider(str(tmp_path)).get_fx_rates('EUR', 'USD')
+    assert (closes.index.to_series().diff().dropna() < pd.Timedelta(days=7)).all()
+    assert len(closes) > 200
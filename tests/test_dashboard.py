@@ -0,0 +1,66 @@
+import tkinter as tk
+
+import pandas as pd
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from dashboard import DashboardRenderer, sparkline
+from fake_provider import make_bars
+from streaming import StreamingIndicators
+
+
+def live_snapshot(seed):
+    data = make_bars(pd.date_range('2025-01-02', periods=80, freq='h'), seed=seed)
+    return sparkline(StreamingIndicators.from_frame(data))
+
+
+def test_restarted_renderer_replaces_the_old_one():
+    figure = Figure(figsize=(6, 4))
+    canvas = FigureCanvasAgg(figure)
+    first = DashboardRenderer(figure, canvas, ['AAPL', 'MSFT'])
+    canvas.draw()
+    first.close()
+    figure.clear()
+    second = DashboardRenderer(figure, canvas, ['TSLA'])
+    canvas.draw()  # only the new renderer listens for draws
+    assert list(second.backgrounds) == ['TSLA']
+    second.show('TSLA', live_snapshot(1))
+    assert first.backgrounds is None
+
+
+def test_closed_panels_stay_in_full_draws():
+    figure = Figure(figsize=(6, 4))
+    canvas = FigureCanvasAgg(figure)
+    renderer = DashboardRenderer(figure, canvas, ['AAPL'])
+    canvas.draw()
+    renderer.show('AAPL', live_snapshot(0))
+    renderer.close()
+    assert not any(artist.get_animated() for artist in renderer.panels['AAPL'].artists)
+    canvas.draw()
+
+
+def test_tab_start_stop_start_then_draw():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display")
+    from dashboard_tab import DashboardTab
+    from profiling import Profiler
+    from tkinter import ttk
+    try:
+        root.withdraw()
+        notebook = ttk.Notebook(root)
+        period = tk.StringVar(root, value='1mo')
+        tab = DashboardTab(notebook, root, period, 60000, Profiler(), fetch=lambda symbol, period: None)
+        tab.runner.submit = lambda *args, **kwargs: None  # no refresh cycles
+        for symbols in ['AAPL MSFT', 'TSLA']:
+            tab.symbols_entry.delete(0, tk.END)
+            tab.symbols_entry.insert(0, symbols)
+            tab.start()
+            tab.canvas.draw()
+            tab.stop()
+        tab.canvas.draw()
+        tab.shutdown()
+    finally:
+        root.destroy()
@@ -0,0 +1,98 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+import ta
+
+from fake_provider import make_bars
+from indicators import IndicatorSet, compute_indicators
+from watchlist import right_align
+
+NAMES = ['sma_20', 'bollinger_upper', 'bollinger_lower', 'rsi', 'macd', 'signal']
+
+
+def ta_indicators(close):
+    # The rolling + ta path the engine replaced
+    sma_20 = close.rolling(window=20).mean()
+    std_dev = close.rolling(window=20).std()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        rsi = ta.momentum.RSIIndicator(close=close, window=14).rsi()
+        macd = ta.trend.MACD(close=close)
+        return {
+            'sma_20': sma_20, 'bollinger_upper': sma_20 + std_dev * 2, 'bollinger_lower': sma_20 - std_dev * 2,
+            'rsi': rsi, 'macd': macd.macd(), 'signal': macd.macd_signal(),
+        }
+
+
+def assert_parity(actual, expected, names=NAMES):
+    for name in names:
+        values = expected[name].to_numpy()
+        assert np.array_equal(np.isnan(actual[name]), np.isnan(values)), name
+        # pandas' online rolling std drifts slightly on long series, so allow a relative tolerance
+        assert np.allclose(actual[name], values, rtol=1e-7, atol=1e-9, equal_nan=True), name
+
+
+def closes(n, seed=0):
+    return make_bars(pd.date_range('2025-01-02', periods=n, freq='h'), seed=seed)['Close']
+
+
+# Around every window edge: RSI 14, SMA 20, MACD 26 and its signal at 26 + 9 - 1
+@pytest.mark.parametrize('n', [1, 2, 13, 14, 15, 19, 20, 21, 25, 26, 27, 33, 34, 35, 300, 20_000])
+def test_matches_ta(n):
+    close = closes(n)
+    indicators = IndicatorSet(close.to_numpy())
+    assert_parity({name: getattr(indicators, name) for name in NAMES}, ta_indicators(close))
+
+
+def test_empty_series():
+    indicators = IndicatorSet(np.array([]), np.array([]))
+    for name in NAMES:
+        assert len(getattr(indicators, name)) == 0
+
+
+def test_panel_with_leading_gaps_matches_each_column():
+    # Symbols listed at different times: each column starts with its own run of NaNs
+    n = 400
+    panel = np.column_stack([closes(n, seed) for seed in range(4)])
+    for column, start in enumerate([0, 1, 37, 390]):
+        panel[:start, column] = np.nan
+    indicators = IndicatorSet(panel)
+    for column, start in enumerate([0, 1, 37, 390]):
+        expected = ta_indicators(pd.Series(panel[start:, column]))
+        actual = {name: getattr(indicators, name)[start:, column] for name in NAMES}
+        assert_parity(actual, expected)
+        for name in NAMES:
+            assert np.isnan(getattr(indicators, name)[:start, column]).all(), name
+
+
+def test_rolling_windows_skip_interior_gaps():
+    # A window over a missing close is undefined, as with pandas rolling
+    close = closes(300)
+    close.iloc[[50, 120, 121, 122, 250]] = np.nan
+    indicators = IndicatorSet(close.to_numpy())
+    expected = ta_indicators(close)
+    assert_parity({name: getattr(indicators, name) for name in NAMES[:3]}, expected, NAMES[:3])
+
+
+def test_right_aligned_gaps_match_each_symbol():
+    # Exchanges with different trading days: after right_align every symbol's indicators are
+    # those of its own bar sequence
+    index = pd.date_range('2025-01-02', periods=300, freq='D')
+    panel = pd.DataFrame({f"S{seed}": closes(300, seed).to_numpy() for seed in range(3)}, index=index)
+    panel.iloc[::7, 0] = np.nan
+    panel.iloc[100:110, 1] = np.nan
+    panel.iloc[:50, 2] = np.nan
+    aligned = right_align(panel)
+    indicators = IndicatorSet(aligned.to_numpy())
+    for j, symbol in enumerate(panel.columns):
+        own = panel[symbol].dropna().reset_index(drop=True)
+        actual = {name: getattr(indicators, name)[-len(own):, j] for name in NAMES}
+        assert_parity(actual, ta_indicators(own))
+
+
+def test_compute_indicators_memoizes_per_frame():
+    data = make_bars(pd.date_range('2025-01-02', periods=50, freq='h'))
+    assert compute_indicators(data) is compute_indicators(data)
+    assert compute_indicators(data.copy()) is not compute_indicators(data)
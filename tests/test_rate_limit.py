@@ -0,0 +1,60 @@
+import pytest
+
+from rate_limit import PROVIDER_LIMITS, max_processes, scheduler_for, share_limits
+
+
+def busiest_window(times, length):
+    # Most calls in any half-open window of `length` seconds
+    times = sorted(times)
+    return max(sum(1 for u in times if t <= u < t + length) for t in times)
+
+
+def worker_calls(provider, processes, seconds):
+    # Each worker process builds its own bucket from its share; all of them call as fast as
+    # their buckets let them, starting together
+    calls = []
+    for worker in range(processes):
+        share_limits(processes)
+        bucket = scheduler_for(provider, 'KEY').bucket
+        now = [0.0]
+        bucket.clock = lambda: now[0]
+        bucket.tokens = bucket.capacity
+        bucket.updated = 0.0
+        while now[0] < seconds:
+            now[0] += bucket.reserve()
+            calls.append(now[0])
+    return calls
+
+
+@pytest.fixture(autouse=True)
+def unshared():
+    yield
+    share_limits(1)
+
+
+def test_alpha_vantage_runs_one_worker():
+    assert max_processes('alphavantage', 8) == 1
+    assert max_processes('yfinance', 8) == 8
+    assert max_processes('yfinance', 64) == PROVIDER_LIMITS['yfinance'][1]
+    assert max_processes('replay', 64) == 64
+
+
+def test_alpha_vantage_stays_within_five_calls_a_minute():
+    calls = worker_calls('alphavantage', max_processes('alphavantage', 6), 600)
+    assert busiest_window(calls, 60) <= 5
+    assert len(calls) >= 49
+
+
+@pytest.mark.parametrize('processes', [3, 6, 20])
+def test_worker_shares_add_up_to_the_limit(processes):
+    # Fractional shares: the workers' bursts and rates together equal one process's
+    rate, capacity = PROVIDER_LIMITS['yfinance']
+    calls = worker_calls('yfinance', processes, 10)
+    assert busiest_window(calls, 1) <= capacity + rate
+    assert len(calls) >= capacity + rate * 10 - processes
+
+
+def test_too_many_workers_would_exceed_the_limit():
+    # Why max_processes exists: every worker can make one call at once whatever its share
+    calls = worker_calls('alphavantage', 6, 120)
+    assert busiest_window(calls, 60) > 5
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from batch_report import run_job
+from fake_provider import make_bars
+from reports import insights_report, report_texts
+
+
+def one_bar():
+    return make_bars(pd.date_range('2025-06-30 09:30', periods=1, freq='h'))
+
+
+def test_insights_report_single_bar():
+    assert insights_report('AAPL', one_bar()).startswith("Insufficient data")
+
+
+def test_report_texts_single_bar():
+    texts = report_texts('AAPL', one_bar())
+    assert texts['indicators_text'].startswith("Insufficient data")
+    assert texts['insights_text'].startswith("Insufficient data")
+
+
+def test_insights_report_two_bars():
+    data = make_bars(pd.date_range('2025-06-30 09:30', periods=2, freq='h'))
+    assert "ChatBot Analysis for AAPL" in insights_report('AAPL', data)
+
+
+def test_batch_job_single_bar(tmp_path, monkeypatch):
+    class OneBarProvider:
+        def get_stock_data(self, symbol, period):
+            return one_bar()
+
+        def currency(self, symbol):
+            return 'USD'
+
+    monkeypatch.setattr('batch_report._provider', OneBarProvider())
+    row = run_job(('AAPL', '1d', ['json'], str(tmp_path)))
+    assert row['error'] == ''
+    assert row['change_pct'] is None
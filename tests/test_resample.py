@@ -0,0 +1,133 @@
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bar_cache import BarCache, trim_to_period
+from fake_provider import make_bars, unthrottled_scheduler
+from helpers import AGG, session_bars, session_minutes
+from providers import PERIOD_INTERVALS, YFinanceProvider
+from resample import interval_minutes, resample_ohlcv
+
+
+def reference(data, interval):
+    # pandas on local wall-clock time: intraday buckets from each day's first bar, days at
+    # midnight, weeks starting Monday, months on the 1st
+    local = data.tz_localize(None) if data.index.tz is not None else data
+    if interval == '60m':
+        out = local.groupby(local.index.date, group_keys=False).apply(
+            lambda day: day.resample('60min', origin='start').agg(AGG))
+    elif interval == '1wk':
+        out = local.resample('W-MON', label='left', closed='left').agg(AGG)
+    else:
+        out = local.resample({'1d': 'D', '1mo': 'MS'}[interval]).agg(AGG)
+    out = out.dropna(subset=['Open'])
+    out.index = pd.DatetimeIndex(out.index)
+    if data.index.tz is not None:
+        out.index = out.index.tz_localize(data.index.tz)
+    return out
+
+
+def assert_same_bars(ours, expected):
+    assert ours.index.equals(expected.index), (ours.index[:3], expected.index[:3])
+    assert np.allclose(ours.to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+
+@pytest.fixture(scope='module')
+def minutes():
+    # A year of 1-minute bars across both daylight saving changes, with an outage and a holiday
+    data = make_bars(session_minutes(1))
+    return data.drop(data.index[1000:1400]).drop(data.index[390 * 100:390 * 101])
+
+
+@pytest.mark.parametrize('interval', ['60m', '1d', '1wk', '1mo'])
+def test_matches_pandas_resample(minutes, interval):
+    assert_same_bars(resample_ohlcv(minutes, interval), reference(minutes, interval))
+
+
+@pytest.mark.parametrize('interval', ['1d', '1wk', '1mo'])
+def test_naive_index(minutes, interval):
+    data = minutes.tz_localize(None)
+    assert_same_bars(resample_ohlcv(data, interval), reference(data, interval))
+
+
+def test_hand_built_bars():
+    # Two sessions around a weekend, with the hour buckets from the 09:30 open and a short last hour
+    tz = 'America/New_York'
+    index = pd.DatetimeIndex(['2025-03-07 09:30', '2025-03-07 10:29', '2025-03-07 10:30', '2025-03-07 15:59',
+                              '2025-03-10 09:31', '2025-03-10 11:00'], tz=tz)
+    data = pd.DataFrame({
+        'Open': [10.0, 11.0, 12.0, 13.0, 20.0, 21.0],
+        'High': [10.5, 11.5, 12.5, 13.5, 20.5, 22.0],
+        'Low': [9.5, 10.5, 11.5, 12.5, 19.5, 20.0],
+        'Close': [10.2, 11.2, 12.2, 13.2, 20.2, 21.2],
+        'Volume': [100.0, 200.0, 300.0, 400.0, 500.0, 600.0],
+    }, index=index)
+    expected = {
+        '60m': pd.DataFrame({
+            'Open': [10.0, 12.0, 13.0, 20.0, 21.0], 'High': [11.5, 12.5, 13.5, 20.5, 22.0],
+            'Low': [9.5, 11.5, 12.5, 19.5, 20.0], 'Close': [11.2, 12.2, 13.2, 20.2, 21.2],
+            'Volume': [300.0, 300.0, 400.0, 500.0, 600.0],
+        }, index=pd.DatetimeIndex(['2025-03-07 09:30', '2025-03-07 10:30', '2025-03-07 15:30',
+                                   '2025-03-10 09:31', '2025-03-10 10:31'], tz=tz)),
+        '1d': pd.DataFrame({
+            'Open': [10.0, 20.0], 'High': [13.5, 22.0], 'Low': [9.5, 19.5], 'Close': [13.2, 21.2],
+            'Volume': [1000.0, 1100.0],
+        }, index=pd.DatetimeIndex(['2025-03-07', '2025-03-10'], tz=tz)),
+        '1wk': pd.DataFrame({
+            'Open': [10.0, 20.0], 'High': [13.5, 22.0], 'Low': [9.5, 19.5], 'Close': [13.2, 21.2],
+            'Volume': [1000.0, 1100.0],
+        }, index=pd.DatetimeIndex(['2025-03-03', '2025-03-10'], tz=tz)),
+    }
+    for interval, bars in expected.items():
+        assert_same_bars(resample_ohlcv(data, interval), bars)
+
+
+def test_single_bar_and_empty():
+    data = make_bars(pd.DatetimeIndex(['2025-03-03 09:30'], tz='America/New_York'))
+    out = resample_ohlcv(data, '1wk')
+    assert list(out.index) == [pd.Timestamp('2025-03-03', tz='America/New_York')]
+    assert np.array_equal(out.to_numpy(), data.to_numpy())
+    assert resample_ohlcv(data.iloc[:0], '1d').empty
+
+
+def test_session_drops_extended_hours():
+    index = pd.date_range('2025-03-03 04:00', '2025-03-03 19:59', freq='min', tz='America/New_York')
+    data = make_bars(index)
+    out = resample_ohlcv(data, '1d', session=('09:30', '16:00'))
+    regular = data.between_time('09:30', '16:00', inclusive='left')
+    assert out['Volume'].iloc[0] == regular['Volume'].sum()
+    assert out['Open'].iloc[0] == regular['Open'].iloc[0]
+
+
+def test_interval_minutes():
+    assert [interval_minutes(i) for i in ['15m', '60m', '60min', '1h', '1d']] == [15, 60, 60, 60, None]
+    with pytest.raises(ValueError):
+        interval_minutes('2y')
+
+
+class SessionTicker:
+    # Stand-in for yf.Ticker whose intervals agree with each other, as Yahoo's do: 60m, daily
+    # and weekly bars are all aggregated from the regular-session 1-minute bars in the period,
+    # independently of resample_ohlcv and of the pandas reference above
+    minutes = None
+
+    def __init__(self, symbol):
+        if SessionTicker.minutes is None:
+            SessionTicker.minutes = make_bars(session_minutes(2), seed=1)
+
+    def history(self, period=None, interval='1d', start=None):
+        if start is None:
+            return session_bars(trim_to_period(self.minutes, period), interval)
+        return session_bars(self.minutes[self.minutes.index >= start], interval)
+
+
+def test_local_periods_match_provider_bars():
+    # Periods cut and resampled from one fetch equal the provider's own bars for the interval
+    with tempfile.TemporaryDirectory() as directory:
+        provider = YFinanceProvider(cache=BarCache(directory), ticker_cls=SessionTicker,
+                                    scheduler=unthrottled_scheduler())
+        for period in ['1d', '5d', '1mo', '3mo', '6mo', '1y']:
+            expected = SessionTicker('AAPL').history(period=period, interval=PERIOD_INTERVALS[period])
+            assert_same_bars(provider.get_stock_data('AAPL', period), expected)
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fake_provider import make_bars
+from indicators import IndicatorSet
+from streaming import RECOMPUTE_ATOL, RECOMPUTE_RTOL, SERIES, StreamingIndicators
+
+
+def bars(n, seed=0):
+    return make_bars(pd.date_range('2025-01-02 09:30', periods=n, freq='h'), seed=seed)
+
+
+def assert_matches_recompute(live, data):
+    reference = IndicatorSet(data['Close'].to_numpy(), data['Volume'].to_numpy())
+    for name in SERIES:
+        assert np.allclose(getattr(live, name), getattr(reference, name), rtol=RECOMPUTE_RTOL,
+                           atol=RECOMPUTE_ATOL, equal_nan=True), name
+
+
+@pytest.mark.parametrize('seed_bars', [0, 1, 19, 20, 34, 35, 500])
+def test_pushed_bars_match_full_recompute(seed_bars):
+    # Seeded from frames shorter and longer than every window, then streamed bar by bar
+    data = bars(seed_bars + 200)
+    live = StreamingIndicators.from_frame(data.iloc[:seed_bars]) if seed_bars else StreamingIndicators()
+    for timestamp, row in data.iloc[seed_bars:].iterrows():
+        live.push(timestamp, row['Close'], row['Volume'])
+    assert_matches_recompute(live, data)
+
+
+def test_update_from_revises_and_appends():
+    data = bars(300)
+    live = StreamingIndicators.from_frame(data.iloc[:250])
+    fresh = data.iloc[:260].copy()
+    fresh.iloc[249, fresh.columns.get_loc('Close')] *= 1.01  # the last known bar was still forming
+    calls = []
+    assert live.update_from(fresh, on_bar=calls.append) == 11
+    assert calls == [True] + [False] * 10
+    assert_matches_recompute(live, fresh)
+
+
+def test_update_from_unchanged_bar_with_nan_volume():
+    data = bars(100)
+    data['Volume'] = np.nan
+    live = StreamingIndicators.from_frame(data)
+    calls = []
+    assert live.update_from(data, on_bar=calls.append) == 0
+    assert calls == []
+
+
+def test_update_from_before_any_push():
+    data = bars(60)
+    live = StreamingIndicators()
+    assert live.update_from(data) == 60
+    assert_matches_recompute(live, data)
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from watchlist import panel_indicators, parse_symbols, right_align
+
+
+def test_right_align_packs_each_column():
+    nan = np.nan
+    panel = pd.DataFrame({
+        'A': [1.0, 2.0, 3.0, 4.0],
+        'B': [nan, nan, 5.0, 6.0],
+        'C': [7.0, nan, 8.0, nan],
+        'D': [nan, nan, nan, nan],
+        'E': [9.0, 10.0, nan, 11.0],
+    }, index=pd.date_range('2025-01-02', periods=4))
+    aligned = right_align(panel)
+    expected = pd.DataFrame({
+        'A': [1.0, 2.0, 3.0, 4.0],
+        'B': [nan, nan, 5.0, 6.0],
+        'C': [nan, nan, 7.0, 8.0],
+        'D': [nan, nan, nan, nan],
+        'E': [nan, 9.0, 10.0, 11.0],
+    })
+    pd.testing.assert_frame_equal(aligned, expected)
+    assert panel['C'].isna().sum() == 2  # the input is left as it was
+
+
+def test_right_align_single_row_and_empty():
+    assert right_align(pd.DataFrame({'A': [np.nan]})).isna().all().all()
+    assert right_align(pd.DataFrame({'A': []}, dtype='float64')).empty
+
+
+def test_parse_symbols():
+    assert parse_symbols("aapl, msft\nINFY.NS  aapl") == ['AAPL', 'MSFT', 'INFY.NS']
+
+
+def test_volumes_follow_their_closes():
+    # MSFT has a close without a volume and a volume without a close: each remaining bar keeps
+    # its own volume
+    nan = np.nan
+    index = pd.date_range('2025-01-02', periods=30)
+    closes = pd.DataFrame({'AAPL': np.arange(100.0, 130.0), 'MSFT': np.arange(200.0, 230.0)}, index=index)
+    volumes = pd.DataFrame({'AAPL': np.full(30, 1000.0), 'MSFT': np.arange(1.0, 31.0) * 1000}, index=index)
+    closes.iloc[10, 1] = nan
+    volumes.iloc[20, 1] = nan
+    aligned_volumes = right_align(volumes, closes.notna().to_numpy())
+    aligned_closes = right_align(closes)
+    pairs = pd.DataFrame({'close': aligned_closes['MSFT'], 'volume': aligned_volumes['MSFT']}).dropna(subset=['close'])
+    expected = pd.DataFrame({'close': closes['MSFT'], 'volume': volumes['MSFT']}).dropna(subset=['close'])
+    assert np.array_equal(pairs.to_numpy(), expected.to_numpy(), equal_nan=True)
+
+    volumes.iloc[-1, 1] = 90_000.0
+    table = panel_indicators(closes, volumes)
+    msft = volumes['MSFT'].drop(index[10])
+    assert table.loc['MSFT', 'Volume Ratio %'] == pytest.approx(90_000 / msft.mean() * 100)
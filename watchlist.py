@@ -0,0 +1,114 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from indicators import IndicatorSet
+
+# Columns of the watchlist table, in display order
+WATCHLIST_COLUMNS = ['Price', 'Change %', 'RSI', 'MACD', 'Signal', 'Crossover', 'Bollinger %B', 'Volume Ratio %']
+
+
+def parse_symbols(text):
+    symbols = [s.strip().upper() for s in text.replace(',', ' ').split()]
+    return list(dict.fromkeys(s for s in symbols if s))
+
+
+def fetch_panel(symbols, period, fetch=None, fetch_batch=None, max_workers=8):
+    # One batched provider call when available, otherwise a bounded pool of single-symbol fetches
+    if fetch_batch is not None:
+        return fetch_batch(symbols, period), {}
+
+    frames, errors = {}, {}
+
+    def fetch_one(symbol):
+        try:
+            return symbol, fetch(symbol, period), None
+        except Exception as e:
+            return symbol, None, e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for symbol, data, error in pool.map(fetch_one, symbols):
+            if error is not None:
+                errors[symbol] = str(error)
+            else:
+                frames[symbol] = data
+    return panel_from_frames(frames), errors
+
+
+def panel_from_frames(frames):
+    # Build the same (field, symbol) column layout that yf.download returns
+    if not frames:
+        return pd.DataFrame()
+    aligned = {}
+    for symbol, data in frames.items():
+        data = data[['Close', 'Volume']]
+        if data.index.tz is not None:
+            data = data.tz_convert('UTC')
+        aligned[symbol] = data
+    return pd.concat(aligned, axis=1).swaplevel(axis=1).sort_index()
+
+
+def right_align(panel, valid=None):
+    # Pack each column's valid bars against the last row, so rolling windows and EMAs run over
+    # every symbol's own bar sequence even when exchanges have different trading days. `valid`
+    # (default: the values that are not NaN) picks the bars kept, so that another panel can be
+    # moved by the same rows, e.g. volumes by the rows of their closes.
+    values = panel.to_numpy(dtype='float64', copy=True)
+    valid = ~np.isnan(values) if valid is None else np.asarray(valid, dtype=bool)
+    values[~valid] = np.nan
+    # Columns whose valid rows are all at the end are packed already; the rest are packed
+    # together by a stable sort of their rows, dropped ones first, each column laid out contiguously
+    gapped = np.flatnonzero((valid[:-1] & ~valid[1:]).any(axis=0))
+    if len(gapped):
+        order = np.argsort(valid[:, gapped].T, axis=1, kind='stable')
+        values[:, gapped] = np.take_along_axis(values[:, gapped].T, order, axis=1).T
+    return pd.DataFrame(values, columns=panel.columns)
+
+
+def panel_indicators(closes, volumes):
+    # Every indicator is computed for all symbols at once, one column per symbol
+    # Volumes move by the rows of their closes, so each bar keeps its own volume even where
+    # only one of the two is missing
+    volumes = right_align(volumes[closes.columns], closes.notna().to_numpy())
+    closes = right_align(closes)
+    indicators = IndicatorSet(closes.to_numpy(), volumes.to_numpy())
+
+    price = indicators.close[-1]
+    bullish = indicators.macd[-1] > indicators.signal[-1]
+    was_bullish = indicators.macd[-2] > indicators.signal[-2]
+    crossover = np.where(bullish, 'Bullish', 'Bearish')
+    crossover = np.where(bullish != was_bullish, np.char.add(crossover, ' (new)'), crossover)
+
+    table = pd.DataFrame({
+        'Price': price,
+        'Change %': (price / indicators.close[-2] - 1) * 100,
+        'RSI': indicators.rsi[-1],
+        'MACD': indicators.macd[-1],
+        'Signal': indicators.signal[-1],
+        'Crossover': crossover,
+        'Bollinger %B': indicators.bollinger_percent_b[-1],
+        'Volume Ratio %': indicators.volume_ratio,
+    }, index=closes.columns)
+    table.index.name = 'Symbol'
+    return table
+
+
+def scan_watchlist(symbols, period, fetch=None, fetch_batch=None, max_workers=8):
+    panel, errors = fetch_panel(symbols, period, fetch, fetch_batch, max_workers)
+    if panel.empty:
+        return pd.DataFrame(columns=WATCHLIST_COLUMNS), errors
+
+    closes = panel['Close']
+    counts = closes.notna().sum()
+    for symbol in counts[counts == 0].index:
+        errors[symbol] = "No data found"
+    for symbol in counts[(counts > 0) & (counts < 20)].index:
+        errors[symbol] = "Insufficient data to calculate indicators"
+    for symbol in symbols:
+        if symbol not in closes.columns and symbol not in errors:
+            errors[symbol] = "No data found"
+    valid = counts[counts >= 20].index
+    if len(valid) == 0:
+        return pd.DataFrame(columns=WATCHLIST_COLUMNS), errors
+    return panel_indicators(closes[valid], panel['Volume'][valid]), errors
@@ -0,0 +1,84 @@
+import tkinter as tk
+from tkinter import ttk
+
+from background import BackgroundRunner
+from watchlist import WATCHLIST_COLUMNS, parse_symbols, scan_watchlist
+
+
+class WatchlistTab:
+    def __init__(self, notebook, root, period_var, fetch=None, fetch_batch=None):
+        self.root = root
+        self.period_var = period_var
+        self.fetch = fetch
+        self.fetch_batch = fetch_batch
+        # A separate runner so a scan and a single-symbol Analyze do not cancel each other
+        self.runner = BackgroundRunner(root)
+        self.table = None
+        self.sort_column = 'Symbol'
+        self.sort_reverse = False
+
+        self.frame = ttk.Frame(notebook)
+        notebook.add(self.frame, text="Watchlist")
+
+        input_frame = ttk.Frame(self.frame, padding="5")
+        input_frame.pack(fill=tk.X)
+        ttk.Label(input_frame, text="Symbols:").pack(side=tk.LEFT)
+        self.symbols_entry = ttk.Entry(input_frame, width=60)
+        self.symbols_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        ttk.Button(input_frame, text="Scan", command=self.scan).pack(side=tk.LEFT, padx=10)
+        self.status_label = ttk.Label(input_frame, text="")
+        self.status_label.pack(side=tk.LEFT, padx=10)
+
+        columns = ['Symbol'] + WATCHLIST_COLUMNS
+        self.tree = ttk.Treeview(self.frame, columns=columns, show='headings')
+        for column in columns:
+            self.tree.heading(column, text=column, command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=100, anchor=tk.E if column not in ('Symbol', 'Crossover') else tk.W)
+        scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+    def scan(self):
+        symbols = parse_symbols(self.symbols_entry.get())
+        if not symbols:
+            self.set_status("Please enter one or more stock symbols", error=True)
+            return
+
+        period = self.period_var.get()
+        self.set_status(f"Scanning {len(symbols)} symbols ({period})...")
+        self.runner.submit(
+            lambda task: scan_watchlist(symbols, period, self.fetch, self.fetch_batch),
+            on_done=self.show_table,
+            on_error=lambda e: self.set_status(f"Scan failed: {str(e)}", error=True),
+        )
+
+    def show_table(self, result):
+        self.table, errors = result
+        self.refresh_rows()
+        status = f"{len(self.table)} symbols scanned"
+        if errors:
+            status += f", {len(errors)} skipped: " + ", ".join(f"{s} ({e})" for s, e in errors.items())
+        self.set_status(status, error=bool(errors))
+
+    def sort_by(self, column):
+        if column == self.sort_column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column, self.sort_reverse = column, False
+        self.refresh_rows()
+
+    def refresh_rows(self):
+        self.tree.delete(*self.tree.get_children())
+        if self.table is None:
+            return
+        if self.sort_column == 'Symbol':
+            table = self.table.sort_index(ascending=not self.sort_reverse)
+        else:
+            table = self.table.sort_values(self.sort_column, ascending=not self.sort_reverse)
+        for symbol, row in table.iterrows():
+            values = [symbol] + [value if isinstance(value, str) else f"{value:,.2f}" for value in row]
+            self.tree.insert('', tk.END, values=values)
+
+    def set_status(self, message, error=False):
+        self.status_label.config(text=message, foreground="red" if error else "")